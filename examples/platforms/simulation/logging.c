@@ -62,6 +62,9 @@ void platformLoggingSetFileName(const char *aName)
         fprintf(stderr, "Failed to open log file '%s': %s\r\n", aName, strerror(errno));
         exit(EXIT_FAILURE);
     }
+
+    // Flush each log line, so that tools tailing the log file (e.g. toranj) see it right away.
+    setvbuf(sLogFile, NULL, _IOLBF, 0);
 }
 
 void platformLoggingInit(const char *aName)
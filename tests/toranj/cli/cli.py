@@ -107,6 +107,9 @@ class Node(object):
 
     _WAIT_TIME = 10
 
+    _LOG_LINE_PATTERN = re.compile(r' \[[DINWC-]\] ')
+    _ERROR_LINE_PATTERN = re.compile(r'.*Error (\d+):(.*)')
+
     _START_INDEX = 1
     _cur_index = _START_INDEX
 
@@ -124,9 +127,12 @@ class Node(object):
 
         cmd = f'{self._OT_CLI_FTD}{radios} --time-speed={self._SPEED_UP_FACTOR} '
 
+        self._log_file_name = None
+
         if Node._SAVE_LOGS:
             log_file_name = self._LOG_FNAME + str(index) + '.log'
             cmd = cmd + f'--log-file={log_file_name} '
+            self._log_file_name = log_file_name
 
         cmd = cmd + f'{self._index}'
 
@@ -162,34 +168,50 @@ class Node(object):
             _log(f'$ Node{self._index}.cli(\'{cmd}\')', new_line=False)
 
         self._cli_process.send(cmd + '\n')
-        index = self._cli_process.expect(['(.*)Done\r\n', '.*Error (\d+):(.*)\r\n'])
-
-        if index == 0:
-            result = [
-                line for line in self._cli_process.match.group(1).decode().splitlines()
-                if not self._is_ot_logg_line(line) if not line.strip().endswith(cmd)
-            ]
 
-            if self._verbose:
-                if len(result) > 1:
-                    _log(':')
-                    for line in result:
-                        _log('     ' + line)
-                elif len(result) == 1:
-                    _log(f' -> {result[0]}')
-                else:
-                    _log('')
-
-            return result
-        else:
-            match = self._cli_process.match
-            e = CliError(int(match.group(1).decode()), match.group(2).decode().strip())
-            if self._verbose:
-                _log(f': Error {e.message} ({e.error_code})')
-            raise e
+        # Read the output line by line (each chunk is scanned once), skipping the command echo and the OT log lines,
+        # until the `Done` or `Error` line.
+        result = []
+        while True:
+            for line in self._read_cli_line().splitlines():
+                if self._is_ot_logg_line(line):
+                    continue
+
+                match = Node._ERROR_LINE_PATTERN.match(line)
+                if match is not None:
+                    e = CliError(int(match.group(1)), match.group(2).strip())
+                    if self._verbose:
+                        _log(f': Error {e.message} ({e.error_code})')
+                    raise e
+
+                is_done = line.endswith('Done')
+                if is_done:
+                    line = line[:-len('Done')]
+
+                if line and not line.strip().endswith(cmd):
+                    result.append(line)
+
+                if is_done:
+                    if self._verbose:
+                        if len(result) > 1:
+                            _log(':')
+                            for line in result:
+                                _log('     ' + line)
+                        elif len(result) == 1:
+                            _log(f' -> {result[0]}')
+                        else:
+                            _log('')
+
+                    return result
+
+    def _read_cli_line(self):
+        # `expect_exact()` only searches the newly read data for the line terminator, so reading a large output
+        # takes linear time.
+        self._cli_process.expect_exact('\r\n')
+        return self._cli_process.before.decode()
 
     def _is_ot_logg_line(self, line):
-        return any(level in line for level in [' [D] ', ' [I] ', ' [N] ', ' [W] ', ' [C] ', ' [-] '])
+        return Node._LOG_LINE_PATTERN.search(line) is not None
 
     def _cli_no_output(self, cmd, *args):
         outputs = self.cli(cmd, *args)
@@ -482,14 +504,28 @@ class Node(object):
     #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
     # ping and counters
 
-    def ping(self, address, size=0, count=1, verify_success=True):
-        outputs = self.cli('ping', address, size, count)
+    def ping(self, address, size=0, count=1, verify_success=True, interval=None):
+        """Sends `count` echo requests of `size` bytes every `interval` seconds and returns the traffic statistics.
+
+           The returned `dict` contains `tx_count`, `rx_count`, `loss_ratio` and the round-trip `min_latency`,
+           `avg_latency` and `max_latency` in seconds (`None` when no reply is received).
+        """
+        outputs = self.cli('ping', address, size, count, interval)
         m = re.match(r'(\d+) packets transmitted, (\d+) packets received.', outputs[-1].strip())
         verify(m is not None)
         verify(int(m.group(1)) == count)
         if verify_success:
             verify(int(m.group(2)) == count)
 
+        stats = {'tx_count': int(m.group(1)), 'rx_count': int(m.group(2))}
+        stats['loss_ratio'] = 1.0 - float(stats['rx_count']) / stats['tx_count'] if stats['tx_count'] else 0.0
+
+        m = re.search(r'Round-trip min/avg/max = (\d+)/([\d.]+)/(\d+) ms', outputs[-1])
+        latencies = [float(value) / 1000 for value in m.groups()] if m is not None else [None] * 3
+        stats['min_latency'], stats['avg_latency'], stats['max_latency'] = latencies
+
+        return stats
+
     def get_mle_counter(self):
         return self.cli('counters mle')
 
@@ -1044,25 +1080,121 @@ def verify(condition):
         raise VerifyError(error_message)
 
 
-def verify_within(condition_checker_func, wait_time, arg=None, delay_time=0.1):
+# ----------------------------------------------------------------------------------------------------------------------
+# Watching node logs for state changes
+
+
+class _LogWatcher(object):
+    """Tails the log files of all `Node` instances and detects the log lines which indicate a state change.
+
+       `verify_within()` uses this to re-run a failed condition checker as soon as a node reports a change (role,
+       network data, child table, addresses, etc.) instead of waiting for the whole delay interval. The simulation
+       platform flushes each log line, so the changes are seen right away.
+    """
+
+    # Notifier "StateChanged" logs and note/warning/critical level logs (e.g., role changes). CLI input and output
+    # logs (from the condition checkers themselves) are at info level and do not match.
+    _CHANGE_PATTERN = re.compile(rb' \[[NWC]\] | \[I\] Notifier')
+
+    # How often the log file sizes are checked while waiting for a change
+    _POLL_INTERVAL = 0.05
+
+    def __init__(self):
+        # Maps a `Node` to `[file offset, partial last line]`
+        self._positions = weakref.WeakKeyDictionary()
+
+    def sync(self):
+        """Skips all the logs written so far, so only the later changes are detected."""
+        for node in list(Node._all_nodes):
+            self._positions[node] = [self._get_file_size(node), b'']
+
+    def has_change(self):
+        """Reads the logs written since the last call and indicates whether any of them reports a state change."""
+        changed = False
+
+        for node in list(Node._all_nodes):
+            if node._log_file_name is None:
+                continue
+
+            position = self._positions.get(node)
+
+            if position is None:
+                position = [self._get_file_size(node), b'']
+                self._positions[node] = position
+                continue
+
+            # Only open the log file when it has grown (or was truncated) since the last read.
+            size = self._get_file_size(node)
+            if size == position[0]:
+                continue
+            if size < position[0]:
+                position[:] = [0, b'']
+
+            try:
+                with open(node._log_file_name, 'rb') as log_file:
+                    log_file.seek(position[0])
+                    data = log_file.read()
+            except OSError:
+                continue
+
+            position[0] += len(data)
+            lines, _, position[1] = (position[1] + data).rpartition(b'\n')
+
+            if not changed and self._CHANGE_PATTERN.search(lines):
+                changed = True
+
+        return changed
+
+    def wait_for_change(self, timeout):
+        """Waits up to `timeout` seconds for a node to log a state change. Returns `True` if a change is detected."""
+        end_time = time.time() + timeout
+        while True:
+            if self.has_change():
+                return True
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._POLL_INTERVAL, remaining))
+
+    @staticmethod
+    def _get_file_size(node):
+        try:
+            return os.path.getsize(node._log_file_name) if node._log_file_name else 0
+        except OSError:
+            return 0
+
+
+_log_watcher = _LogWatcher()
+
+
+def verify_within(condition_checker_func, wait_time, arg=None, delay_time=0.1, max_delay_time=1.0):
     """Verifies that a given function `condition_checker_func` passes successfully within a given wait timeout.
        `wait_time` is maximum time waiting for condition_checker to pass (in seconds).
        `arg` is optional parameter and if it s not None, will be passed to `condition_checker_func()`
-       `delay_time` specifies a delay interval added between failed attempts (in seconds).
+       `delay_time` specifies the minimum delay interval added between failed attempts (in seconds).
+       `max_delay_time` specifies the maximum delay interval between failed attempts (in seconds).
+
+       After a failed attempt, `condition_checker_func` is re-run as soon as any node logs a state change (but no
+       sooner than `delay_time`), and the delay interval is reset to `delay_time`. Without a state change, the delay
+       interval doubles after every failed attempt, up to `max_delay_time`. The last attempt is made once `wait_time`
+       has passed.
     """
     global _is_in_verify_within
     start_time = time.time()
     old_is_in_verify_within = _is_in_verify_within
     _is_in_verify_within = True
+    delay = delay_time
     while True:
+        _log_watcher.sync()
         try:
             if arg is None:
                 condition_checker_func()
             else:
                 condition_checker_func(arg)
         except VerifyError as e:
-            if time.time() - start_time > wait_time:
-                print('Took too long to pass the condition ({}>{} sec)'.format(time.time() - start_time, wait_time))
+            elapsed_time = time.time() - start_time
+            if elapsed_time > wait_time:
+                print('Took too long to pass the condition ({}>{} sec)'.format(elapsed_time, wait_time))
                 if hasattr(e, 'message'):
                     print(e.message)
                 raise e
@@ -1071,5 +1203,11 @@ def verify_within(condition_checker_func, wait_time, arg=None, delay_time=0.1):
         else:
             break
         if delay_time != 0:
-            time.sleep(delay_time)
+            # Don't wait past `wait_time`, so that the last attempt is made right when it has passed.
+            wait_interval = min(delay, max(wait_time - elapsed_time, 0))
+            time.sleep(min(delay_time, wait_interval))
+            if _log_watcher.wait_for_change(wait_interval - delay_time):
+                delay = delay_time
+            else:
+                delay = min(delay * 2, max(max_delay_time, delay_time))
     _is_in_verify_within = old_is_in_verify_within
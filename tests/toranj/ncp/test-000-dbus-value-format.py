@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2026, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+
+import wpan
+from wpan import verify
+
+# -----------------------------------------------------------------------------------------------------------------------
+# Test description: property values received over D-Bus are formatted exactly as `wpanctl get -v` prints them
+
+test_name = __file__[:-3] if __file__.endswith('.py') else __file__
+print('-' * 120)
+print('Starting \'{}\''.format(test_name))
+
+if wpan.dbus is None:
+    print('\'{}\' skipped: the `dbus` module is not available, `wpanctl` is used instead.'.format(test_name))
+    sys.exit(0)
+
+dbus = wpan.dbus
+
+# -----------------------------------------------------------------------------------------------------------------------
+# Test implementation
+
+
+def check_format(value, expected):
+    formatted = wpan._format_dbus_value(value)
+    if formatted != expected:
+        print('{!r} formatted as {!r}, wpanctl prints {!r}'.format(value, formatted, expected))
+    verify(formatted == expected)
+
+
+# basic types (the strings `wpanctl` prints for the corresponding D-Bus types)
+
+check_format(dbus.Byte(0x0b), '0x0B')
+check_format(dbus.Byte(0xff), '0xFF')
+check_format(dbus.Boolean(True), 'true')
+check_format(dbus.Boolean(False), 'false')
+check_format(dbus.UInt16(0xface), '0xFACE')
+check_format(dbus.UInt16(7), '0x0007')
+check_format(dbus.Int16(-12), '-12')
+check_format(dbus.Int32(-100), '-100')
+check_format(dbus.UInt32(12345678), '12345678')
+check_format(dbus.Int64(-5), '-5')
+check_format(dbus.UInt64(0xdead00beef00cafe), '0xDEAD00BEEF00CAFE')
+check_format(dbus.UInt64(1), '0x0000000000000001')
+check_format(dbus.String('test-network'), '"test-network"')
+
+# byte arrays are printed as a single hex string
+
+check_format(dbus.ByteArray(b'\xde\xad\xbe\xef'), '[DEADBEEF]')
+check_format(dbus.Array([dbus.Byte(0x00), dbus.Byte(0x1a)], signature='y'), '[001A]')
+check_format(dbus.Array([], signature='s'), '[]')
+
+# other arrays and dictionaries list one item per line, indented with tabs
+
+check_format(dbus.Array([dbus.String('fd00::1'), dbus.String('fe80::1')], signature='s'),
+             '[\n\t"fd00::1"\n\t"fe80::1"\n]')
+check_format(dbus.Array([dbus.Array([dbus.UInt16(1)], signature='q')], signature='aq'), '[\n\t[\n\t\t0x0001\n\t]\n]')
+check_format(dbus.Dictionary({dbus.String('Channel'): dbus.Byte(11)}, signature='sv'), '[\n\t"Channel" => 0x0B\n]')
+
+# values of unsupported types are reported instead of being formatted incorrectly
+
+try:
+    wpan._format_dbus_value(dbus.Double(1.5))
+    verify(False)
+except wpan._WpantundDbusError:
+    pass
+
+# -----------------------------------------------------------------------------------------------------------------------
+# Test finished
+
+print('\'{}\' passed.'.format(test_name))
@@ -35,9 +35,15 @@ import random
 import weakref
 import subprocess
 import socket
-import asyncore
+import errno
+import select
 import inspect
 
+try:
+    import dbus
+except ImportError:
+    dbus = None
+
 # ----------------------------------------------------------------------------------------------------------------------
 # wpantund properties
 
@@ -291,6 +297,127 @@ def _log(text, new_line=True, flush=True):
         sys.stdout.flush()
 
 
+# -----------------------------------------------------------------------------------------------------------------------
+# wpantund D-Bus client
+
+
+class _WpantundDbusError(Exception):
+    pass
+
+
+class _WpantundDbusClient(object):
+    """ A D-Bus client for the property get/set/insert/remove methods of a single wpantund instance
+
+    It keeps one (private) D-Bus connection for its wpantund instance and formats the property values the same way
+    as `wpanctl get -v` does. Any failure (no `dbus` module, wpantund not yet registered, error status, or a value
+    type it cannot format) is reported as `_WpantundDbusError` so that the caller can fall back to `wpanctl`.
+    """
+
+    _DBUS_NAME_PREFIXES = ('org.wpantund', 'com.nestlabs.WPANTunnelDriver')
+    _DBUS_PATH = '/org/wpantund'
+    _DBUS_INTERFACE = 'org.wpantund.v1'
+    _LEGACY_DBUS_PATH = '/com/nestlabs/WPANTunnelDriver'
+    _LEGACY_DBUS_INTERFACE = 'com.nestlabs.WPANTunnelDriver'
+
+    def __init__(self, interface_name):
+        self._interface_name = interface_name
+        self._bus = None
+        self._interface = None
+
+    def get(self, prop_name):
+        status, value = self._call('PropGet', prop_name)
+        if status != 0:
+            raise _WpantundDbusError('PropGet {} failed with status {}'.format(prop_name, status))
+        return _format_dbus_value(value)
+
+    def update(self, action, prop_name, value, binary_data=False):
+        """Sets/inserts/removes a property value (`action` is 'set', 'add' or 'remove')"""
+        method = {'set': 'PropSet', 'add': 'PropInsert', 'remove': 'PropRemove'}[action]
+        if binary_data:
+            value = dbus.ByteArray(bytearray.fromhex(value))
+        status = self._call(method, prop_name, value)
+        if status != 0:
+            raise _WpantundDbusError('{} {} failed with status {}'.format(method, prop_name, status))
+
+    def close(self):
+        if self._bus is not None:
+            try:
+                self._bus.close()
+            except dbus.DBusException:
+                pass
+        self._bus = None
+        self._interface = None
+
+    def _call(self, method, *args):
+        if self._interface is None:
+            self._connect()
+        try:
+            return getattr(self._interface, method)(*args)
+        except dbus.DBusException as e:
+            # The wpantund instance may have restarted, look it up again on next call.
+            self.close()
+            raise _WpantundDbusError(str(e))
+
+    def _connect(self):
+        if dbus is None:
+            raise _WpantundDbusError('python dbus module is not available')
+        try:
+            self._bus = dbus.SystemBus(private=True)
+            bus_name = self._lookup_bus_name()
+            obj = self._bus.get_object(bus_name, '{}/{}'.format(self._DBUS_PATH, self._interface_name))
+            self._interface = dbus.Interface(obj, self._DBUS_INTERFACE)
+        except dbus.DBusException as e:
+            self.close()
+            raise _WpantundDbusError(str(e))
+
+    def _lookup_bus_name(self):
+        """Finds the D-Bus name of the wpantund instance serving `self._interface_name` (same as `wpanctl -I`)"""
+        for name in self._bus.list_names():
+            if not name.startswith(self._DBUS_NAME_PREFIXES):
+                continue
+            try:
+                obj = self._bus.get_object(name, self._LEGACY_DBUS_PATH)
+                interfaces = dbus.Interface(obj, self._LEGACY_DBUS_INTERFACE).GetInterfaces()
+            except dbus.DBusException:
+                continue
+            for entry in interfaces:
+                if len(entry) >= 1 and entry[0] == self._interface_name:
+                    return entry[1] if len(entry) >= 2 else name
+        self.close()
+        raise _WpantundDbusError('no wpantund instance for {}'.format(self._interface_name))
+
+
+def _format_dbus_value(value, indent=0):
+    """Formats a property value received over D-Bus the same way as `wpanctl get -v`"""
+
+    if isinstance(value, dbus.Dictionary):
+        lines = [
+            '\t' * (indent + 1) + _format_dbus_value(key, indent + 1) + ' => ' + _format_dbus_value(val, indent + 1)
+            for key, val in value.items()
+        ]
+        return '[\n' + ''.join(line + '\n' for line in lines) + '\t' * indent + ']'
+    if isinstance(value, dbus.ByteArray):
+        return '[' + ''.join('{:02X}'.format(byte) for byte in bytearray(value)) + ']'
+    if isinstance(value, dbus.Array):
+        if value.signature == 'y' or len(value) == 0:
+            return '[' + ''.join('{:02X}'.format(int(byte)) for byte in value) + ']'
+        return '[\n' + ''.join(
+            '\t' * (indent + 1) + _format_dbus_value(item, indent + 1) + '\n' for item in value) + '\t' * indent + ']'
+    if isinstance(value, dbus.String):
+        return '"{}"'.format(value.encode('utf-8') if sys.version_info[0] == 2 else value)
+    if isinstance(value, dbus.Boolean):
+        return 'true' if value else 'false'
+    if isinstance(value, dbus.Byte):
+        return '0x{:02X}'.format(int(value))
+    if isinstance(value, dbus.UInt16):
+        return '0x{:04X}'.format(int(value))
+    if isinstance(value, dbus.UInt64):
+        return '0x{:016X}'.format(int(value))
+    if isinstance(value, (dbus.Int16, dbus.Int32, dbus.UInt32, dbus.Int64)):
+        return '{:d}'.format(int(value))
+    raise _WpantundDbusError('cannot format value of type {}'.format(type(value).__name__))
+
+
 # -----------------------------------------------------------------------------------------------------------------------
 # Node class
 
@@ -317,6 +444,9 @@ class Node(object):
     _INTFC_NAME_PREFIX = 'utun' if sys.platform == 'darwin' else 'wpan'
     _START_INDEX = 4 if sys.platform == 'darwin' else 1
 
+    # determines whether property get/set use a persistent D-Bus connection to wpantund (instead of `wpanctl`)
+    _USE_DBUS = dbus is not None and os.getenv('TORANJ_WPANCTL_ONLY', 'no').lower() not in ['true', '1', 'yes', 'on']
+
     _cur_index = _START_INDEX
     _all_nodes = weakref.WeakSet()
 
@@ -350,12 +480,15 @@ class Node(object):
         self._wpantund_process = subprocess.Popen(cmd, shell=True, stderr=self._tund_log_file)
 
         self._wpanctl_cmd = self._WPANCTL + ' -I ' + self._interface_name + ' '
+        self._dbus_client = _WpantundDbusClient(self._interface_name) if Node._USE_DBUS else None
 
         # map from local_port to `AsyncReceiver` object
         self._recvers = weakref.WeakValueDictionary()
         Node._all_nodes.add(self)
 
     def __del__(self):
+        if self._dbus_client is not None:
+            self._dbus_client.close()
         self._wpantund_process.poll()
         if self._wpantund_process.returncode is None:
             self._wpantund_process.terminate()
@@ -404,8 +537,21 @@ class Node(object):
     # APIs matching `wpanctl` commands.
 
     def get(self, prop_name, value_only=True):
+        if value_only and self._dbus_client is not None:
+            try:
+                result = self._dbus_client.get(prop_name)
+            except _WpantundDbusError:
+                pass  # fall back to `wpanctl` (which also reports any error)
+            else:
+                if self._verbose:
+                    _log('$ Node{}.get(\'{}\') -> \'{}\''.format(self._index, prop_name, result))
+                return result
         return self.wpanctl('get ' + ('-v ' if value_only else '') + prop_name)
 
+    def get_many(self, *prop_names):
+        """Gets the values of multiple properties (over the same D-Bus connection). Returns a list of values."""
+        return [self.get(prop_name) for prop_name in prop_names]
+
     def set(self, prop_name, value, binary_data=False):
         return self._update_prop('set', prop_name, value, binary_data)
 
@@ -416,6 +562,15 @@ class Node(object):
         return self._update_prop('remove', prop_name, value, binary_data)
 
     def _update_prop(self, action, prop_name, value, binary_data):
+        if self._dbus_client is not None:
+            try:
+                self._dbus_client.update(action, prop_name, value, binary_data)
+            except _WpantundDbusError:
+                pass  # fall back to `wpanctl` (which also reports any error)
+            else:
+                if self._verbose:
+                    _log('$ Node{}.{}(\'{}\', \'{}\')'.format(self._index, action, prop_name, value))
+                return ''
         return self.wpanctl(action + ' ' + prop_name + ' ' + ('-d ' if binary_data else '') + '-v ' +
                             value)  # use -v to handle values starting with `-`.
 
@@ -546,12 +701,14 @@ class Node(object):
         if not node.is_associated():
             return "{} is not associated".format(node)
 
-        return self.join(node.get(WPAN_NAME)[1:-1],
-                         channel=node.get(WPAN_CHANNEL),
+        name, channel, panid, xpanid, key = node.get_many(WPAN_NAME, WPAN_CHANNEL, WPAN_PANID, WPAN_XPANID, WPAN_KEY)
+
+        return self.join(name[1:-1],
+                         channel=channel,
                          node_type=node_type,
-                         panid=node.get(WPAN_PANID),
-                         xpanid=node.get(WPAN_XPANID),
-                         key=node.get(WPAN_KEY)[1:-1] if should_set_key else None)
+                         panid=panid,
+                         xpanid=xpanid,
+                         key=key[1:-1] if should_set_key else None)
 
     def allowlist_node(self, node):
         """Adds a given node (of type `Node`) to the allowlist of `self` and enables allowlisting on `self`"""
@@ -567,11 +724,11 @@ class Node(object):
         """Checks if node is in the scan results
            `scan_result` must be an array of `ScanResult` object (see `parse_scan_result`).
         """
-        panid = self.get(WPAN_PANID)
-        xpanid = self.get(WPAN_XPANID)[2:]
-        name = self.get(WPAN_NAME)[1:-1]
-        channel = self.get(WPAN_CHANNEL)
-        ext_address = self.get(WPAN_EXT_ADDRESS)[1:-1]
+        panid, xpanid, name, channel, ext_address = self.get_many(WPAN_PANID, WPAN_XPANID, WPAN_NAME, WPAN_CHANNEL,
+                                                                  WPAN_EXT_ADDRESS)
+        xpanid = xpanid[2:]
+        name = name[1:-1]
+        ext_address = ext_address[1:-1]
 
         for item in scan_result:
             if all([item.panid == panid, item.channel == channel, item.ext_address == ext_address]):
@@ -674,7 +831,7 @@ class Node(object):
     class _NodeError(Exception):
         pass
 
-    def prepare_tx(self, src, dst, data=40, count=1, mcast_hops=None):
+    def prepare_tx(self, src, dst, data=40, count=1, mcast_hops=None, rate=None):
         """Prepares an IPv6 msg transmission.
 
         - `src` and `dst` can be either a string containing IPv6 address, or a tuple (ipv6 address as string, port),
@@ -683,6 +840,7 @@ class Node(object):
            random message with the given length will be used).
         - `count` gives number of times the message will be sent (default is 1).
         - `mcast_hops` specifies multicast hop limit (only applicable for multicast tx).
+        - `rate` specifies the number of messages sent per second (default is `None`, i.e., send as fast as possible).
 
         Returns an `AsyncSender` object.
 
@@ -708,7 +866,7 @@ class Node(object):
         else:
             msg = data
 
-        return AsyncSender(self, src_addr, src_port, dst_addr, dst_port, msg, count, mcast_hops)
+        return AsyncSender(self, src_addr, src_port, dst_addr, dst_port, msg, count, mcast_hops, rate)
 
     def _get_receiver(self, local_port):
         # Gets or creates a receiver (an `AsyncReceiver`) tied to given port
@@ -730,7 +888,7 @@ class Node(object):
     def prepare_rx(self, sender):
         """Prepare to receive messages from a sender (an `AsyncSender`)"""
         receiver = self._get_receiver(sender.dst_port)
-        receiver._add_sender(sender.src_addr, sender.src_port, sender.msg, sender.count)
+        receiver._add_sender(sender)
         return receiver
 
     def prepare_listener(self, local_port, timeout=1):
@@ -744,13 +902,34 @@ class Node(object):
         """Called to perform all previously prepared async rx/listen and tx operations"""
         try:
             start_time = time.time()
-            while asyncore.socket_map:
-                elapsed_time = time.time() - start_time
+            while _async_socket_map:
+                now = time.time()
+                elapsed_time = now - start_time
                 if elapsed_time > timeout:
                     print('Performing async tx/tx took too long ({}>{} sec)'.format(elapsed_time, timeout))
                     raise Node._NodeError('perform_tx_rx timed out ({}>{} sec)'.format(elapsed_time, timeout))
-                # perform a single asyncore loop
-                asyncore.loop(timeout=0.5, count=1)
+
+                async_sockets = list(_async_socket_map.values())
+                readers = [async_socket for async_socket in async_sockets if async_socket.readable(now)]
+                writers = [async_socket for async_socket in async_sockets if async_socket.writable(now)]
+
+                # Wait until a socket is ready or the next scheduled event (e.g., a rate limited tx or the end of a
+                # listen timeout).
+                wait_time = min([timeout - elapsed_time] +
+                                [async_socket.next_event_time() - now for async_socket in async_sockets])
+                if writers:
+                    wait_time = 0
+
+                if readers or writers:
+                    readable, writable, _ = select.select(readers, writers, [], max(wait_time, 0))
+                else:
+                    readable, writable = [], []
+                    time.sleep(max(wait_time, 0))
+
+                for async_socket in readable:
+                    async_socket.handle_read()
+                for async_socket in writable:
+                    async_socket.handle_write()
         except BaseException:
             print('Failed to perform async rx/tx')
             raise
@@ -761,6 +940,10 @@ class Node(object):
 
 _SO_BINDTODEVICE = 25
 
+# Maps the socket file descriptor to all active `AsyncSender` and `AsyncReceiver` objects. The sockets are driven by
+# `Node.perform_async_tx_rx()`.
+_async_socket_map = {}
+
 
 def _is_ipv6_addr_link_local(ip_addr):
     """Indicates if a given IPv6 address is link-local"""
@@ -774,10 +957,107 @@ def _create_socket_address(ip_address, port):
     return socket.getaddrinfo(ip_address, port)[0][4]
 
 
-class AsyncSender(asyncore.dispatcher):
+def _create_node_socket(node):
+    """Creates a non-blocking UDP socket bound to the network interface of the given node"""
+    sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, _SO_BINDTODEVICE, node.interface_name + '\0')
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.setblocking(False)
+    return sock
+
+
+class _AsyncSocket(object):
+    """ Base class of `AsyncSender` and `AsyncReceiver` (a UDP socket driven by `Node.perform_async_tx_rx()`)"""
+
+    def __init__(self, sock):
+        self._socket = sock
+        self._fileno = sock.fileno()
+        _async_socket_map[self._fileno] = self
+
+    def fileno(self):
+        return self._fileno
+
+    def readable(self, now):
+        return False
+
+    def writable(self, now):
+        return False
+
+    def next_event_time(self):
+        """Returns the time of the next scheduled event of this socket (`float('inf')` if none)"""
+        return float('inf')
+
+    def handle_read(self):
+        pass
+
+    def handle_write(self):
+        pass
+
+    def close(self):
+        if _async_socket_map.get(self._fileno) is self:
+            del _async_socket_map[self._fileno]
+        self._socket.close()
+
+
+class TrafficStats(object):
+    """ Statistics of a flow of IPv6 messages from an `AsyncSender` as seen by an `AsyncReceiver`
+
+    The latency of the n-th received message is measured from the n-th transmission of the sender, so it is only exact
+    when no messages are lost or reordered.
+    """
+
+    def __init__(self, tx_times, rx_times, msg_len):
+        self._tx_times = tx_times
+        self._rx_times = rx_times
+        self._msg_len = msg_len
+        self._latencies = [rx_time - tx_time for tx_time, rx_time in zip(tx_times, rx_times)]
+
+    @property
+    def tx_count(self):
+        return len(self._tx_times)
+
+    @property
+    def rx_count(self):
+        return len(self._rx_times)
+
+    @property
+    def lost_count(self):
+        return max(self.tx_count - self.rx_count, 0)
+
+    @property
+    def loss_ratio(self):
+        return float(self.lost_count) / self.tx_count if self.tx_count else 0.0
+
+    @property
+    def throughput(self):
+        """Received bytes per second (from the first transmission to the last reception)"""
+        if not self._rx_times or not self._tx_times or self._rx_times[-1] <= self._tx_times[0]:
+            return 0.0
+        return self.rx_count * self._msg_len / (self._rx_times[-1] - self._tx_times[0])
+
+    @property
+    def min_latency(self):
+        return min(self._latencies) if self._latencies else None
+
+    @property
+    def avg_latency(self):
+        return sum(self._latencies) / len(self._latencies) if self._latencies else None
+
+    @property
+    def max_latency(self):
+        return max(self._latencies) if self._latencies else None
+
+    def __repr__(self):
+        return 'TrafficStats(tx={}, rx={}, lost={}, throughput={:.1f} B/s, latency(min/avg/max)={})'.format(
+            self.tx_count, self.rx_count, self.lost_count, self.throughput,
+            '/'.join('{:.4f}'.format(latency) if latency is not None else '-'
+                     for latency in [self.min_latency, self.avg_latency, self.max_latency]))
+
+
+class AsyncSender(_AsyncSocket):
     """ An IPv6 async message sender - use `Node.prepare_tx()` to create one"""
 
-    def __init__(self, node, src_addr, src_port, dst_addr, dst_port, msg, count, mcast_hops=None):
+    def __init__(self, node, src_addr, src_port, dst_addr, dst_port, msg, count, mcast_hops=None, rate=None):
         self._node = node
         self._src_addr = src_addr
         self._src_port = src_port
@@ -785,14 +1065,13 @@ class AsyncSender(asyncore.dispatcher):
         self._dst_port = dst_port
         self._msg = msg
         self._count = count
+        self._rate = rate
         self._dst_sock_addr = _create_socket_address(dst_addr, dst_port)
-        self._tx_buffer = self._msg
-        self._tx_counter = 0
+        self._tx_times = []
+        self._start_time = None
 
         # Create a socket, bind it to the node's interface
-        sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, _SO_BINDTODEVICE, node.interface_name + '\0')
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock = _create_node_socket(node)
 
         # Set the IPV6_MULTICAST_HOPS
         if mcast_hops is not None:
@@ -807,7 +1086,7 @@ class AsyncSender(asyncore.dispatcher):
             src_sock_addr = _create_socket_address(src_addr, src_port)
         sock.bind(src_sock_addr)
 
-        asyncore.dispatcher.__init__(self, sock)
+        _AsyncSocket.__init__(self, sock)
 
     # Property getters
 
@@ -839,38 +1118,52 @@ class AsyncSender(asyncore.dispatcher):
     def count(self):
         return self._count
 
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def tx_times(self):
+        """returns the times (from `time.time()`) at which the messages were sent"""
+        return self._tx_times
+
     @property
     def was_successful(self):
         """Indicates if the transmission of IPv6 messages finished successfully"""
-        return self._tx_counter == self._count
+        return len(self._tx_times) == self._count
 
-    # asyncore.dispatcher callbacks
+    # `_AsyncSocket` callbacks
 
-    def readable(self):
-        return False
+    def next_event_time(self):
+        if self._rate is None or self._start_time is None:
+            return float('inf')
+        return self._start_time + len(self._tx_times) / float(self._rate)
 
-    def writable(self):
-        return True
+    def writable(self, now):
+        if self._start_time is None:
+            self._start_time = now
+        return self._rate is None or now >= self.next_event_time()
 
     def handle_write(self):
-        sent_len = self.sendto(self._tx_buffer, self._dst_sock_addr)
+        try:
+            sent_len = self._socket.sendto(self._msg, self._dst_sock_addr)
+        except socket.error as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS):
+                return  # try again when the socket is writable
+            raise
+
+        self._tx_times.append(time.time())
 
         if self._node._verbose:
             if sent_len < 30:
-                info_text = '{} bytes ("{}")'.format(sent_len, self._tx_buffer[:sent_len])
+                info_text = '{} bytes ("{}")'.format(sent_len, self._msg[:sent_len])
             else:
                 info_text = '{} bytes'.format(sent_len)
             _log('- Node{} sent {} to [{}]:{} from [{}]:{}'.format(self._node._index, info_text, self._dst_addr,
                                                                    self._dst_port, self._src_addr, self._src_port))
 
-        self._tx_buffer = self._tx_buffer[sent_len:]
-
-        if len(self._tx_buffer) == 0:
-            self._tx_counter += 1
-            if self._tx_counter < self._count:
-                self._tx_buffer = self._msg
-            else:
-                self.handle_close()
+        if len(self._tx_times) >= self._count:
+            self.handle_close()
 
     def handle_close(self):
         self.close()
@@ -879,27 +1172,25 @@ class AsyncSender(asyncore.dispatcher):
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 
-class AsyncReceiver(asyncore.dispatcher):
+class AsyncReceiver(_AsyncSocket):
     """ An IPv6 async message receiver - use `prepare_rx()` to create one"""
 
     _MAX_RECV_SIZE = 2048
 
     class _SenderInfo(object):
 
-        def __init__(self, sender_addr, sender_port, msg, count):
-            self._sender_addr = sender_addr
-            self._sender_port = sender_port
-            self._msg = msg
-            self._count = count
-            self._rx_counter = 0
+        def __init__(self, sender):
+            self._sender = sender
+            self._rx_times = []
 
-        def _check_received(self, msg, sender_addr, sender_port):
-            if self._msg == msg and self._sender_addr == sender_addr and self._sender_port == sender_port:
-                self._rx_counter += 1
+        def _check_received(self, msg, sender_addr, sender_port, rx_time):
+            sender = self._sender
+            if sender.msg == msg and sender.src_addr == sender_addr and sender.src_port == sender_port:
+                self._rx_times.append(rx_time)
             return self._did_recv_all()
 
         def _did_recv_all(self):
-            return self._rx_counter >= self._count
+            return len(self._rx_times) >= self._sender.count
 
     def __init__(self, node, local_port):
         self._node = node
@@ -909,22 +1200,19 @@ class AsyncReceiver(asyncore.dispatcher):
         # src_port))
         self._all_rx = []
         self._timeout = 0  # listen timeout (zero means forever)
-        self._started = False
-        self._start_time = 0
+        self._start_time = None
 
         # Create a socket, bind it to the node's interface
-        sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, _SO_BINDTODEVICE, node.interface_name + '\0')
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock = _create_node_socket(node)
 
         # Bind the socket to any IPv6 address with the given local port
         local_sock_addr = _create_socket_address('::', local_port)
         sock.bind(local_sock_addr)
 
-        asyncore.dispatcher.__init__(self, sock)
+        _AsyncSocket.__init__(self, sock)
 
-    def _add_sender(self, sender_addr, sender_port, msg, count):
-        self._senders.append(AsyncReceiver._SenderInfo(sender_addr, sender_port, msg, count))
+    def _add_sender(self, sender):
+        self._senders.append(AsyncReceiver._SenderInfo(sender))
 
     def _set_listen_timeout(self, timeout):
         self._timeout = timeout
@@ -949,13 +1237,24 @@ class AsyncReceiver(asyncore.dispatcher):
         """Indicates if all expected IPv6 messages were received successfully"""
         return len(self._senders) == 0 or all([sender._did_recv_all() for sender in self._senders])
 
-    # asyncore.dispatcher callbacks
+    def get_stats(self, sender):
+        """Returns the `TrafficStats` of the messages received from a given `AsyncSender` (see `prepare_rx()`)"""
+        for sender_info in self._senders:
+            if sender_info._sender is sender:
+                return TrafficStats(sender.tx_times, sender_info._rx_times, len(sender.msg))
+        raise Node._NodeError('{} is not prepared to receive from the given sender'.format(self))
+
+    # `_AsyncSocket` callbacks
+
+    def next_event_time(self):
+        if self._timeout == 0 or self._start_time is None:
+            return float('inf')
+        return self._start_time + self._timeout
 
-    def readable(self):
-        if not self._started:
-            self._start_time = time.time()
-            self._started = True
-        if self._timeout != 0 and time.time() - self._start_time >= self._timeout:
+    def readable(self, now):
+        if self._start_time is None:
+            self._start_time = now
+        if self._timeout != 0 and now - self._start_time >= self._timeout:
             self.handle_close()
             if self._node._verbose:
                 _log('- Node{} finished listening on port {} for {} sec, received {} msg(s)'.format(
@@ -963,11 +1262,15 @@ class AsyncReceiver(asyncore.dispatcher):
             return False
         return True
 
-    def writable(self):
-        return False
-
     def handle_read(self):
-        (msg, src_sock_addr) = self.recvfrom(AsyncReceiver._MAX_RECV_SIZE)
+        try:
+            (msg, src_sock_addr) = self._socket.recvfrom(AsyncReceiver._MAX_RECV_SIZE)
+        except socket.error as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return
+            raise
+
+        rx_time = time.time()
         src_addr = src_sock_addr[0]
         src_port = src_sock_addr[1]
 
@@ -986,7 +1289,7 @@ class AsyncReceiver(asyncore.dispatcher):
 
         self._all_rx.append((msg, (src_addr, src_port)))
 
-        if all([sender._check_received(msg, src_addr, src_port) for sender in self._senders]):
+        if all([sender._check_received(msg, src_addr, src_port, rx_time) for sender in self._senders]):
             self.handle_close()
 
     def handle_close(self):
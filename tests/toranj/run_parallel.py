@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2024, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  Runs `toranj-cli` test scripts concurrently.
+#
+#  Every test runs in its own sub-process with a distinct `PORT_OFFSET`. The simulation platform shifts the radio,
+#  TREL and infra-if ports of a node by `PORT_OFFSET * (MAX_NETWORK_SIZE + 1)`, so each test gets its own disjoint
+#  range of node ports and tests running at the same time cannot hear each other. Each test also runs in its own
+#  directory, which holds its `tmp/` flash files, its `ot-logs<index>.log` node logs and its `test.log` output.
+#
+
+import argparse
+import glob
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+_TORANJ_DIR = os.path.dirname(os.path.abspath(__file__))
+_CLI_DIR = os.path.join(_TORANJ_DIR, 'cli')
+
+MAX_JOBS = int(os.getenv('MAX_JOBS', os.cpu_count() or 1))
+
+_COLOR_PASS = '\033[0;32m'
+_COLOR_FAIL = '\033[0;31m'
+_COLOR_NONE = '\033[0m'
+
+# Tests which need energy scan and are skipped on a TREL only radio link (see `start.sh`).
+_ENERGY_SCAN_TESTS = ['test-602-channel-manager-channel-select.py']
+
+_print_lock = threading.Lock()
+
+
+def _log(text):
+    with _print_lock:
+        print(text, flush=True)
+
+
+class PortOffsetPool:
+    """Hands out the `PORT_OFFSET` values, one to each running test."""
+
+    def __init__(self, size: int):
+        self._pool = queue.Queue(maxsize=size)
+        for port_offset in range(0, size):
+            self._pool.put_nowait(port_offset)
+
+    def allocate(self) -> int:
+        return self._pool.get()
+
+    def release(self, port_offset: int):
+        self._pool.put_nowait(port_offset)
+
+
+class TestResult(object):
+
+    def __init__(self, script: str):
+        self.script = script
+        self.passed = False
+        self.attempts = 0
+        self.duration = 0.0
+        self.run_directory = None
+
+
+def default_scripts(radio: str) -> List[str]:
+    """Returns the CLI test scripts `start.sh` would run for the given `TORANJ_RADIO`."""
+
+    scripts = sorted(glob.glob(os.path.join(_CLI_DIR, 'test-*.py')))
+    multi_radio = [script for script in scripts if os.path.basename(script).startswith('test-7')]
+
+    if radio == 'multi':
+        return multi_radio
+
+    scripts = [script for script in scripts if script not in multi_radio]
+
+    if radio == 'trel':
+        scripts = [script for script in scripts if os.path.basename(script) not in _ENERGY_SCAN_TESTS]
+
+    return scripts
+
+
+def run_test(script: str, port_offset: int, run_directory: str, env: dict, timeout: float) -> bool:
+    """Runs a single test script once in `run_directory`. Returns `True` if it passed."""
+
+    shutil.rmtree(run_directory, ignore_errors=True)
+    os.makedirs(os.path.join(run_directory, 'tmp'))
+
+    env = dict(env)
+    env['PORT_OFFSET'] = str(port_offset)
+
+    with open(os.path.join(run_directory, 'test.log'), 'wt') as output:
+        try:
+            subprocess.run([sys.executable, os.path.abspath(script)],
+                           stdout=output,
+                           stderr=subprocess.STDOUT,
+                           stdin=subprocess.DEVNULL,
+                           cwd=run_directory,
+                           env=env,
+                           timeout=timeout,
+                           check=True)
+        except subprocess.TimeoutExpired:
+            output.write(f'\n *** TIMEOUT after {timeout} seconds\n')
+            return False
+        except subprocess.CalledProcessError:
+            return False
+
+    return True
+
+
+def run_tests(scripts: List[str], jobs: int, retries: int, retry_delay: float, timeout: float,
+              run_directory: str) -> List[TestResult]:
+    port_offset_pool = PortOffsetPool(jobs)
+
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [_CLI_DIR, env.get('PYTHONPATH')]))
+    env['top_builddir'] = os.path.abspath(env.get('top_builddir', os.path.join(_TORANJ_DIR, '..', '..')))
+
+    def run_one(script):
+        result = TestResult(script)
+        test_name = os.path.splitext(os.path.basename(script))[0]
+        result.run_directory = os.path.join(run_directory, test_name)
+        start_time = time.time()
+
+        while not result.passed and result.attempts <= retries:
+            if result.attempts > 0:
+                _log(f'Attempt {result.attempts} running {test_name} failed. Trying again.')
+                time.sleep(retry_delay)
+
+            result.attempts += 1
+            port_offset = port_offset_pool.allocate()
+
+            try:
+                _log(f'Running PORT_OFFSET={port_offset} {test_name}')
+                result.passed = run_test(script, port_offset, result.run_directory, env, timeout)
+            finally:
+                port_offset_pool.release(port_offset)
+
+        result.duration = time.time() - start_time
+
+        color = _COLOR_PASS if result.passed else _COLOR_FAIL
+        status = 'PASS' if result.passed else 'FAIL'
+        _log(f'{color}{status}{_COLOR_NONE} {test_name} ({result.duration:.1f}s, {result.attempts} attempt(s))')
+        return result
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run_one, scripts))
+
+
+def print_summary(results: List[TestResult], elapsed: float):
+    print('-' * 120)
+    print('Summary')
+    print('-' * 120)
+
+    for result in sorted(results, key=lambda result: result.duration, reverse=True):
+        color = _COLOR_PASS if result.passed else _COLOR_FAIL
+        status = 'PASS' if result.passed else 'FAIL'
+        print(f'{color}{status}{_COLOR_NONE} {result.duration:8.1f}s  {result.attempts} attempt(s)  '
+              f'{os.path.basename(result.script)}')
+
+    serial_time = sum(result.duration for result in results)
+    print('-' * 120)
+    print(f'{len(results)} tests, {sum(not result.passed for result in results)} failed, '
+          f'wall time {elapsed:.1f}s, sum of test times {serial_time:.1f}s')
+
+    for result in results:
+        if not result.passed:
+            print(f'{_COLOR_FAIL}*** {os.path.basename(result.script)} failed, logs in {result.run_directory}'
+                  f'{_COLOR_NONE}')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Run toranj CLI tests concurrently.')
+    parser.add_argument('-j',
+                        '--jobs',
+                        type=int,
+                        default=MAX_JOBS,
+                        help='maximum number of tests running at the same time (default: %(default)s)')
+    parser.add_argument('--retries',
+                        type=int,
+                        default=7,
+                        help='number of times a failed test is retried (default: %(default)s)')
+    parser.add_argument('--retry-delay',
+                        type=float,
+                        default=10,
+                        help='seconds to wait before retrying a failed test (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds after which a test attempt is aborted')
+    parser.add_argument('--run-directory',
+                        type=str,
+                        default=os.path.join(_TORANJ_DIR, 'runs'),
+                        help='directory holding the per-test run directories (default: %(default)s)')
+    parser.add_argument('--radio',
+                        type=str,
+                        default=os.getenv('TORANJ_RADIO', '15.4'),
+                        help='radio link type the tests are built for, selects the default scripts')
+    parser.add_argument('scripts', nargs='*', type=str, help='test scripts to run (default: all CLI tests)')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    return args
+
+
+def main():
+    args = parse_args()
+    scripts = args.scripts or default_scripts(args.radio)
+
+    print(f'Running {len(scripts)} tests with up to {args.jobs} jobs in {os.path.abspath(args.run_directory)}')
+
+    start_time = time.time()
+    results = run_tests(scripts, args.jobs, args.retries, args.retry_delay, args.timeout,
+                        os.path.abspath(args.run_directory))
+    print_summary(results, time.time() - start_time)
+
+    sys.exit(0 if all(result.passed for result in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
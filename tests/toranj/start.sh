@@ -154,6 +154,11 @@ cleanup
 
 if [ "$TORANJ_CLI" = 1 ]; then
 
+    if [ "$TORANJ_PARALLEL" = 1 ]; then
+        sudo -E "${python_app}" ./run_parallel.py --radio "${TORANJ_RADIO}" || die "parallel run failed"
+        exit 0
+    fi
+
     if [ "$TORANJ_RADIO" = "multi" ]; then
         run cli/test-700-multi-radio-join.py
         run cli/test-701-multi-radio-probe.py
@@ -231,6 +236,7 @@ if [ "$TORANJ_RADIO" = "multi" ]; then
     exit 0
 fi
 
+run ncp/test-000-dbus-value-format.py
 run ncp/test-001-get-set.py
 run ncp/test-002-form.py
 run ncp/test-003-join.py
@@ -27,18 +27,20 @@
 #  POSSIBILITY OF SUCH DAMAGE.
 #
 
+import enum
 import logging
 import os
 import sys
 import threading
+import time
 import queue
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 import otci
 from otci import OTCI
-from otci.errors import ExpectLineTimeoutError, InvalidArgumentsError
+from otci.errors import CommandError, ExpectLineTimeoutError, InvalidArgumentsError
 
 CP_CAPABILITY_VERSION = "0.1.1-dev"
 
@@ -71,19 +73,106 @@ class Frame:
     src_ext_address: Optional[str] = None
 
 
+def _get_list(name: str, default: str, parse=int) -> list:
+    return [parse(value) for value in os.getenv(name, default).split(',')]
+
+
+@dataclass
+class FrameStressConfig:
+    """The parameters of a frame stress run, which streams a frame format from the sender to the receiver.
+
+    The frame is sent `number` times for each combination of `extra_lengths`, `csma_ca_enabled` and
+    `max_frame_retries`.
+
+    Attributes:
+      number: The number of frames sent by each run.
+      extra_lengths: The numbers of payload bytes appended to the frame.
+      csma_ca_enabled: The values of the `otRadioFrame.mInfo.mTxInfo.mCsmaCaEnabled` field.
+      max_frame_retries: The values of the `otRadioFrame.mInfo.mTxInfo.mMaxFrameRetries` field.
+      max_csma_backoffs: The value of the `otRadioFrame.mInfo.mTxInfo.mMaxCsmaBackoffs` field.
+      repeat_interval: The frames are sent by `diag repeat` with this interval in milliseconds. They are sent back to
+          back by `diag send` if it is None.
+      timeout: The maximum time in seconds a run waits for the frames to be sent.
+    """
+    number: int = 1000
+    extra_lengths: List[int] = field(default_factory=lambda: [0, 32, 64])
+    csma_ca_enabled: List[bool] = field(default_factory=lambda: [True])
+    max_frame_retries: List[int] = field(default_factory=lambda: [0])
+    max_csma_backoffs: int = 4
+    repeat_interval: Optional[int] = None
+    timeout: float = 60
+
+    @staticmethod
+    def from_env() -> 'FrameStressConfig':
+        repeat_interval = os.getenv('FRAME_STRESS_REPEAT_INTERVAL')
+        return FrameStressConfig(number=int(os.getenv('FRAME_STRESS_NUMBER', '1000')),
+                                 extra_lengths=_get_list('FRAME_STRESS_LENGTHS', '0,32,64'),
+                                 csma_ca_enabled=_get_list('FRAME_STRESS_CSMA', '1', lambda value: value == '1'),
+                                 max_frame_retries=_get_list('FRAME_STRESS_RETRIES', '0'),
+                                 repeat_interval=int(repeat_interval) if repeat_interval else None,
+                                 timeout=float(os.getenv('FRAME_STRESS_TIMEOUT', '60')))
+
+
+class DeviceState(enum.Enum):
+    """The state of the DUT and the reference device that a test case starts from.
+
+    Attributes:
+      RESET: Both devices are factory reset. Test cases starting from this state change the devices, so every one of
+          them starts with a factory reset.
+      DIAG: Both devices are factory reset and only used in the diag mode, which is stopped after each test case.
+          Test cases starting from this state share one factory reset.
+      NETWORK: The DUT is the leader of the default dataset's network and the reference device is attached to it.
+          Test cases starting from this state share the network.
+    """
+    RESET = 'reset'
+    DIAG = 'diag'
+    NETWORK = 'network'
+
+
 class DeviceManager(object):
     """Provides the DUT, reference device and common methods for test cases."""
 
     DEFAULT_FORMAT_ALIGN_LENGTH = 58  # The default formatted string alignment length
 
+    __shared = None
+    __shared_refs = 0
+
+    # Node IDs of the simulated devices, the relays take the node IDs after them
+    DUT_SIM_NODEID = 1
+    REF_SIM_NODEID = 2
+
     def __init__(self):
         self.__dut = self.__connect_dut()
         self.__ref = self.__connect_reference_device()
+        self.__relays = []
+        self.__state = None
+        self.__results = []
 
         if self.__get_debug_enabled():
             logger = logging.getLogger()
             logger.setLevel(logging.DEBUG)
 
+    @classmethod
+    def acquire(cls) -> 'DeviceManager':
+        """Returns the device manager shared by the test classes, connecting to the devices on first use.
+
+        Sharing the device manager lets a test class reuse the device state left by the previous one.
+        """
+        if cls.__shared is None:
+            cls.__shared = DeviceManager()
+        cls.__shared_refs += 1
+        return cls.__shared
+
+    def release(self):
+        """Releases the device manager returned by `acquire()`, the devices are closed by the last release."""
+        DeviceManager.__shared_refs -= 1
+        if DeviceManager.__shared_refs == 0:
+            DeviceManager.__shared = None
+            self.__dut.close()
+            self.__ref.close()
+            for relay in self.__relays:
+                relay.close()
+
     @property
     def dut(self) -> OTCI:
         return self.__dut
@@ -95,13 +184,72 @@ class DeviceManager(object):
     def output_test_result_string(self, name: str, value: str, align_length: int = DEFAULT_FORMAT_ALIGN_LENGTH):
         prefix = (name + ' ').ljust(align_length, '-')
         print(f'{prefix} {value}')
+        self.__results.append({'name': name, 'value': value})
 
     def output_test_result_bool(self, name: str, value: bool, align_length: int = DEFAULT_FORMAT_ALIGN_LENGTH):
         self.output_test_result_string(name, 'OK' if value else 'NotSupported', align_length)
 
+    def connect_relays(self, number: int) -> List[OTCI]:
+        """Returns `number` relay devices, which forward the traffic between the DUT and the reference device.
+
+        The relays are connected on first use and closed with the DUT and the reference device.
+        """
+        if os.getenv('RELAY_CLI_SIM'):
+            while len(self.__relays) < number:
+                nodeid = self.REF_SIM_NODEID + 1 + len(self.__relays)
+                self.__relays.append(otci.connect_cli_sim(os.getenv('RELAY_CLI_SIM'), nodeid, simulator=None))
+        elif os.getenv('RELAY_CLI_SERIAL'):
+            devices = os.getenv('RELAY_CLI_SERIAL').split(',')
+            if len(devices) < number:
+                raise InvalidArgumentsError(
+                    f'{number} relays are required, but RELAY_CLI_SERIAL only sets {len(devices)}')
+            while len(self.__relays) < number:
+                self.__relays.append(otci.connect_cli_serial(devices[len(self.__relays)]))
+        elif number > 0:
+            raise InvalidArgumentsError(
+                'Please set RELAY_CLI_SERIAL or RELAY_CLI_SIM to connect to the relay devices.')
+
+        return self.__relays[:number]
+
+    def pop_results(self) -> List[Dict[str, str]]:
+        """Returns the results output since the last call."""
+        results, self.__results = self.__results, []
+        return results
+
     def get_default_dataset(self):
         return self.__dut.create_dataset(channel=20, network_key='00112233445566778899aabbccddcafe')
 
+    def get_firmware_versions(self) -> Dict[str, Optional[str]]:
+        """Returns the firmware versions of the DUT, its RCP and the reference device."""
+        try:
+            dut_rcp = self.__dut.get_rcp_version()
+        except CommandError:
+            dut_rcp = None  # The DUT is not an RCP based device.
+
+        return {'dut': self.__dut.version, 'dut_rcp': dut_rcp, 'ref': self.__ref.version}
+
+    def prepare_devices(self, state: DeviceState):
+        """Brings the DUT and the reference device to the given state.
+
+        The factory reset is skipped if the devices are already in a state which can be shared.
+        """
+        if state == self.__state and (state != DeviceState.NETWORK or self.__is_network_formed()):
+            return
+
+        self.__state = None
+        self.__dut.factory_reset()
+        self.__ref.factory_reset()
+
+        if state == DeviceState.NETWORK:
+            self.__form_network()
+
+        if state != DeviceState.RESET:
+            self.__state = state
+
+    def invalidate_state(self):
+        """Makes the next `prepare_devices()` start from a factory reset."""
+        self.__state = None
+
     def send_formatted_frames_retries(self, sender: OTCI, receiver: OTCI, frame: Frame, max_send_retries: int = 5):
         for i in range(0, max_send_retries):
             if self.__send_formatted_frame(sender, receiver, frame):
@@ -109,6 +257,51 @@ class DeviceManager(object):
 
         return False
 
+    def stress_formatted_frames(self, sender: OTCI, receiver: OTCI, frame: Frame,
+                                config: FrameStressConfig) -> List[Dict[str, Any]]:
+        """Streams the frame from the sender to the receiver, and returns the result of each run.
+
+        Each result holds the tx statistics of the sender, the number of frames received by the receiver, the frame
+        success rate, the delivery rate and the timing of the run.
+        """
+        self.__prepare_frame_security(sender, receiver, frame)
+
+        sender.diag_start()
+        receiver.diag_start()
+
+        channel = 11
+        sender.diag_set_channel(channel)
+        receiver.diag_set_channel(channel)
+        receiver.diag_radio_receive()
+        receiver.diag_set_radio_receive_filter_dest_mac_address(frame.dst_address)
+        receiver.diag_enable_radio_receive_filter()
+
+        results = []
+
+        for extra_length in config.extra_lengths:
+            tx_frame = self.__append_payload(frame.tx_frame, extra_length)
+
+            for csma_ca_enabled in config.csma_ca_enabled:
+                for max_frame_retries in config.max_frame_retries:
+                    sender.diag_frame(tx_frame,
+                                      is_security_processed=frame.is_security_processed,
+                                      max_csma_backoffs=config.max_csma_backoffs,
+                                      max_frame_retries=max_frame_retries,
+                                      csma_ca_enabled=csma_ca_enabled)
+                    result = {
+                        'frame': frame.name,
+                        'length': len(tx_frame) // 2,
+                        'csma_ca_enabled': csma_ca_enabled,
+                        'max_frame_retries': max_frame_retries,
+                    }
+                    result.update(self.__run_frame_stress(sender, receiver, config))
+                    results.append(result)
+
+        sender.diag_stop()
+        receiver.diag_stop()
+
+        return results
+
     #
     # Private methods
     #
@@ -128,9 +321,12 @@ class DeviceManager(object):
             node = otci.connect_cli_serial(os.getenv('DUT_CLI_SERIAL'))
         elif os.getenv('DUT_SSH'):
             node = otci.connect_otbr_ssh(os.getenv('DUT_SSH'))
+        elif os.getenv('DUT_CLI_SIM'):
+            node = otci.connect_cli_sim(os.getenv('DUT_CLI_SIM'), self.DUT_SIM_NODEID, simulator=None)
         else:
             raise InvalidArgumentsError(
-                "Please set DUT_ADB_TCP, DUT_ADB_USB, DUT_CLI_SERIAL or DUT_SSH to connect to the DUT device.")
+                "Please set DUT_ADB_TCP, DUT_ADB_USB, DUT_CLI_SERIAL, DUT_SSH or DUT_CLI_SIM to connect to the DUT device."
+            )
 
         return node
 
@@ -141,13 +337,27 @@ class DeviceManager(object):
             node = otci.connect_otbr_ssh(os.getenv('REF_SSH'))
         elif os.getenv('REF_ADB_USB'):
             node = otci.connect_otbr_adb_usb(os.getenv('REF_ADB_USB'), adb_key=self.__get_adb_key())
+        elif os.getenv('REF_CLI_SIM'):
+            node = otci.connect_cli_sim(os.getenv('REF_CLI_SIM'), self.REF_SIM_NODEID, simulator=None)
         else:
             raise InvalidArgumentsError(
-                "Please set REF_CLI_SERIAL, REF_SSH or REF_ADB_USB to connect to the reference device.")
+                "Please set REF_CLI_SERIAL, REF_SSH, REF_ADB_USB or REF_CLI_SIM to connect to the reference device.")
 
         return node
 
-    def __send_formatted_frame(self, sender: OTCI, receiver: OTCI, frame: Frame):
+    def __form_network(self):
+        dataset = self.get_default_dataset()
+
+        self.__dut.join(dataset)
+        self.__dut.wait_for('state', 'leader')
+
+        self.__ref.join(dataset)
+        self.__ref.wait_for('state', ['child', 'router'])
+
+    def __is_network_formed(self) -> bool:
+        return self.__dut.get_state() == 'leader' and self.__ref.get_state() in ('child', 'router')
+
+    def __prepare_frame_security(self, sender: OTCI, receiver: OTCI, frame: Frame):
         # When `is_security_processed` is False, the frame may need the radio driver
         # to encrypt the frame. Here sets the active dataset and the MAC source address for the
         # radio driver to encrypt the frame.
@@ -162,6 +372,9 @@ class DeviceManager(object):
             sender.set_dataset_bytes('active', frame.active_dataset)
             sender.set_extaddr(frame.src_ext_address)
 
+    def __send_formatted_frame(self, sender: OTCI, receiver: OTCI, frame: Frame):
+        self.__prepare_frame_security(sender, receiver, frame)
+
         sender.diag_start()
         receiver.diag_start()
 
@@ -225,3 +438,90 @@ class DeviceManager(object):
             result_queue.put(result)
         finally:
             receiver.set_execute_command_retry(OTCI.DEFAULT_EXEC_COMMAND_RETRY)
+
+    def __append_payload(self, tx_frame: str, extra_length: int) -> str:
+        # Thread only uses the security level 5, which appends a 4 bytes MIC to the payload of a secured frame.
+        FCS_LENGTH = 2
+        MIC_LENGTH = 4
+        MAX_FRAME_LENGTH = 127
+        FRAME_TYPE_MULTIPURPOSE = 5
+
+        psdu = bytes.fromhex(tx_frame)
+        if psdu[0] & 0x07 == FRAME_TYPE_MULTIPURPOSE:
+            is_secured = bool(psdu[1] & 0x02)  # The security enabled bit of the long multipurpose frame control
+        else:
+            is_secured = bool(psdu[0] & 0x08)
+        footer_length = FCS_LENGTH + (MIC_LENGTH if is_secured else 0)
+
+        if len(psdu) + extra_length > MAX_FRAME_LENGTH:
+            raise InvalidArgumentsError(f'The frame of {len(psdu)} bytes can not be extended by {extra_length} bytes')
+
+        payload = bytes(i & 0xff for i in range(extra_length))
+        return (psdu[:-footer_length] + payload + psdu[-footer_length:]).hex()
+
+    def __run_frame_stress(self, sender: OTCI, receiver: OTCI, config: FrameStressConfig) -> Dict[str, Any]:
+        sender.diag_stats_clear()
+        receiver.diag_stats_clear()
+
+        start_time = time.time()
+
+        if config.repeat_interval is None:
+            sender.diag_send(config.number, is_async=True)
+            sender_stats = self.__wait_frames_sent(sender, config.number, config.timeout)
+        else:
+            sender.diag_repeat(config.repeat_interval)
+            sender.wait(config.number * config.repeat_interval / 1000)
+            sender.diag_repeat_stop()
+            sender_stats = sender.diag_get_stats()
+
+        duration = time.time() - start_time
+
+        # Wait for the last frame to be received
+        receiver.wait(0.1)
+        received = receiver.diag_get_stats()['received_packets']
+
+        sent = self.__get_sent_frames(sender_stats)
+        return {
+            'sent_frames':
+                sent,
+            'sent_success_packets':
+                sender_stats['sent_success_packets'],
+            'sent_error_cca_packets':
+                sender_stats['sent_error_cca_packets'],
+            'sent_error_abort_packets':
+                sender_stats['sent_error_abort_packets'],
+            'sent_error_others_packets':
+                sender_stats['sent_error_invalid_state_packets'] + sender_stats['sent_error_others_packets'],
+            'received_packets':
+                received,
+            'success_rate':
+                round(sender_stats['sent_success_packets'] / sent, 4) if sent else None,
+            'delivery_rate':
+                round(received / sent, 4) if sent else None,
+            'duration':
+                round(duration, 3),
+            'frames_per_second':
+                round(sent / duration, 1),
+            'mean_interval':
+                round(duration * 1000 / sent, 3) if sent else None,
+        }
+
+    def __wait_frames_sent(self, sender: OTCI, number: int, timeout: float) -> Dict[str, int]:
+        POLL_INTERVAL = 0.05
+        deadline = time.time() + timeout
+
+        while True:
+            stats = sender.diag_get_stats()
+            if self.__get_sent_frames(stats) >= number:
+                return stats
+
+            if time.time() >= deadline:
+                # The command `diag repeat stop` also stops the remaining frames of `diag send`
+                sender.diag_repeat_stop()
+                return sender.diag_get_stats()
+
+            sender.wait(POLL_INTERVAL)
+
+    def __get_sent_frames(self, stats: Dict[str, int]) -> int:
+        return (stats['sent_success_packets'] + stats['sent_error_cca_packets'] + stats['sent_error_abort_packets'] +
+                stats['sent_error_invalid_state_packets'] + stats['sent_error_others_packets'])
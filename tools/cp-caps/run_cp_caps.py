@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2024, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  Runs the RCP capability test cases and writes a JSON capability report.
+#
+#  The test classes are run grouped by the device state they start from (see `DeviceState`), so that test cases
+#  which can share a factory reset or a network run one after another. The conclusive results are cached per firmware
+#  version of the DUT, its RCP and the reference device, and the test cases whose results are cached are skipped.
+#
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import unittest
+
+from typing import Dict, List, Optional
+
+from device_manager import CP_CAPABILITY_VERSION, DeviceManager, DeviceState
+
+_CP_CAPS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The order in which the groups of test classes are run
+_STATE_ORDER = [DeviceState.DIAG, DeviceState.RESET, DeviceState.NETWORK]
+
+
+class ResultCache(object):
+    """Stores the conclusive results of the passed test cases per firmware version."""
+
+    def __init__(self, path: str, versions: Dict[str, Optional[str]]):
+        self._path = path
+        self._key = json.dumps({'cp_caps': CP_CAPABILITY_VERSION, **versions}, sort_keys=True)
+
+        try:
+            with open(self._path, 'rt') as f:
+                self._cache = json.load(f)
+        except (OSError, ValueError):
+            self._cache = {}
+
+    def get(self, test_id: str) -> Optional[dict]:
+        return self._cache.get(self._key, {}).get(test_id)
+
+    def put(self, test_id: str, check: dict):
+        self._cache.setdefault(self._key, {})[test_id] = check
+
+    def remove(self, test_id: str):
+        self._cache.get(self._key, {}).pop(test_id, None)
+
+    @staticmethod
+    def is_conclusive(check: dict, cacheable: bool = True) -> bool:
+        # A capability may be reported as `NotSupported` because a frame was lost or a wait timed out, so it is
+        # checked again on the next run. The results of test classes which only take measurements are never reused.
+        return cacheable and check['status'] == 'passed' and not any(result['value'].startswith('NotSupported')
+                                                                     for result in check['results'])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        with open(self._path, 'wt') as f:
+            json.dump(self._cache, f, indent=2)
+
+
+class CapabilityResult(unittest.TestResult):
+    """Collects the status, the output results and the duration of each test case."""
+
+    def __init__(self, device_manager: DeviceManager):
+        super().__init__()
+        self.checks = []
+        self._device_manager = device_manager
+        self._status = None
+        self._start_time = None
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._status = 'passed'
+        self._start_time = time.time()
+        self._device_manager.pop_results()
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.checks.append({
+            'id': test.id(),
+            'state': test.DEVICE_STATE.value,
+            'status': self._status,
+            'duration': round(time.time() - self._start_time, 3),
+            'cached': False,
+            'results': self._device_manager.pop_results(),
+        })
+        self._start_time = None
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.__add_problem(test, err, 'error')
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.__add_problem(test, err, 'failed')
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._status = 'skipped'
+
+    def __add_problem(self, test, err, status: str):
+        print(self._exc_info_to_string(err, test), file=sys.stderr)
+        self._device_manager.invalidate_state()
+
+        if self._start_time is not None:
+            self._status = status
+        else:
+            # The error is raised by a class or module fixture, such as `setUpClass()`
+            self.checks.append({
+                'id': test.id(),
+                'state': None,
+                'status': status,
+                'duration': 0,
+                'cached': False,
+                'results': []
+            })
+
+
+def default_modules() -> List[str]:
+    scripts = sorted(glob.glob(os.path.join(_CP_CAPS_DIR, 'test_*.py')))
+    return [os.path.splitext(os.path.basename(script))[0] for script in scripts]
+
+
+def iter_test_cases(suite: unittest.TestSuite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_test_cases(test)
+        else:
+            yield test
+
+
+def group_test_cases(tests: List[unittest.TestCase]) -> List[List[unittest.TestCase]]:
+    """Groups the test cases by class, and orders the classes by the device state they start from."""
+    classes = {}
+    for test in tests:
+        classes.setdefault(type(test), []).append(test)
+
+    return sorted(classes.values(), key=lambda group: _STATE_ORDER.index(type(group[0]).DEVICE_STATE))
+
+
+def is_cacheable(test: Optional[unittest.TestCase]) -> bool:
+    """Returns whether the results of a test case may be cached, test classes set `CACHEABLE = False` otherwise."""
+    return getattr(test, 'CACHEABLE', True)
+
+
+def print_cached_check(check: dict):
+    for result in check['results']:
+        prefix = (result['name'] + ' ').ljust(DeviceManager.DEFAULT_FORMAT_ALIGN_LENGTH, '-')
+        print(f'{prefix} {result["value"]} (cached)')
+
+
+def run(names: List[str], cache_path: Optional[str], report_path: str, refresh_cache: bool = False) -> bool:
+    tests = list(iter_test_cases(unittest.defaultTestLoader.loadTestsFromNames(names)))
+
+    # Keep the devices connected for the whole run, so that the device state is shared by the test classes
+    device_manager = DeviceManager.acquire()
+    try:
+        versions = device_manager.get_firmware_versions()
+        cache = ResultCache(cache_path, versions) if cache_path else None
+
+        start_time = time.time()
+        checks = []
+        result = CapabilityResult(device_manager)
+
+        # One suite runs all the test cases, so that each test class is set up and torn down once
+        suite = unittest.TestSuite()
+        for group in group_test_cases(tests):
+            for test in group:
+                check = cache.get(test.id()) if cache and not refresh_cache and is_cacheable(test) else None
+                if check is None:
+                    suite.addTest(test)
+                else:
+                    print_cached_check(check)
+                    checks.append({**check, 'cached': True})
+
+        suite.run(result)
+    finally:
+        device_manager.release()
+
+    checks += result.checks
+    if cache:
+        tests_by_id = {test.id(): test for test in tests}
+        for check in result.checks:
+            if ResultCache.is_conclusive(check, is_cacheable(tests_by_id.get(check['id']))):
+                cache.put(check['id'], check)
+            else:
+                cache.remove(check['id'])
+        cache.save()
+
+    report = {
+        'cp_caps_version': CP_CAPABILITY_VERSION,
+        'firmware_versions': versions,
+        'duration': round(time.time() - start_time, 3),
+        'checks': sorted(checks, key=lambda check: check['id']),
+    }
+    with open(report_path, 'wt') as f:
+        json.dump(report, f, indent=2)
+
+    print(f'{len(checks)} test cases, {sum(check["cached"] for check in checks)} cached, '
+          f'{sum(check["status"] in ("failed", "error") for check in checks)} failed, '
+          f'{report["duration"]:.1f}s, report written to {report_path}')
+
+    return result.wasSuccessful()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Run the RCP capability test cases and write a JSON report.',
+                                     epilog='The devices are configured by the same environment variables as the '
+                                     'unittest commands, see README.md.')
+    parser.add_argument('--report',
+                        type=str,
+                        default='cp_caps_report.json',
+                        help='path of the JSON capability report (default: %(default)s)')
+    parser.add_argument('--cache',
+                        type=str,
+                        default=os.path.join(os.path.expanduser('~'), '.cache', 'cp-caps', 'results.json'),
+                        help='path of the result cache (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='run all the test cases and do not update the cache')
+    parser.add_argument('--refresh-cache',
+                        action='store_true',
+                        help='run all the test cases and overwrite their cached results')
+    parser.add_argument('names',
+                        nargs='*',
+                        type=str,
+                        help='test modules, classes or test cases to run (default: all test modules)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    passed = run(args.names or default_modules(),
+                 None if args.no_cache else args.cache,
+                 args.report,
+                 refresh_cache=args.refresh_cache)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -30,21 +30,22 @@
 import unittest
 
 from otci import OTCI
-from device_manager import DeviceManager
+from device_manager import DeviceManager, DeviceState
 
 
 class TestCsl(unittest.TestCase):
     """Test whether the DUT supports the CSL feature."""
 
+    DEVICE_STATE = DeviceState.RESET
+
     @classmethod
     def setUpClass(cls):
-        cls.__device_manager = DeviceManager()
+        cls.__device_manager = DeviceManager.acquire()
         cls.__dut = cls.__device_manager.dut
         cls.__ref = cls.__device_manager.ref
 
     def setUp(self):
-        self.__dut.factory_reset()
-        self.__ref.factory_reset()
+        self.__device_manager.prepare_devices(self.DEVICE_STATE)
 
     def test_csl_transmitter(self):
         """Test whether the DUT supports the CSL transmitter."""
@@ -78,8 +79,7 @@ class TestCsl(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.__dut.close()
-        cls.__ref.close()
+        cls.__device_manager.release()
 
 
 if __name__ == '__main__':
@@ -32,19 +32,20 @@ import os
 
 from typing import List
 from otci import OTCI
-from device_manager import DeviceManager, Frame
+from device_manager import DeviceManager, DeviceState, Frame
 
 
 class TestDiagCommands(unittest.TestCase):
     """Test whether the DUT supports all diag commands."""
 
+    DEVICE_STATE = DeviceState.DIAG
+
     @classmethod
     def setUpClass(cls):
-        cls.__device_manager = DeviceManager()
+        cls.__device_manager = DeviceManager.acquire()
         cls.__dut = cls.__device_manager.dut
         cls.__ref = cls.__device_manager.ref
-        cls.__dut.factory_reset()
-        cls.__ref.factory_reset()
+        cls.__device_manager.prepare_devices(cls.DEVICE_STATE)
 
     def setUp(self):
         self.__dut.diag_start()
@@ -303,8 +304,7 @@ class TestDiagCommands(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.__dut.close()
-        cls.__ref.close()
+        cls.__device_manager.release()
 
 
 if __name__ == '__main__':
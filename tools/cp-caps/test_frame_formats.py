@@ -30,20 +30,20 @@
 import unittest
 
 from otci import OTCI
-from device_manager import DeviceManager, Frame
+from device_manager import DeviceManager, DeviceState, Frame
 
 
 class TestFrameFormats(unittest.TestCase):
     """Test whether the DUT supports all different 15.4 frame formats."""
 
+    DEVICE_STATE = DeviceState.DIAG
+
     @classmethod
     def setUpClass(cls):
-        cls.__device_manager = DeviceManager()
+        cls.__device_manager = DeviceManager.acquire()
         cls.__dut = cls.__device_manager.dut
         cls.__ref = cls.__device_manager.ref
-
-        cls.__dut.factory_reset()
-        cls.__ref.factory_reset()
+        cls.__device_manager.prepare_devices(cls.DEVICE_STATE)
 
     def setUp(self):
         pass
@@ -193,8 +193,7 @@ class TestFrameFormats(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.__dut.close()
-        cls.__ref.close()
+        cls.__device_manager.release()
 
 
 if __name__ == '__main__':
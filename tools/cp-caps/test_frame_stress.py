@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2025, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+
+import datetime
+import json
+import os
+import unittest
+
+from otci import OTCI
+from device_manager import CP_CAPABILITY_VERSION, DeviceManager, DeviceState, Frame, FrameStressConfig
+
+
+@unittest.skipUnless(os.getenv('FRAME_STRESS') == 'on', 'Set FRAME_STRESS=on to run the frame stress test')
+class TestFrameStress(unittest.TestCase):
+    """Test the frame success rate and the delivery timing of the DUT under sustained radio load."""
+
+    DEVICE_STATE = DeviceState.RESET
+    # The measurements are tracked over time, so they are taken on every run
+    CACHEABLE = False
+
+    @classmethod
+    def setUpClass(cls):
+        cls.__device_manager = DeviceManager.acquire()
+        cls.__dut = cls.__device_manager.dut
+        cls.__ref = cls.__device_manager.ref
+
+    def setUp(self):
+        self.__device_manager.prepare_devices(self.DEVICE_STATE)
+
+    def test_frame_stress(self):
+        """Stream frames of different formats, lengths, CSMA-CA/retry settings and security modes."""
+        config = FrameStressConfig.from_env()
+        frames = [
+            Frame(name='ver:2006,Data,seq,dst[addr:short,pan:id],src[addr:short,pan:id],sec:no,ie:no',
+                  tx_frame='019800ddddaaaaeeeebbbb0000',
+                  dst_address='0xaaaa'),
+            Frame(name='ver:2006,Data,seq,dst[addr:extd,pan:id],src[addr:extd,pan:id],sec:no,ie:no',
+                  tx_frame='41dc00dddd102030405060708001020304050607080000',
+                  dst_address='8070605040302010'),
+            Frame(name='ver:2015,Data,seq,dst[addr:short,pan:id],src[addr:short,pan:id],sec:no,ie[csl]',
+                  tx_frame='01aa00ddddaaaaeeeebbbb040dc800e8030000',
+                  dst_address='0xaaaa'),
+            Frame(name='ver:2006,Cmd,seq,dst[addr:extd,pan:id],src[addr:extd,pan:no],sec:l5,ie:no',
+                  tx_frame='4bdc00dddd102030405060708001020304050607080d000000000104483cb8a90000',
+                  dst_address='8070605040302010'),
+            Frame(name='ver:2015,Data,seq,dst[addr:extd,pan:id],src[addr:extd,pan:no],sec:l5(driver),ie:no',
+                  tx_frame='09ec00dddd102030405060708001020304050607080d000000000000010203040506070809000000000000',
+                  dst_address='8070605040302010',
+                  is_security_processed=False,
+                  active_dataset=self.__device_manager.get_default_dataset(),
+                  src_ext_address='0807060504030201'),
+        ]
+
+        results = []
+
+        for direction, sender, receiver in [('TX', self.__dut, self.__ref), ('RX', self.__ref, self.__dut)]:
+            for frame in frames:
+                for result in self.__device_manager.stress_formatted_frames(sender, receiver, frame, config):
+                    result['direction'] = direction
+                    results.append(result)
+                    self.__output_result(result)
+
+        report = {
+            'cp_caps_version': CP_CAPABILITY_VERSION,
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'firmware_versions': self.__device_manager.get_firmware_versions(),
+            'config': config.__dict__,
+            'results': results,
+        }
+        with open(os.getenv('FRAME_STRESS_REPORT', 'frame_stress.json'), 'wt') as f:
+            json.dump(report, f, indent=2)
+
+    def __output_result(self, result: dict):
+        name = (f'{result["direction"]} {result["frame"]},len:{result["length"]},'
+                f'csma:{int(result["csma_ca_enabled"])},retries:{result["max_frame_retries"]}')
+        success_rate = result['success_rate'] or 0
+        delivery_rate = result['delivery_rate'] or 0
+        self.__device_manager.output_test_result_string(
+            name, f'success = {success_rate:.1%}, delivery = {delivery_rate:.1%}, '
+            f'{result["frames_per_second"]} frames/s',
+            align_length=110)
+
+    def tearDown(self):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.__device_manager.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
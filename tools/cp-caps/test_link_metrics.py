@@ -31,28 +31,23 @@ import unittest
 
 from otci import OTCI
 from otci.types import Ip6Addr
-from device_manager import DeviceManager
+from device_manager import DeviceManager, DeviceState
 
 
 class TestLinkMetrics(unittest.TestCase):
     """Test whether the DUT supports Link Metrics feature."""
 
+    DEVICE_STATE = DeviceState.NETWORK
+
     @classmethod
     def setUpClass(cls):
-        cls.__device_manager = DeviceManager()
+        cls.__device_manager = DeviceManager.acquire()
         cls.__dut = cls.__device_manager.dut
         cls.__ref = cls.__device_manager.ref
 
     def setUp(self):
-        self.__dut.factory_reset()
-        self.__ref.factory_reset()
-        dataset = self.__device_manager.get_default_dataset()
-
-        self.__dut.join(dataset)
-        self.__dut.wait_for('state', 'leader')
-
-        self.__ref.join(dataset)
-        self.__ref.wait_for('state', ['child', 'router'])
+        # The test cases share the network formed by the device manager
+        self.__device_manager.prepare_devices(self.DEVICE_STATE)
 
     def test_link_metrics_initiator(self):
         """Test whether the DUT supports Link Metrics Initiator."""
@@ -94,13 +89,11 @@ class TestLinkMetrics(unittest.TestCase):
         return True
 
     def tearDown(self):
-        self.__ref.leave()
-        self.__dut.leave()
+        pass
 
     @classmethod
     def tearDownClass(cls):
-        cls.__dut.close()
-        cls.__ref.close()
+        cls.__device_manager.release()
 
 
 if __name__ == '__main__':
@@ -31,21 +31,22 @@ import unittest
 import time
 
 from otci import OTCI
-from device_manager import DeviceManager, Frame
+from device_manager import DeviceManager, DeviceState, Frame
 
 
 class TestRadioFrameTxInfo(unittest.TestCase):
     """Test whether the DUT supports otRadioFrame.mInfo.mTxInfo field."""
 
+    DEVICE_STATE = DeviceState.RESET
+
     @classmethod
     def setUpClass(cls):
-        cls.__device_manager = DeviceManager()
+        cls.__device_manager = DeviceManager.acquire()
         cls.__dut = cls.__device_manager.dut
         cls.__ref = cls.__device_manager.ref
 
     def setUp(self):
-        self.__dut.factory_reset()
-        self.__ref.factory_reset()
+        self.__device_manager.prepare_devices(self.DEVICE_STATE)
 
     def test_radio_frame_tx_info_csma_ca_enabled(self):
         """Test whether the DUT supports mInfo.mTxInfo.mCsmaCaEnabled field."""
@@ -240,8 +241,7 @@ class TestRadioFrameTxInfo(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.__dut.close()
-        cls.__ref.close()
+        cls.__device_manager.release()
 
 
 if __name__ == '__main__':
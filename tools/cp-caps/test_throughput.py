@@ -27,25 +27,32 @@
 #  POSSIBILITY OF SUCH DAMAGE.
 #
 
+import datetime
+import json
+import os
 import threading
 import unittest
 
 from otci import OTCI
-from device_manager import DeviceManager
+from device_manager import CP_CAPABILITY_VERSION, DeviceManager, DeviceState
+from throughput_benchmark import BenchmarkConfig, ThroughputBenchmark
 
 
 class TestThroughput(unittest.TestCase):
     """Test Thread network 1 hop throughput."""
 
+    DEVICE_STATE = DeviceState.RESET
+    # The measurements are tracked over time, so they are taken on every run
+    CACHEABLE = False
+
     @classmethod
     def setUpClass(cls):
-        cls.__device_manager = DeviceManager()
+        cls.__device_manager = DeviceManager.acquire()
         cls.__dut = cls.__device_manager.dut
         cls.__ref = cls.__device_manager.ref
 
     def setUp(self):
-        self.__dut.factory_reset()
-        self.__ref.factory_reset()
+        self.__device_manager.prepare_devices(self.DEVICE_STATE)
 
     def test_throughput(self):
         """Test Thread network 1 hop throughput."""
@@ -90,6 +97,40 @@ class TestThroughput(unittest.TestCase):
         self.__device_manager.output_test_result_string('Throughput',
                                                         self.__bitrate_to_string(results['receiver']['bitrate']))
 
+    @unittest.skipUnless(os.getenv('THROUGHPUT_BENCHMARK') == 'on', 'Set THROUGHPUT_BENCHMARK=on to run the benchmark')
+    def test_throughput_benchmark(self):
+        """Sweep the throughput and the latency over payload lengths, bitrates, hop counts and device modes."""
+        config = BenchmarkConfig.from_env()
+        relays = self.__device_manager.connect_relays(max(config.hops) - 1)
+        benchmark = ThroughputBenchmark(self.__dut, self.__ref, relays, self.__device_manager.get_default_dataset())
+
+        results = benchmark.run(config)
+
+        for result in results:
+            name = f'{result["hops"]} hop(s),{result["mode"]},{result["length"]} bytes'
+            latency = result['latency']
+            self.__device_manager.output_test_result_string(
+                f'Latency {name}', f'p50/p90/p99 = {latency["p50"]}/{latency["p90"]}/{latency["p99"]} ms, '
+                f'loss = {latency["loss"]:.1%}',
+                align_length=70)
+
+            for throughput in result['throughput']:
+                self.__device_manager.output_test_result_string(
+                    f'Throughput {name},{self.__bitrate_to_string(throughput["bitrate"])}',
+                    f'{self.__bitrate_to_string(throughput["receiver_bitrate"] or 0)}, '
+                    f'jitter = {throughput["jitter"]} ms, loss = {(throughput["loss"] or 0):.1%}',
+                    align_length=70)
+
+        report = {
+            'cp_caps_version': CP_CAPABILITY_VERSION,
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'firmware_versions': self.__device_manager.get_firmware_versions(),
+            'config': config.__dict__,
+            'results': results,
+        }
+        with open(os.getenv('BENCHMARK_REPORT', 'throughput_benchmark.json'), 'wt') as f:
+            json.dump(report, f, indent=2)
+
     def __ref_iperf3_server_task(self, bind_address: str, timeout: int):
         self.__ref.iperf3_server(bind_address, timeout=timeout)
 
@@ -108,8 +149,7 @@ class TestThroughput(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.__dut.close()
-        cls.__ref.close()
+        cls.__device_manager.release()
 
 
 if __name__ == '__main__':
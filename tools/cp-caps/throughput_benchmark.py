@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2024, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+
+import math
+import os
+import threading
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from otci import OTCI
+from otci.errors import InvalidArgumentsError
+
+# Modes of the reference device, which receives the traffic
+MODE_RX_ON = 'rx-on'  # An rx-on-when-idle device
+MODE_SED = 'sed'  # A sleepy end device polling its parent
+MODE_SSED = 'ssed'  # A synchronized sleepy end device using CSL
+
+MODES = [MODE_RX_ON, MODE_SED, MODE_SSED]
+
+
+def _get_int_list(name: str, default: str) -> List[int]:
+    return [int(value) for value in os.getenv(name, default).split(',')]
+
+
+@dataclass
+class BenchmarkConfig:
+    """The parameters swept by the throughput benchmark.
+
+    Each combination of `hops` and `modes` forms one topology. In each topology the latency is measured for each of
+    the `lengths`, and the throughput for each pair of `lengths` and `bitrates`.
+    """
+    lengths: List[int] = field(default_factory=lambda: [64, 512, 1232])
+    bitrates: List[int] = field(default_factory=lambda: [30000, 60000, 90000])
+    hops: List[int] = field(default_factory=lambda: [1])
+    modes: List[str] = field(default_factory=lambda: [MODE_RX_ON])
+    transmit_time: int = 10
+    ping_count: int = 20
+    ping_interval: float = 1
+    poll_period: int = 500  # The poll period of the SED in milliseconds
+    csl_period: int = 320000  # The CSL period of the SSED in microseconds
+
+    @staticmethod
+    def from_env() -> 'BenchmarkConfig':
+        config = BenchmarkConfig(lengths=_get_int_list('BENCHMARK_LENGTHS', '64,512,1232'),
+                                 bitrates=_get_int_list('BENCHMARK_BITRATES', '30000,60000,90000'),
+                                 hops=_get_int_list('BENCHMARK_HOPS', '1'),
+                                 modes=os.getenv('BENCHMARK_MODES', MODE_RX_ON).split(','),
+                                 transmit_time=int(os.getenv('BENCHMARK_TRANSMIT_TIME', '10')),
+                                 ping_count=int(os.getenv('BENCHMARK_PING_COUNT', '20')))
+
+        if not all(mode in MODES for mode in config.modes):
+            raise InvalidArgumentsError(f'BENCHMARK_MODES should only contain {", ".join(MODES)}')
+
+        if not all(hops >= 1 for hops in config.hops):
+            raise InvalidArgumentsError('BENCHMARK_HOPS should only contain numbers not less than 1')
+
+        return config
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """Returns the nearest-rank percentile of the values, or None if there is no value."""
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class ThroughputBenchmark(object):
+    """Sweeps the throughput and the latency from the DUT to the reference device.
+
+    The traffic is forwarded by `hops - 1` relays lined up between the DUT and the reference device by MAC
+    allowlists. The throughput is measured by iperf3 when both devices support it, the latency by ping.
+    """
+
+    def __init__(self, dut: OTCI, ref: OTCI, relays: List[OTCI], dataset: bytes):
+        self.__dut = dut
+        self.__ref = ref
+        self.__relays = relays
+        self.__dataset = dataset
+
+    def run(self, config: BenchmarkConfig) -> List[Dict[str, Any]]:
+        results = []
+        support_iperf3 = self.__support_iperf3(self.__dut) and self.__support_iperf3(self.__ref)
+
+        for hops in config.hops:
+            for mode in config.modes:
+                self.__form_topology(hops, mode, config)
+                ref_mleid = self.__ref.get_ipaddr_mleid()
+                # Resolve the address and set up the route before measuring
+                self.__dut.ping(ref_mleid, count=3)
+
+                for length in config.lengths:
+                    result = {
+                        'hops': hops,
+                        'mode': mode,
+                        'length': length,
+                        'latency': self.__measure_latency(ref_mleid, length, config),
+                        'throughput': [],
+                    }
+
+                    if support_iperf3:
+                        for bitrate in config.bitrates:
+                            result['throughput'].append(self.__measure_throughput(ref_mleid, length, bitrate, config))
+
+                    results.append(result)
+
+                for node in self.__chain(hops):
+                    node.leave()
+
+        return results
+
+    #
+    # Private methods
+    #
+    def __chain(self, hops: int) -> List[OTCI]:
+        if hops - 1 > len(self.__relays):
+            raise InvalidArgumentsError(f'{hops} hops need {hops - 1} relays, but only {len(self.__relays)} are given')
+
+        return [self.__dut] + self.__relays[:hops - 1] + [self.__ref]
+
+    def __form_topology(self, hops: int, mode: str, config: BenchmarkConfig):
+        chain = self.__chain(hops)
+
+        for node in chain:
+            node.factory_reset()
+
+        # Line up the nodes, each of them only hears its neighbors in the chain
+        if hops > 1:
+            extaddrs = [node.get_extaddr() for node in chain]
+            for i, node in enumerate(chain):
+                node.set_allowlist(extaddrs[max(i - 1, 0):i] + extaddrs[i + 1:i + 2])
+
+        self.__dut.join(self.__dataset)
+        self.__dut.wait_for('state', 'leader')
+
+        for relay in chain[1:-1]:
+            relay.set_router_selection_jitter(1)
+            relay.join(self.__dataset)
+            relay.wait_for('state', 'router')
+
+        if mode == MODE_SED:
+            self.__ref.set_mode('-')
+            self.__ref.set_poll_period(config.poll_period)
+        elif mode == MODE_SSED:
+            self.__ref.set_mode('-')
+            self.__ref.config_csl(channel=15, period=config.csl_period, timeout=100)
+
+        self.__ref.set_router_selection_jitter(1)
+        self.__ref.join(self.__dataset)
+        self.__ref.wait_for('state', ['child', 'router'] if mode == MODE_RX_ON else 'child')
+
+    def __measure_latency(self, ref_mleid: str, length: int, config: BenchmarkConfig) -> Dict[str, Any]:
+        statistics = self.__dut.ping(ref_mleid, size=length, count=config.ping_count, interval=config.ping_interval)
+        round_trip_times = statistics.get('round_trip_times', [])
+        transmitted = statistics.get('transmitted_packets', config.ping_count)
+
+        return {
+            'transmitted_packets': transmitted,
+            'received_packets': statistics.get('received_packets', 0),
+            'loss': round(1 - len(round_trip_times) / transmitted, 4) if transmitted else None,
+            'min': min(round_trip_times, default=None),
+            'max': max(round_trip_times, default=None),
+            'p50': percentile(round_trip_times, 50),
+            'p90': percentile(round_trip_times, 90),
+            'p99': percentile(round_trip_times, 99),
+        }
+
+    def __measure_throughput(self, ref_mleid: str, length: int, bitrate: int,
+                             config: BenchmarkConfig) -> Dict[str, Any]:
+        max_wait_time = 30
+        timeout = config.transmit_time + max_wait_time
+
+        ref_iperf3_server = threading.Thread(target=self.__ref.iperf3_server,
+                                             args=(ref_mleid,),
+                                             kwargs={'timeout': timeout},
+                                             daemon=True)
+        ref_iperf3_server.start()
+        self.__dut.wait(1)
+
+        results = self.__dut.iperf3_client(host=ref_mleid,
+                                           bitrate=bitrate,
+                                           transmit_time=config.transmit_time,
+                                           length=length)
+        ref_iperf3_server.join()
+
+        receiver = results.get('receiver', {})
+        return {
+            'bitrate': bitrate,
+            'receiver_bitrate': receiver.get('bitrate'),
+            'jitter': receiver.get('jitter'),
+            'loss': receiver.get('lossrate'),
+        }
+
+    def __support_iperf3(self, node: OTCI) -> bool:
+        try:
+            return node.support_iperf3()
+        except NotImplementedError:
+            # The platform commands are not supported, such as by the CLI of a simulated or a serial device
+            return False
@@ -53,6 +53,9 @@ IFNAME = ISniffer.ethernet_interface_name
 
 SCAN_TIME = 3
 
+# Ask for the version 2 advertisement, which packs the records of many sniffers into one datagram
+DISCOVERY_QUERY = json.dumps({'query': 'Sniffer', 'version': 2}).encode()
+
 # `socket.IPPROTO_IPV6` only exists in Python 3, so the constant is manually defined.
 IPPROTO_IPV6 = 41
 
@@ -232,19 +235,21 @@ class SimSniffer(ISniffer):
         sock.setsockopt(IPPROTO_IPV6, socket.IPV6_MULTICAST_IF, ifn)
 
         # Send the request
-        sock.sendto(('Sniffer').encode(), DISCOVERY_ADDR)
+        sock.sendto(DISCOVERY_QUERY, DISCOVERY_ADDR)
 
         # Scan for responses
         devs = set()
         start = time.time()
         while time.time() - start < SCAN_TIME:
             if select.select([sock], [], [], 1)[0]:
-                data, _ = sock.recvfrom(1024)
+                data, _ = sock.recvfrom(2048)
                 data = json.loads(data)
-                devs.add((data['add'], data['por']))
+                # A version 1 advertisement is a single record
+                for record in data.get('records', [data]):
+                    devs.add((record['add'], record['por']))
             else:
                 # Re-send the request, due to unreliability of UDP especially on WLAN
-                sock.sendto(('Sniffer').encode(), DISCOVERY_ADDR)
+                sock.sendto(DISCOVERY_QUERY, DISCOVERY_ADDR)
 
         devs = [SimSniffer(addressofDevice=self._encode_address_port(addr, port), channel=None) for addr, port in devs]
         self.log('List of SimSniffers: %r', devs)
@@ -40,7 +40,7 @@ import win32api
 
 from simulation.config import load_config
 from THCI.IThci import IThci
-from THCI.OpenThread import OpenThreadTHCI, watched
+from THCI.OpenThread import LineReader, OpenThreadTHCI, watched
 
 config = load_config()
 ot_subpath = {item['tag']: item['subpath'] for item in config['ot_build']['ot']}
@@ -85,9 +85,6 @@ class SSHHandle(object):
 
         self.__stdin, self.__stdout, _ = self.__handle.exec_command(device + ' ' + str(self.node_id))
 
-        # Receive the output in non-blocking mode
-        self.__stdout.channel.setblocking(0)
-
         # Some commands such as `udp send <ip> -x <hex>` send binary data
         # The UDP packet receiver will output the data in binary to stdout
         self.__stdout._set_mode('rb')
@@ -111,14 +108,18 @@ class SSHHandle(object):
         self.__stdin.write(cmd)
         self.__stdin.flush()
 
-    def recv(self):
-        outputs = []
-        while True:
-            try:
-                outputs.append(self.__stdout.read(1))
-            except socket.timeout:
-                break
-        return ''.join(outputs)
+    def recv(self, size, timeout=0):
+        # Read from the channel directly, it returns as soon as any output is available
+        channel = self.__stdout.channel
+        channel.settimeout(timeout)
+        try:
+            data = channel.recv(size)
+        except socket.timeout:
+            return ''
+
+        if not data:
+            raise Exception('ot-cli-ftd of node %d exited' % self.node_id)
+        return data
 
     def log(self, fmt, *args):
         try:
@@ -133,14 +134,13 @@ class OpenThread_Sim(OpenThreadTHCI, IThci):
 
     @watched
     def _connect(self):
-        self.__lines = []
-
         # Only actually connect once.
         if self.__handle is None:
             self.log('SSH connecting ...')
             self.__handle = SSHHandle(self.ssh_ip, self.telnetPort, self.telnetUsername, self.telnetPassword,
                                       self.device, self.node_id)
 
+        self.__reader = LineReader(self.__handle.recv)
         self.log('connected to %s successfully', self.telnetIp)
 
     @watched
@@ -171,21 +171,8 @@ class OpenThread_Sim(OpenThreadTHCI, IThci):
         self.telnetUsername = ssh['username']
         self.telnetPassword = ssh['password']
 
-    def _cliReadLine(self):
-        if len(self.__lines) > 1:
-            return self.__lines.pop(0)
-
-        tail = ''
-        if len(self.__lines) != 0:
-            tail = self.__lines.pop()
-
-        tail += self.__handle.recv()
-
-        self.__lines += self._lineSepX.split(tail)
-        if len(self.__lines) > 1:
-            return self.__lines.pop(0)
-
-        return None
+    def _cliReadLine(self, timeout=0):
+        return self.__reader.readLine(self._lineSepX, timeout)
 
     def _cliWriteLine(self, line):
         self.__handle.send(line + '\n')
@@ -39,7 +39,10 @@ import socket
 import struct
 import subprocess
 import sys
-from typing import Iterable
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import yaml
 
 from otbr_sim import otbr_docker
@@ -47,6 +50,14 @@ from otbr_sim import otbr_docker
 GROUP = 'ff02::114'
 PORT = 12345
 
+# Version of the packed advertisement, the Test Harness only understands the one record per datagram of version 1
+ADVERTISEMENT_VERSION = 2
+# The IPv6 minimum MTU minus the IPv6 and UDP headers, so that the advertisements are never fragmented
+MAX_DATAGRAM_SIZE = 1280 - 40 - 8
+
+# Seconds to wait for the sniffer gRPC servers to accept connections
+SNIFFER_READY_TIMEOUT = 30
+
 
 def if_nametoindex(ifname: str) -> int:
     libc = ctypes.CDLL(ctypes.util.find_library('c'))
@@ -84,50 +95,254 @@ def init_socket(ifname: str, group: str, port: int) -> socket.socket:
     return s
 
 
-def _advertise(s: socket.socket, dst, info):
-    logging.info('Advertise: %r', info)
-    s.sendto(json.dumps(info).encode('utf-8'), dst)
+def device_record(ven: str, add: str, nodeid: int, tag: str) -> dict:
+    return {
+        'ven': ven,
+        'mod': 'OpenThread',
+        'ver': '4',
+        'add': f'{tag}_{nodeid}@{add}',
+        'por': 22,
+    }
+
+
+def sniffer_record(add: str, port: int) -> dict:
+    return {
+        'add': add,
+        'por': port,
+    }
 
 
-def advertise_devices(s: socket.socket, dst, ven: str, add: str, nodeids: Iterable[int], tag: str):
-    for nodeid in nodeids:
-        info = {
-            'ven': ven,
-            'mod': 'OpenThread',
-            'ver': '4',
-            'add': f'{tag}_{nodeid}@{add}',
-            'por': 22,
-        }
-        _advertise(s, dst, info)
+def pack_records(records: Iterable[dict], max_size: int = MAX_DATAGRAM_SIZE) -> List[bytes]:
+    """Packs the records into as few versioned datagrams as possible, each of them is at most `max_size` bytes."""
+    head = b'{"version": %d, "records": [' % ADVERTISEMENT_VERSION
+    tail = b']}'
+
+    datagrams = []
+    packed = []
+    size = len(head) + len(tail)
+    for record in records:
+        encoded = json.dumps(record).encode('utf-8')
+        if packed and size + len(b', ') + len(encoded) > max_size:
+            datagrams.append(head + b', '.join(packed) + tail)
+            packed = []
+            size = len(head) + len(tail)
+        if packed:
+            size += len(b', ')
+        packed.append(encoded)
+        size += len(encoded)
 
+    if packed:
+        datagrams.append(head + b', '.join(packed) + tail)
+
+    return datagrams
+
+
+def parse_query(data: bytes) -> Tuple[str, int]:
+    """Returns the kind and the version of a discovery query.
 
-def advertise_sniffers(s: socket.socket, dst, add: str, ports: Iterable[int]):
-    for port in ports:
-        info = {
-            'add': add,
-            'por': port,
-        }
-        _advertise(s, dst, info)
+    The Test Harness sends the bare kind, `BBR` or `Sniffer`, and expects one record per datagram. Newer clients send
+    a JSON object such as `{"query": "Sniffer", "version": 2}` and accept the packed records.
+    """
+    if data in (b'BBR', b'Sniffer'):
+        return data.decode('ascii'), 1
+
+    try:
+        query = json.loads(data)
+        kind, version = query['query'], int(query['version'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f'Invalid query {data!r}')
+
+    if kind not in ('BBR', 'Sniffer') or version < 1:
+        raise ValueError(f'Invalid query {data!r}')
+
+    return kind, min(version, ADVERTISEMENT_VERSION)
+
+
+class Advertiser:
+    """Advertises the ready devices and sniffers to the discovery queriers.
+
+    Besides answering the queries, the records are sent again to the queriers seen in the last `QUERIER_LIFETIME`
+    seconds: a newly ready device right away, and all of them every `READVERTISE_INTERVAL` seconds to the queriers which
+    accept the packed records. Devices are added by the launching threads while the main thread answers the queries.
+    """
+
+    QUERIER_LIFETIME = 30
+    READVERTISE_INTERVAL = 10
+    # Gap between the datagrams of an advertisement, so that a large testbed does not flood the link
+    DATAGRAM_GAP = 0.002
+
+    def __init__(self, sock: socket.socket, add: str):
+        self._sock = sock
+        self._add = add
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._records: Dict[str, Dict[int, dict]] = {'BBR': {}, 'Sniffer': {}}
+        # (kind, address) of each querier to its version and expiry time
+        self._queriers: Dict[Tuple[str, tuple], Tuple[int, float]] = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_device(self, nodeid: int, ven: str, tag: str):
+        self._add_records('BBR', {nodeid: device_record(ven, self._add, nodeid, tag)})
+
+    def add_sniffers(self, ports: Iterable[int]):
+        self._add_records('Sniffer', {port: sniffer_record(self._add, port) for port in ports})
+
+    def is_ready(self, kind: str) -> bool:
+        with self._lock:
+            return bool(self._records[kind])
+
+    def handle_query(self, data: bytes, src):
+        kind, version = parse_query(data)
+
+        with self._lock:
+            self._queriers[(kind, src)] = (version, time.time() + self.QUERIER_LIFETIME)
+            records = self._sorted_records(kind)
+
+        logging.info('Received %s query version %d from %s, advertising %d records', kind, version, src[0],
+                     len(records))
+        self._send(src, version, records)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._readvertise_main_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _add_records(self, kind: str, records: Dict[int, dict]):
+        with self._lock:
+            self._records[kind].update(records)
+            queriers = self._live_queriers(kind)
+
+        for dst, version in queriers:
+            self._send(dst, version, [records[key] for key in sorted(records)])
+
+    def _sorted_records(self, kind: str) -> List[dict]:
+        return [self._records[kind][key] for key in sorted(self._records[kind])]
+
+    def _live_queriers(self, kind: str) -> List[Tuple[tuple, int]]:
+        now = time.time()
+        for key in [key for key, (_, expiry) in self._queriers.items() if expiry < now]:
+            del self._queriers[key]
+
+        return [(src, version) for (querier_kind, src), (version, _) in self._queriers.items() if kind == querier_kind]
+
+    def _readvertise_main_loop(self):
+        while not self._stop_event.wait(self.READVERTISE_INTERVAL):
+            for kind in self._records:
+                with self._lock:
+                    queriers = [(dst, version) for dst, version in self._live_queriers(kind) if version > 1]
+                    records = self._sorted_records(kind)
+
+                for dst, version in queriers:
+                    self._send(dst, version, records)
+
+    def _send(self, dst, version: int, records: List[dict]):
+        if not records:
+            return
+
+        if version == 1:
+            datagrams = [json.dumps(record).encode('utf-8') for record in records]
+        else:
+            datagrams = pack_records(records)
+
+        with self._send_lock:
+            for i, datagram in enumerate(datagrams):
+                if i:
+                    time.sleep(self.DATAGRAM_GAP)
+                self._sock.sendto(datagram, dst)
 
+        logging.debug('Advertised %d records in %d datagrams to %s', len(records), len(datagrams), dst[0])
 
-def start_sniffer(addr: str, port: int, ot_path: str, max_nodes_num: int) -> subprocess.Popen:
-    if isinstance(ipaddress.ip_address(addr), ipaddress.IPv6Address):
-        server = f'[{addr}]:{port}'
-    else:
-        server = f'{addr}:{port}'
 
+def start_sniffers(addr: str, ports: Iterable[int], ot_path: str, max_nodes_num: int) -> subprocess.Popen:
+    """Starts one process serving a sniffer on each of the ports, all of them share the process's radio socket."""
     cmd = [
         'python3',
         os.path.join(ot_path, 'tools/harness-simulation/posix/sniffer_sim/sniffer.py'),
-        '--grpc-server',
-        server,
-        '--max-nodes-num',
-        str(max_nodes_num),
     ]
+    for port in ports:
+        if isinstance(ipaddress.ip_address(addr), ipaddress.IPv6Address):
+            server = f'[{addr}]:{port}'
+        else:
+            server = f'{addr}:{port}'
+        cmd += ['--grpc-server', server]
+    cmd += ['--max-nodes-num', str(max_nodes_num)]
     logging.info('Executing command:  %s', ' '.join(cmd))
     return subprocess.Popen(cmd)
 
 
+def wait_sniffers_ready(proc: subprocess.Popen, addr: str, ports: Iterable[int]):
+    """Waits until the gRPC server on each of the ports accepts connections."""
+    deadline = time.time() + SNIFFER_READY_TIMEOUT
+
+    for port in ports:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f'The sniffer process exited unexpectedly with {proc.returncode}')
+
+            try:
+                socket.create_connection((addr, port), timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise RuntimeError(f'The sniffer on port {port} is not ready in {SNIFFER_READY_TIMEOUT} seconds')
+                time.sleep(0.1)
+
+
+def launch_otbr_dockers(
+    otbr_items: List[Tuple[int, dict]],
+    ot_path: str,
+    executor: Executor,
+    on_launch: Callable[[otbr_docker.OtbrDocker], None],
+    on_ready: Callable[[otbr_docker.OtbrDocker, str], None],
+):
+    """Launches the OTBR dockers on `executor`, which limits how many of them are launched at the same time.
+
+    `on_launch` is called with each OTBR before it starts launching, so it can be closed even if its launch does not
+    finish. `on_ready` is called with each OTBR and its tag as soon as the OTBR is ready.
+    """
+
+    def launch(nodeid: int, item: dict) -> otbr_docker.OtbrDocker:
+        otbr = otbr_docker.OtbrDocker(nodeid=nodeid,
+                                      ot_path=ot_path,
+                                      ot_rcp_path=os.path.join(ot_path, item['rcp_subpath'],
+                                                               'examples/apps/ncp/ot-rcp'),
+                                      docker_image=item['docker_image'],
+                                      docker_name=f'{item["tag"]}_{nodeid}')
+        on_launch(otbr)
+        otbr.launch()
+        return otbr
+
+    futures = {executor.submit(launch, nodeid, item): (nodeid, item['tag']) for nodeid, item in otbr_items}
+
+    for future in as_completed(futures):
+        nodeid, tag = futures[future]
+        if future.cancelled():
+            continue
+        try:
+            otbr = future.result()
+        except Exception:
+            logging.exception('Failed to launch OTBR %s_%d, it is not advertised', tag, nodeid)
+            continue
+
+        on_ready(otbr, tag)
+
+
+def log_startup_report(timings: Dict[str, float], elapsed: float, failed: Optional[List[str]] = None):
+    logging.info('-' * 60)
+    logging.info('Testbed startup report')
+    for name, duration in sorted(timings.items(), key=lambda x: x[1], reverse=True):
+        logging.info('%-40s %8.1fs', name, duration)
+    for name in failed or []:
+        logging.info('%-40s   FAILED', name)
+    logging.info('Ready in %.1fs, %.1fs in total if launched one after another', elapsed, sum(timings.values()))
+    logging.info('-' * 60)
+
+
 def main():
     logging.basicConfig(level=logging.INFO)
 
@@ -139,15 +354,23 @@ def main():
                         type=str,
                         required=True,
                         help='the path of the configuration JSON file')
+    parser.add_argument('-j',
+                        '--jobs',
+                        dest='jobs',
+                        type=int,
+                        default=4,
+                        help='the maximum number of OTBR dockers launched at the same time (default: %(default)s)')
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
     with open(args.config, 'rt') as f:
         config = yaml.safe_load(f)
 
     ot_path = config['ot_path']
     ot_build = config['ot_build']
     max_nodes_num = ot_build['max_number']
-    # No test case requires more than 2 sniffers
-    MAX_SNIFFER_NUM = 2
+    # At most one sniffer per channel (11 to 26) can be useful
+    MAX_SNIFFER_NUM = 16
 
     ot_devices = [(item['tag'], item['number']) for item in ot_build['ot']]
     otbr_devices = [(item['tag'], item['number']) for item in ot_build['otbr']]
@@ -173,44 +396,95 @@ def main():
     ifname = config['discovery_ifname']
     addr = get_ipaddr(ifname)
 
-    # Start the sniffer
+    start_time = time.time()
+    timings = {}
+
+    s = init_socket(ifname, GROUP, PORT)
+    advertiser = Advertiser(s, addr)
+
+    # The simulated OT devices are started over SSH by the harness, so they are ready right away
+    nodeid = 0
+    for tag, number in ot_devices:
+        for _ in range(number):
+            nodeid += 1
+            advertiser.add_device(nodeid, 'OpenThread_Sim', tag)
+
+    # Start the sniffers
     sniffer_server_port_base = config['sniffer']['server_port_base']
-    sniffer_procs = []
-    for i in range(sniffer_num):
-        sniffer_procs.append(start_sniffer(addr, i + sniffer_server_port_base, ot_path, max_nodes_num))
+    sniffer_ports = range(sniffer_server_port_base, sniffer_server_port_base + sniffer_num)
+    sniffer_proc = start_sniffers(addr, sniffer_ports, ot_path, max_nodes_num)
+
+    def launch_sniffers():
+        wait_sniffers_ready(sniffer_proc, addr, sniffer_ports)
+        timings['sniffers'] = time.time() - start_time
+        advertiser.add_sniffers(sniffer_ports)
 
     # OTBR firewall scripts create rules inside the Docker container
     # Run modprobe to load the kernel modules for iptables
     subprocess.run(['sudo', 'modprobe', 'ip6table_filter'])
-    # Start the BRs
+
+    # Start the BRs. Each OTBR is tracked as soon as its launch starts, so the exit handler also shuts down the
+    # containers and processes of the launches that are still in progress.
     otbr_dockers = []
-    nodeid = ot_nodes_num
+    otbr_dockers_lock = threading.Lock()
+    is_exiting = False
+    otbr_executor = ThreadPoolExecutor(max_workers=args.jobs)
+    otbr_items = []
     for item in ot_build['otbr']:
-        tag = item['tag']
-        ot_rcp_path = os.path.join(ot_path, item['rcp_subpath'], 'examples/apps/ncp/ot-rcp')
-        docker_image = item['docker_image']
         for _ in range(item['number']):
             nodeid += 1
-            otbr_dockers.append(
-                otbr_docker.OtbrDocker(nodeid=nodeid,
-                                       ot_path=ot_path,
-                                       ot_rcp_path=ot_rcp_path,
-                                       docker_image=docker_image,
-                                       docker_name=f'{tag}_{nodeid}'))
-
-    s = init_socket(ifname, GROUP, PORT)
+            otbr_items.append((nodeid, item))
+
+    def on_otbr_launch(otbr: otbr_docker.OtbrDocker):
+        with otbr_dockers_lock:
+            otbr_dockers.append(otbr)
+            if not is_exiting:
+                return
+        # The exit handler has already closed the others, so this one must not be launched
+        otbr.close()
+
+    def on_otbr_ready(otbr: otbr_docker.OtbrDocker, tag: str):
+        timings[otbr.docker_name] = sum(otbr.launch_durations.values())
+        advertiser.add_device(otbr.nodeid, 'OpenThread_BR_Sim', tag)
+
+    def launch_testbed():
+        launch_threads = [
+            threading.Thread(target=launch_sniffers, daemon=True),
+            threading.Thread(target=launch_otbr_dockers,
+                             args=(otbr_items, ot_path, otbr_executor, on_otbr_launch, on_otbr_ready),
+                             daemon=True),
+        ]
+        for thread in launch_threads:
+            thread.start()
+        for thread in launch_threads:
+            thread.join()
+
+        failed = [f'{item["tag"]}_{nodeid}' for nodeid, item in otbr_items if f'{item["tag"]}_{nodeid}' not in timings]
+        if not advertiser.is_ready('Sniffer'):
+            failed.append('sniffers')
+        log_startup_report(timings, time.time() - start_time, failed)
+
+    threading.Thread(target=launch_testbed, daemon=True).start()
+    advertiser.start()
 
     logging.info('Advertising on interface %s group %s ...', ifname, GROUP)
 
-    # Terminate all sniffer simulation server processes and then exit
+    # Terminate the sniffer simulation server process and then exit
     def exit_handler(signum, context):
-        # Return code is non-zero if any return code of the processes is non-zero
-        ret = 0
-        for sniffer_proc in sniffer_procs:
-            sniffer_proc.terminate()
-            ret = max(ret, sniffer_proc.wait())
+        nonlocal is_exiting
+
+        advertiser.stop()
 
-        for otbr in otbr_dockers:
+        sniffer_proc.terminate()
+        ret = sniffer_proc.wait()
+
+        # The OTBRs not launched yet are dropped. Closing the others stops their containers and aborts the launches
+        # still in progress, so the executor's worker threads, which are joined on exit, finish quickly.
+        otbr_executor.shutdown(wait=False, cancel_futures=True)
+        with otbr_dockers_lock:
+            is_exiting = True
+            launched_otbrs = list(otbr_dockers)
+        for otbr in launched_otbrs:
             otbr.close()
 
         sys.exit(ret)
@@ -218,27 +492,13 @@ def main():
     signal.signal(signal.SIGINT, exit_handler)
     signal.signal(signal.SIGTERM, exit_handler)
 
-    # Loop, printing any data we receive
+    # Loop, answering the discovery queries
     while True:
-        data, src = s.recvfrom(64)
-
-        if data == b'BBR':
-            logging.info('Received OpenThread simulation query, advertising')
+        data, src = s.recvfrom(1024)
 
-            nodeid = 1
-            for ven, devices in [('OpenThread_Sim', ot_devices), ('OpenThread_BR_Sim', otbr_devices)]:
-                for tag, number in devices:
-                    advertise_devices(s, src, ven=ven, add=addr, nodeids=range(nodeid, nodeid + number), tag=tag)
-                    nodeid += number
-
-        elif data == b'Sniffer':
-            logging.info('Received sniffer simulation query, advertising')
-            advertise_sniffers(s,
-                               src,
-                               add=addr,
-                               ports=range(sniffer_server_port_base, sniffer_server_port_base + sniffer_num))
-
-        else:
+        try:
+            advertiser.handle_query(data, src)
+        except ValueError:
             logging.warning('Received %r, but ignored', data)
 
 
@@ -31,12 +31,18 @@ import logging
 import os
 import re
 import subprocess
+import threading
 import time
 
 
 class OtbrDocker:
     device_pattern = re.compile('(?<=PTY is )/dev/.+$')
 
+    # The readiness of the container is polled with an exponential backoff between these intervals
+    READY_POLL_MIN_INTERVAL = 0.2
+    READY_POLL_MAX_INTERVAL = 2
+    READY_TIMEOUT = 60
+
     def __init__(self, nodeid: int, ot_path: str, ot_rcp_path: str, docker_image: str, docker_name: str):
         self.nodeid = nodeid
         self.ot_path = ot_path
@@ -53,30 +59,51 @@ class OtbrDocker:
         self._rcp_device_pty = None
         self._rcp_device = None
 
-        self._launch()
+        # Seconds taken by each step of the launch
+        self.launch_durations = {}
+
+        # Once closed, no more processes are started, so `close()` can abort a launch running in another thread
+        self._closed = False
+        self._lock = threading.Lock()
 
     def __repr__(self) -> str:
         return f'OTBR<{self.nodeid}>'
 
-    def _launch(self):
+    def launch(self):
         self.logger.info('Launching %r ...', self)
-        self._launch_socat()
-        self._launch_ot_rcp()
-        self._launch_docker()
-        self.logger.info('Launched %r successfully', self)
+        try:
+            for name, launch in [('socat', self._launch_socat), ('ot-rcp', self._launch_ot_rcp),
+                                 ('docker', self._launch_docker)]:
+                start_time = time.time()
+                launch()
+                self.launch_durations[name] = time.time() - start_time
+        except Exception:
+            self.logger.exception('Failed to launch %r', self)
+            self.close()
+            raise
+        self.logger.info('Launched %r successfully in %.1fs', self, sum(self.launch_durations.values()))
 
     def close(self):
         self.logger.info('Shutting down %r ...', self)
-        self._shutdown_docker()
-        self._shutdown_ot_rcp()
-        self._shutdown_socat()
+        with self._lock:
+            self._closed = True
+            self._shutdown_docker()
+            self._shutdown_ot_rcp()
+            self._shutdown_socat()
         self.logger.info('Shut down %r successfully', self)
 
+    def _popen(self, args, **kwargs) -> subprocess.Popen:
+        # Must be called with `self._lock` held, so the process is not started after `close()`
+        if self._closed:
+            raise RuntimeError(f'{self!r} is closed')
+        return subprocess.Popen(args, **kwargs)
+
     def _launch_socat(self):
-        self._socat_proc = subprocess.Popen(['socat', '-d', '-d', 'pty,raw,echo=0', 'pty,raw,echo=0'],
-                                            stderr=subprocess.PIPE,
-                                            stdin=subprocess.DEVNULL,
-                                            stdout=subprocess.DEVNULL)
+        with self._lock:
+            self._socat_proc = self._popen(['socat', '-d', '-d', 'pty,raw,echo=0', 'pty,raw,echo=0'],
+                                           stderr=subprocess.PIPE,
+                                           stdin=subprocess.DEVNULL,
+                                           stdout=subprocess.DEVNULL)
 
         line = self._socat_proc.stderr.readline().decode('ascii').strip()
         self._rcp_device_pty = self.device_pattern.findall(line)[0]
@@ -88,27 +115,30 @@ class OtbrDocker:
         if self._socat_proc is None:
             return
 
-        self._socat_proc.stderr.close()
+        # Terminated first, so a launch still reading the PTY names in another thread is not blocked
         self._socat_proc.terminate()
         self._socat_proc.wait()
+        self._socat_proc.stderr.close()
         self._socat_proc = None
 
         self._rcp_device_pty = None
         self._rcp_device = None
 
     def _launch_ot_rcp(self):
-        self._ot_rcp_proc = subprocess.Popen(
-            f'{self.ot_rcp_path} {self.nodeid} > {self._rcp_device_pty} < {self._rcp_device_pty}',
-            shell=True,
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL)
-        try:
-            self._ot_rcp_proc.wait(1)
-        except subprocess.TimeoutExpired:
-            # We expect ot-rcp not to quit in 1 second.
-            pass
-        else:
+        with self._lock:
+            self._ot_rcp_proc = self._popen(
+                f'exec {self.ot_rcp_path} {self.nodeid} > {self._rcp_device_pty} < {self._rcp_device_pty}',
+                shell=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL)
+        # ot-rcp is expected to keep running, it is checked while waiting for the docker to be ready
+        self._check_ot_rcp()
+
+    def _check_ot_rcp(self):
+        if self._closed:
+            raise RuntimeError(f'{self!r} is closed')
+        if self._ot_rcp_proc.poll() is not None:
             raise Exception(f"ot-rcp {self.nodeid} exited unexpectedly!")
 
     def _shutdown_ot_rcp(self):
@@ -140,31 +170,35 @@ class OtbrDocker:
             self.docker_image,
         ]
         self.logger.info('Launching docker:  %s', ' '.join(cmd))
-        launch_proc = subprocess.Popen(cmd,
-                                       stdin=subprocess.DEVNULL,
-                                       stdout=subprocess.DEVNULL,
-                                       stderr=subprocess.DEVNULL)
-
-        launch_docker_deadline = time.time() + 60
-        launch_ok = False
-        time.sleep(5)
-
-        while time.time() < launch_docker_deadline:
-            try:
-                subprocess.check_call(['docker', 'exec', self.docker_name, 'ot-ctl', 'state'],
+        with self._lock:
+            launch_proc = self._popen(cmd,
                                       stdin=subprocess.DEVNULL,
                                       stdout=subprocess.DEVNULL,
                                       stderr=subprocess.DEVNULL)
-                launch_ok = True
-                logging.info("OTBR Docker %s is ready!", self.docker_name)
-                break
-            except subprocess.CalledProcessError:
-                time.sleep(5)
-                continue
-
-        if not launch_ok:
-            raise RuntimeError('Cannot start OTBR Docker %s!' % self.docker_name)
-        launch_proc.wait()
+
+        try:
+            self._wait_docker_ready()
+        finally:
+            launch_proc.wait()
+
+    def _is_docker_ready(self) -> bool:
+        return subprocess.call(['docker', 'exec', self.docker_name, 'ot-ctl', 'state'],
+                               stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL) == 0
+
+    def _wait_docker_ready(self):
+        deadline = time.time() + self.READY_TIMEOUT
+        interval = self.READY_POLL_MIN_INTERVAL
+
+        while not self._is_docker_ready():
+            self._check_ot_rcp()
+            if time.time() + interval > deadline:
+                raise RuntimeError('Cannot start OTBR Docker %s!' % self.docker_name)
+            time.sleep(interval)
+            interval = min(interval * 2, self.READY_POLL_MAX_INTERVAL)
+
+        self.logger.info("OTBR Docker %s is ready!", self.docker_name)
 
     def _shutdown_docker(self):
         subprocess.run(['docker', 'stop', self.docker_name])
@@ -26,65 +26,173 @@
 #  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 #  POSSIBILITY OF SUCH DAMAGE.
 #
-""" Module to provide codec utilities for .pcap formatters. """
+""" Module to provide codec utilities for .pcapng formatters. """
 
+import heapq
 import struct
 import time
 
 # https://www.tcpdump.org/linktypes.html
 DLT_IEEE802_15_4_WITHFCS = 195
 
-PCAP_MAGIC_NUMBER = 0xA1B2C3D4
-PCAP_VERSION_MAJOR = 2
-PCAP_VERSION_MINOR = 4
+# https://datatracker.ietf.org/doc/draft-ietf-opsawg-pcapng/
+BLOCK_TYPE_SECTION_HEADER = 0x0A0D0D0A
+BLOCK_TYPE_INTERFACE_DESCRIPTION = 0x00000001
+BLOCK_TYPE_ENHANCED_PACKET = 0x00000006
 
+BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_VERSION_MAJOR = 1
+PCAPNG_VERSION_MINOR = 0
 
-class PcapCodec(object):
-    """ Utility class for .pcap formatters. """
+OPTION_END_OF_OPTIONS = 0
+OPTION_IF_NAME = 2
+OPTION_IF_DESCRIPTION = 3
+OPTION_IF_TSRESOL = 9
+OPTION_IF_OS = 12
 
-    def __init__(self, channel, filename):
-        self._dlt = DLT_IEEE802_15_4_WITHFCS
-        self._channel = channel
+# Options of captured interface descriptions which are copied to the output, all of them hold strings or bytes
+_COPIED_IF_OPTIONS = (OPTION_IF_NAME, OPTION_IF_DESCRIPTION, OPTION_IF_TSRESOL, OPTION_IF_OS)
 
-        self._pcap_writer = open(filename, 'wb')
-        self._write(self._encode_header())
+# Timestamps are in microseconds when an interface has no `if_tsresol` option
+_DEFAULT_TS_UNITS_PER_SECOND = 1000000
 
-    def _write(self, content):
-        self._pcap_writer.write(content)
-        self._pcap_writer.flush()
 
-    def _encode_header(self):
-        """ Return a pcap file header. """
+def _pad(data):
+    return data + b'\0' * (-len(data) % 4)
 
-        return struct.pack(
-            '<LHHLLLL',
-            PCAP_MAGIC_NUMBER,
-            PCAP_VERSION_MAJOR,
-            PCAP_VERSION_MINOR,
-            0,
-            0,
-            256,
-            self._dlt,
-        )
 
-    def _encode_frame(self, frame, sec, usec):
-        """ Return a pcap encapsulation of the given frame. """
+def _encode_block(block_type, body):
+    body = _pad(body)
+    total_length = len(body) + 12
+    return struct.pack('<LL', block_type, total_length) + body + struct.pack('<L', total_length)
 
-        # Ignore the first byte storing channel.
-        frame = frame[1:]
 
-        length = len(frame)
-        pcap_frame = struct.pack('<LLLL', sec, usec, length, length)
-        pcap_frame += frame
-        return pcap_frame
+def _encode_options(options):
+    content = b''.join(struct.pack('<HH', code, len(value)) + _pad(value) for code, value in options)
+    if content:
+        content += struct.pack('<HH', OPTION_END_OF_OPTIONS, 0)
+    return content
+
+
+def encode_section_header():
+    """ Return a pcapng section header block. """
+
+    # A section length of -1 means unspecified
+    return _encode_block(BLOCK_TYPE_SECTION_HEADER,
+                         struct.pack('<LHHq', BYTE_ORDER_MAGIC, PCAPNG_VERSION_MAJOR, PCAPNG_VERSION_MINOR, -1))
+
+
+def encode_interface_description(linktype, options=(), snaplen=0):
+    """ Return a pcapng interface description block. """
+
+    return _encode_block(BLOCK_TYPE_INTERFACE_DESCRIPTION,
+                         struct.pack('<HHL', linktype, 0, snaplen) + _encode_options(options))
+
+
+def encode_enhanced_packet(interface_id, timestamp, frame, original_length=None):
+    """ Return a pcapng enhanced packet block, `timestamp` is in units of the interface's timestamp resolution. """
+
+    if original_length is None:
+        original_length = len(frame)
+
+    return _encode_block(
+        BLOCK_TYPE_ENHANCED_PACKET,
+        struct.pack('<LLLLL', interface_id, timestamp >> 32, timestamp & 0xffffffff, len(frame), original_length) +
+        bytes(frame))
+
+
+def _parse_options(data, endian):
+    options = []
+    offset = 0
+    while offset + 4 <= len(data):
+        code, length = struct.unpack_from(endian + 'HH', data, offset)
+        if code == OPTION_END_OF_OPTIONS:
+            break
+        options.append((code, bytes(data[offset + 4:offset + 4 + length])))
+        offset += 4 + length + (-length % 4)
+    return options
+
+
+def _ts_units_per_second(options):
+    for code, value in options:
+        if code == OPTION_IF_TSRESOL and value:
+            resolution = value[0]
+            return 2**(resolution & 0x7f) if resolution & 0x80 else 10**resolution
+    return _DEFAULT_TS_UNITS_PER_SECOND
+
+
+class PcapngReader(object):
+    """ Incremental parser of a pcapng stream, such as the output of `tshark -w -`. """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._endian = '<'
+
+    def feed(self, data):
+        """ Add data of the stream, and return the list of the `(block_type, body)` of the blocks it completes. """
+
+        self._buffer += data
+        blocks = []
+        offset = 0
+        while len(self._buffer) - offset >= 12:
+            block_type, = struct.unpack_from('<L', self._buffer, offset)
+            if block_type == BLOCK_TYPE_SECTION_HEADER:
+                # The byte-order magic of the section header tells the byte order of the whole section
+                magic, = struct.unpack_from('<L', self._buffer, offset + 8)
+                self._endian = '<' if magic == BYTE_ORDER_MAGIC else '>'
+            block_type, total_length = struct.unpack_from(self._endian + 'LL', self._buffer, offset)
+            if len(self._buffer) - offset < total_length:
+                break
+            blocks.append((block_type, bytes(self._buffer[offset + 8:offset + total_length - 4])))
+            offset += total_length
+        del self._buffer[:offset]
+        return blocks
+
+    @property
+    def endian(self):
+        return self._endian
+
+
+class PcapngCodec(object):
+    """ Utility class building a .pcapng stream of the Thread frames on one channel.
+
+    Packets of other captures (e.g. the Ethernet capture of tshark) can be merged into the stream, each of their
+    interfaces gets its own interface description. Since those packets arrive later than they were captured, the
+    packets are held back for `merge_delay` seconds and written in timestamp order.
+    """
+
+    def __init__(self, channel, merge_delay=0):
+        self._channel = channel
+        self._merge_delay = merge_delay
+
+        # (timestamp in microseconds, sequence number, block) of the packets held back
+        self._pending = []
+        self._sequence = 0
+
+        self._reader = PcapngReader()
+        # Maps the interface ids of the merged capture to (interface id in the output, timestamp units per second)
+        self._merged_interfaces = {}
+        self._num_interfaces = 0
+
+        self._output = bytearray(encode_section_header())
+        self._add_interface(DLT_IEEE802_15_4_WITHFCS, [(OPTION_IF_NAME, b'thread-ch%d' % channel)])
+
+    def _add_interface(self, linktype, options, snaplen=0):
+        self._output += encode_interface_description(linktype, options, snaplen)
+        self._num_interfaces += 1
+        return self._num_interfaces - 1
 
     def _get_timestamp(self):
-        """ Return the internal timestamp. """
+        """ Return the internal timestamp, in microseconds. """
+
+        return time.time_ns() // 1000
 
-        timestamp = time.time()
-        timestamp_sec = int(timestamp)
-        timestamp_usec = int((timestamp - timestamp_sec) * 1000000)
-        return timestamp_sec, timestamp_usec
+    def _enqueue(self, timestamp_us, block):
+        if self._merge_delay > 0:
+            heapq.heappush(self._pending, (timestamp_us, self._sequence, block))
+            self._sequence += 1
+        else:
+            self._output += block
 
     def append(self, frame):
         """ Append a frame. """
@@ -94,7 +202,50 @@ class PcapCodec(object):
             return
 
         timestamp = self._get_timestamp()
-        self._write(self._encode_frame(frame, *timestamp))
-
-    def close(self):
-        self._pcap_writer.close()
+        # Ignore the first byte storing channel.
+        self._enqueue(timestamp, encode_enhanced_packet(0, timestamp, frame[1:]))
+
+    def append_pcapng(self, data):
+        """ Merge a piece of a pcapng stream into the output. """
+
+        for block_type, body in self._reader.feed(data):
+            endian = self._reader.endian
+            if block_type == BLOCK_TYPE_SECTION_HEADER:
+                self._merged_interfaces = {}
+            elif block_type == BLOCK_TYPE_INTERFACE_DESCRIPTION:
+                linktype, _, snaplen = struct.unpack_from(endian + 'HHL', body)
+                options = [option for option in _parse_options(body[8:], endian) if option[0] in _COPIED_IF_OPTIONS]
+                interface_id = self._add_interface(linktype, options, snaplen)
+                self._merged_interfaces[len(self._merged_interfaces)] = (interface_id, _ts_units_per_second(options))
+            elif block_type == BLOCK_TYPE_ENHANCED_PACKET:
+                source_id, ts_high, ts_low, captured_length, original_length = struct.unpack_from(
+                    endian + 'LLLLL', body)
+                if source_id not in self._merged_interfaces:
+                    continue
+                interface_id, units_per_second = self._merged_interfaces[source_id]
+                timestamp = ts_high << 32 | ts_low
+                block = encode_enhanced_packet(interface_id, timestamp, body[20:20 + captured_length], original_length)
+                self._enqueue(timestamp * 1000000 // units_per_second, block)
+            # Other blocks, such as statistics, are dropped
+
+    def next_flush_time(self):
+        """ Return the number of seconds until held back packets are due, or None if there are none. """
+
+        if not self._pending:
+            return None
+        return max(0, (self._pending[0][0] - self._get_timestamp()) / 1000000 + self._merge_delay)
+
+    def read(self, flush_all=False):
+        """ Return the encoded data which is ready to be written out.
+
+        Args:
+            flush_all (bool): also return all the held back packets, e.g. when the capture stops.
+        """
+
+        deadline = self._get_timestamp() - int(self._merge_delay * 1000000)
+        while self._pending and (flush_all or self._pending[0][0] <= deadline):
+            self._output += heapq.heappop(self._pending)[2]
+
+        content = bytes(self._output)
+        self._output.clear()
+        return content
@@ -30,21 +30,14 @@
 import argparse
 from concurrent import futures
 import enum
-import fcntl
 import grpc
 import logging
-import os
 import signal
-import socket
-import subprocess
-import tempfile
 import threading
-import time
 
-import pcap_codec
 from proto import sniffer_pb2
 from proto import sniffer_pb2_grpc
-import sniffer_transport
+import sniffer_capture
 
 
 class CaptureState(enum.Flag):
@@ -58,24 +51,15 @@ class SnifferServicer(sniffer_pb2_grpc.Sniffer):
 
     logger = logging.getLogger('sniffer.SnifferServicer')
 
-    RECV_BUFFER_SIZE = 4096
-    TIMEOUT = 0.1
-
     def _reset(self):
         self._state = CaptureState.NONE
-        self._pcap = None
-        self._denied_nodeids = None
-        self._transport = None
-        self._thread = None
-        self._thread_alive.clear()
+        self._capture = None
         self._file_sync_done.clear()
-        self._tshark_proc = None
 
-    def __init__(self, max_nodes_num):
+    def __init__(self, max_nodes_num, capture_hub):
         self._max_nodes_num = max_nodes_num
-        self._thread_alive = threading.Event()
+        self._capture_hub = capture_hub
         self._file_sync_done = threading.Event()
-        self._nodeids_mutex = threading.Lock()  # for `self._denied_nodeids`
         self._reset()
 
     def Start(self, request, context):
@@ -87,57 +71,14 @@ class SnifferServicer(sniffer_pb2_grpc.Sniffer):
         if self._state != CaptureState.NONE:
             return sniffer_pb2.StartResponse(status=sniffer_pb2.OPERATION_ERROR)
         self._state = CaptureState.THREAD
-
-        # Create a temporary named pipe
-        tempdir = tempfile.mkdtemp()
-        fifo_name = os.path.join(tempdir, 'pcap.fifo')
-        os.mkfifo(fifo_name)
-
-        cmd = ['tshark', '-i', fifo_name]
         if request.includeEthernet:
             self._state |= CaptureState.ETHERNET
-            cmd += ['-i', 'docker0']
-        cmd += ['-w', '-', '-q', 'not ip and not tcp and not arp and not ether proto 0x8899']
-
-        self.logger.debug('Running command:  %s', ' '.join(cmd))
-        self._tshark_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-        self._set_nonblocking(self._tshark_proc.stdout.fileno())
 
-        # Construct pcap codec after initiating tshark to avoid blocking
-        self._pcap = pcap_codec.PcapCodec(request.channel, fifo_name)
-
-        # Sniffer all nodes in default, i.e. there is no RF enclosure
-        self._denied_nodeids = set()
-
-        # Create transport
-        transport_factory = sniffer_transport.SnifferTransportFactory()
-        self._transport = transport_factory.create_transport()
-
-        # Start the sniffer main loop thread
-        self._thread = threading.Thread(target=self._sniffer_main_loop)
-        self._thread.setDaemon(True)
-        self._transport.open()
-        self._thread_alive.set()
-        self._thread.start()
+        self._capture = sniffer_capture.Capture(request.channel, request.includeEthernet)
+        self._capture_hub.add(self._capture)
 
         return sniffer_pb2.StartResponse(status=sniffer_pb2.OK)
 
-    def _sniffer_main_loop(self):
-        """ Sniffer main loop. """
-
-        while self._thread_alive.is_set():
-            try:
-                data, nodeid = self._transport.recv(self.RECV_BUFFER_SIZE, self.TIMEOUT)
-            except socket.timeout:
-                continue
-
-            with self._nodeids_mutex:
-                denied_nodeids = self._denied_nodeids
-
-            # Equivalent to RF enclosure
-            if nodeid not in denied_nodeids:
-                self._pcap.append(data)
-
     def TransferPcapng(self, request, context):
         """ Transfer the capture file. """
 
@@ -145,29 +86,18 @@ class SnifferServicer(sniffer_pb2_grpc.Sniffer):
         if self._state == CaptureState.NONE:
             return sniffer_pb2.FilterNodesResponse(status=sniffer_pb2.OPERATION_ERROR)
 
-        # Synchronize the capture file
-        while True:
-            content = self._tshark_proc.stdout.read()
-            if content is None:
-                # Currently no captured packets
-                time.sleep(self.TIMEOUT)
-            elif content == b'':
-                # Reach EOF when tshark terminates
-                break
-            else:
+        capture = self._capture
+        # Stop waiting for content when the client cancels the transfer
+        context.add_callback(capture.close_transfer)
+
+        try:
+            for content in capture.transfer():
                 # Forward the captured packets
                 yield sniffer_pb2.TransferPcapngResponse(content=content)
-
-        self._file_sync_done.set()
-
-    def _set_nonblocking(self, fd):
-        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
-        if flags < 0:
-            raise RuntimeError('fcntl(F_GETFL) failed')
-
-        flags |= os.O_NONBLOCK
-        if fcntl.fcntl(fd, fcntl.F_SETFL, flags) < 0:
-            raise RuntimeError('fcntl(F_SETFL) failed')
+        except sniffer_capture.TransferOverflowError as e:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        finally:
+            self._file_sync_done.set()
 
     def FilterNodes(self, request, context):
         """ Only sniffer the specified nodes. """
@@ -184,8 +114,7 @@ class SnifferServicer(sniffer_pb2_grpc.Sniffer):
             if not 1 <= nodeid <= self._max_nodes_num:
                 return sniffer_pb2.FilterNodesResponse(status=sniffer_pb2.VALUE_ERROR)
 
-        with self._nodeids_mutex:
-            self._denied_nodeids = denied_nodeids
+        self._capture.set_denied_nodeids(denied_nodeids)
 
         return sniffer_pb2.FilterNodesResponse(status=sniffer_pb2.OK)
 
@@ -199,38 +128,45 @@ class SnifferServicer(sniffer_pb2_grpc.Sniffer):
             return sniffer_pb2.StopResponse(status=sniffer_pb2.OPERATION_ERROR)
         self._state = CaptureState.NONE
 
-        self._thread_alive.clear()
-        self._thread.join()
-        self._transport.close()
-        self._pcap.close()
+        tshark_proc = self._capture.tshark_proc
+        if tshark_proc:
+            tshark_proc.terminate()
+        self._capture_hub.remove(self._capture)
 
-        self._tshark_proc.terminate()
         self._file_sync_done.wait()
-        # `self._tshark_proc` becomes None after the next statement
-        self._tshark_proc.wait()
+        if tshark_proc:
+            tshark_proc.wait()
 
         self._reset()
 
         return sniffer_pb2.StopResponse(status=sniffer_pb2.OK)
 
 
-def serve(address_port, max_nodes_num):
-    # One worker is used for `Start`, `FilterNodes` and `Stop`
-    # The other worker is used for `TransferPcapng`, which will be kept running by the client in a background thread
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
-    sniffer_pb2_grpc.add_SnifferServicer_to_server(SnifferServicer(max_nodes_num), server)
-    # add_secure_port requires a web domain
-    server.add_insecure_port(address_port)
-    logging.info('server starts on %s', address_port)
-    server.start()
+def serve(address_ports, max_nodes_num):
+    # All the sniffers of the process capture through a single transport
+    capture_hub = sniffer_capture.CaptureHub()
+
+    servers = []
+    for address_port in address_ports:
+        # One worker is used for `Start`, `FilterNodes` and `Stop`
+        # The other worker is used for `TransferPcapng`, which will be kept running by the client in a background thread
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        sniffer_pb2_grpc.add_SnifferServicer_to_server(SnifferServicer(max_nodes_num, capture_hub), server)
+        # add_secure_port requires a web domain
+        server.add_insecure_port(address_port)
+        logging.info('server starts on %s', address_port)
+        server.start()
+        servers.append(server)
 
     def exit_handler(signum, context):
-        server.stop(1)
+        for server in servers:
+            server.stop(1)
 
     signal.signal(signal.SIGINT, exit_handler)
     signal.signal(signal.SIGTERM, exit_handler)
 
-    server.wait_for_termination()
+    for server in servers:
+        server.wait_for_termination()
 
 
 def run_sniffer():
@@ -238,10 +174,11 @@ def run_sniffer():
 
     parser = argparse.ArgumentParser()
     parser.add_argument('--grpc-server',
-                        dest='grpc_server',
+                        dest='grpc_servers',
                         type=str,
+                        action='append',
                         required=True,
-                        help='the address of the sniffer server')
+                        help='the address of a sniffer server, repeat it to run several sniffers in one process')
     parser.add_argument('--max-nodes-num',
                         dest='max_nodes_num',
                         type=int,
@@ -249,7 +186,7 @@ def run_sniffer():
                         help='the maximum number of nodes')
     args = parser.parse_args()
 
-    serve(args.grpc_server, args.max_nodes_num)
+    serve(args.grpc_servers, args.max_nodes_num)
 
 
 if __name__ == '__main__':
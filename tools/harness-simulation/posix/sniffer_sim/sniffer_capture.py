@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2022, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+""" Module to share one sniffer transport between the captures of several channels. """
+
+import logging
+import os
+import queue
+import selectors
+import socket
+import subprocess
+import threading
+
+import pcap_codec
+import sniffer_transport
+
+
+class TransferOverflowError(Exception):
+    """ The client of a capture transfer fell too far behind, and the capture content was dropped. """
+
+
+# Queued in place of the capture content when the transfer overflows
+_OVERFLOW = object()
+
+
+class Capture(object):
+    """ A capture of the Thread frames on one channel, optionally merged with the Ethernet packets on docker0. """
+
+    logger = logging.getLogger('sniffer.Capture')
+
+    # Maximum size of a chunk of the capture file sent to the client
+    TRANSFER_CHUNK_SIZE = 64 * 1024
+    # Seconds the Thread frames are held back to be merged in order with the Ethernet packets captured by tshark
+    ETHERNET_MERGE_DELAY = 0.5
+    # Maximum bytes of capture content queued for the client, the transfer fails if the client falls further behind
+    MAX_PENDING_TRANSFER_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, channel, include_ethernet):
+        self.channel = channel
+        self.tshark_proc = None
+
+        # The capture file is written in process, tshark is only needed for capturing Ethernet
+        if include_ethernet:
+            cmd = [
+                'tshark', '-i', 'docker0', '-w', '-', '-q', 'not ip and not tcp and not arp and not ether proto 0x8899'
+            ]
+            self.logger.debug('Running command:  %s', ' '.join(cmd))
+            self.tshark_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+
+        self._pcap = pcap_codec.PcapngCodec(channel, self.ETHERNET_MERGE_DELAY if include_ethernet else 0)
+        # Never blocks, so that a slow client never holds up the capture thread shared by all captures. The size of
+        # the queued content is bounded by `MAX_PENDING_TRANSFER_SIZE` instead.
+        self._output = queue.Queue()
+        self._pending_size = 0
+        self._overflowed = False
+        self._pending_mutex = threading.Lock()  # for `self._pending_size` and `self._overflowed`
+        self._transfer_closed = threading.Event()
+
+        # Sniffer all nodes in default, i.e. there is no RF enclosure
+        self._denied_nodeids = set()
+        self._nodeids_mutex = threading.Lock()  # for `self._denied_nodeids`
+
+        self.stop_requested = False
+        self.finished = threading.Event()
+
+    @property
+    def tshark_fd(self):
+        return self.tshark_proc.stdout.fileno() if self.tshark_proc else None
+
+    def set_denied_nodeids(self, nodeids):
+        with self._nodeids_mutex:
+            self._denied_nodeids = nodeids
+
+    def append(self, data, nodeid):
+        with self._nodeids_mutex:
+            denied_nodeids = self._denied_nodeids
+
+        # Equivalent to RF enclosure
+        if nodeid not in denied_nodeids:
+            self._pcap.append(data)
+
+    def read_tshark(self):
+        """ Merge the pending output of tshark, return False when tshark has terminated. """
+
+        content = os.read(self.tshark_fd, self.TRANSFER_CHUNK_SIZE)
+        if content:
+            self._pcap.append_pcapng(content)
+        return bool(content)
+
+    def next_flush_time(self):
+        return self._pcap.next_flush_time()
+
+    def flush(self):
+        self._publish(self._pcap.read())
+
+    def finish(self):
+        """ Write out everything captured and end the transfer. """
+
+        # tshark has been terminated, take all the packets it still writes out
+        if self.tshark_proc:
+            while self.read_tshark():
+                pass
+
+        self._publish(self._pcap.read(flush_all=True))
+        self._publish(None)
+        self.finished.set()
+
+    def _publish(self, content):
+        """ Queue capture content for the transfer, `None` marks the end of the capture. """
+
+        # Nobody reads the content after the transfer has been cancelled
+        if self._transfer_closed.is_set():
+            return
+
+        if content is None:
+            self._output.put_nowait(None)
+            return
+
+        with self._pending_mutex:
+            if self._overflowed:
+                return
+
+            if self._pending_size + len(content) > self.MAX_PENDING_TRANSFER_SIZE:
+                # The capture file can't be completed any more, so drop its content and fail the transfer
+                self.logger.error('Channel %d: the client fell more than %d bytes behind, dropping the capture',
+                                  self.channel, self.MAX_PENDING_TRANSFER_SIZE)
+                self._overflowed = True
+                self._pending_size = 0
+                self._drain_output()
+                self._output.put_nowait(_OVERFLOW)
+                return
+
+            self._pending_size += len(content)
+
+        for i in range(0, len(content), self.TRANSFER_CHUNK_SIZE):
+            self._output.put_nowait(content[i:i + self.TRANSFER_CHUNK_SIZE])
+
+    def _drain_output(self):
+        try:
+            while True:
+                self._output.get_nowait()
+        except queue.Empty:
+            pass
+
+    def transfer(self):
+        """ Yield the chunks of the capture file until the capture ends or `close_transfer` is called.
+
+        Raises `TransferOverflowError` if the content was dropped because the client fell too far behind.
+        """
+
+        try:
+            while True:
+                content = self._output.get()
+                if content is None:
+                    break
+                if content is _OVERFLOW:
+                    raise TransferOverflowError('Channel %d: the capture was dropped as the client fell behind' %
+                                                self.channel)
+
+                with self._pending_mutex:
+                    if not self._overflowed:
+                        self._pending_size -= len(content)
+                yield content
+        finally:
+            self._transfer_closed.set()
+
+    def close_transfer(self):
+        self._transfer_closed.set()
+        # Wake up `transfer` if it is waiting for content
+        self._output.put_nowait(None)
+
+
+class CaptureHub(object):
+    """ Runs all the captures of the process on a single sniffer transport and a single thread.
+
+    Every received frame is read once and handed to the captures of its channel. The transport is open only while
+    there are captures.
+    """
+
+    logger = logging.getLogger('sniffer.CaptureHub')
+
+    RECV_BUFFER_SIZE = 4096
+
+    def __init__(self):
+        self._captures = []
+        self._running = False
+        self._lock = threading.Lock()  # for `self._captures` and `self._running`
+        # Used to wake up the main loop when the captures change
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+
+    def add(self, capture):
+        with self._lock:
+            self._captures.append(capture)
+            if not self._running:
+                self._running = True
+                transport = sniffer_transport.SnifferTransportFactory().create_transport()
+                transport.open()
+                thread = threading.Thread(target=self._main_loop, args=(transport,))
+                thread.setDaemon(True)
+                thread.start()
+                return
+
+        self._wakeup()
+
+    def remove(self, capture):
+        """ Stop the capture, and wait until all its content has been handed to the transfer. """
+
+        capture.stop_requested = True
+        self._wakeup()
+        capture.finished.wait()
+
+    def _wakeup(self):
+        self._wakeup_send.send(b'\0')
+
+    def _main_loop(self, transport):
+        """ Sniffer main loop. """
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(transport, selectors.EVENT_READ)
+            selector.register(self._wakeup_recv, selectors.EVENT_READ)
+            # The captures whose tshark output is being read, by file descriptor
+            tshark_fds = {}
+            known_captures = set()
+
+            while True:
+                with self._lock:
+                    stopped_captures = [capture for capture in self._captures if capture.stop_requested]
+                    for capture in stopped_captures:
+                        self._captures.remove(capture)
+
+                    captures = list(self._captures)
+
+                # Finish outside of the lock, `finish` may wait for tshark to write out its remaining packets
+                for capture in stopped_captures:
+                    if capture.tshark_fd in tshark_fds:
+                        selector.unregister(capture.tshark_fd)
+                        del tshark_fds[capture.tshark_fd]
+                    known_captures.discard(capture)
+                    capture.finish()
+
+                if not captures:
+                    with self._lock:
+                        # Captures may have been added while finishing the stopped ones
+                        if not self._captures:
+                            self._running = False
+                            transport.close()
+                            return
+                    continue
+
+                for capture in captures:
+                    if capture not in known_captures:
+                        known_captures.add(capture)
+                        if capture.tshark_fd is not None:
+                            tshark_fds[capture.tshark_fd] = capture
+                            selector.register(capture.tshark_fd, selectors.EVENT_READ)
+
+                flush_times = [t for t in (capture.next_flush_time() for capture in captures) if t is not None]
+
+                # Sleep until packets arrive, held back packets are due, or the captures change
+                for key, _ in selector.select(min(flush_times) if flush_times else None):
+                    if key.fileobj is transport:
+                        self._receive_packets(transport, captures)
+                    elif key.fileobj is self._wakeup_recv:
+                        self._wakeup_recv.recv(self.RECV_BUFFER_SIZE)
+                    elif not tshark_fds[key.fileobj].read_tshark():
+                        # tshark terminated
+                        selector.unregister(key.fileobj)
+                        del tshark_fds[key.fileobj]
+
+                for capture in captures:
+                    capture.flush()
+
+    def _receive_packets(self, transport, captures):
+        """ Hand all pending packets to the captures of their channels. """
+
+        captures_by_channel = {}
+        for capture in captures:
+            captures_by_channel.setdefault(capture.channel, []).append(capture)
+
+        while True:
+            try:
+                data, nodeid = transport.recv(self.RECV_BUFFER_SIZE, 0)
+            except socket.timeout:
+                return
+
+            for capture in captures_by_channel.get(data[0], ()):
+                capture.append(data, nodeid)
@@ -59,6 +59,10 @@ class SnifferTransport(object):
         """
         raise NotImplementedError
 
+    def fileno(self):
+        """ Return the file descriptor of the transport, so that it can be waited on with `selectors`. """
+        raise NotImplementedError
+
     def send(self, data, nodeid):
         """ Send data to the node with nodeid.
 
@@ -85,7 +89,8 @@ class SnifferTransport(object):
             (bytearray([0x00, 0x01...], 1)
 
         Raises:
-            socket.timeout: when receiving the packets times out.
+            socket.timeout: when receiving the packets times out, or immediately when `timeout` is 0 and no packet
+                is pending.
         """
         raise NotImplementedError
 
@@ -138,6 +143,9 @@ class SnifferSocketTransport(SnifferTransport):
     def is_opened(self):
         return bool(self._socket is not None)
 
+    def fileno(self):
+        return self._socket.fileno()
+
     def send(self, data, nodeid):
         address = ('127.0.0.1', self._nodeid_to_port(nodeid))
 
@@ -145,7 +153,11 @@ class SnifferSocketTransport(SnifferTransport):
 
     def recv(self, bufsize, timeout):
         self._socket.settimeout(timeout)
-        data, address = self._socket.recvfrom(bufsize)
+        try:
+            data, address = self._socket.recvfrom(bufsize)
+        except BlockingIOError:
+            # A zero timeout puts the socket in non-blocking mode
+            raise socket.timeout('no pending packet')
 
         nodeid = self._port_to_nodeid(address[1])
 
@@ -31,13 +31,16 @@
 >> Class : OpenThread
 """
 import base64
+import collections
 import functools
 import ipaddress
 import logging
 import random
 import traceback
 import re
+import select
 import socket
+import threading
 import time
 import json
 from abc import abstractmethod
@@ -188,6 +191,44 @@ class CommandError(Exception):
         super(CommandError, self).__init__("Error %d: %s" % (code, msg))
 
 
+class LineReader(object):
+    """Splits the output of a device connection into lines.
+
+    The connection is read through `read(size, timeout)`, which waits at most `timeout` seconds for data and returns
+    whatever is available, up to `size` bytes, or an empty string if nothing arrived. A read may also give up earlier
+    (e.g. a serial port waits its own fixed timeout), so the reader keeps reading until its deadline. Reads are done
+    in large chunks and every chunk is split as it arrives, so a command response usually costs a single read.
+    """
+    CHUNK_SIZE = 4096
+
+    def __init__(self, read):
+        self.__read = read
+        self.__lines = collections.deque()
+        self.__tail = ''
+
+    def readLine(self, lineSepX=LINESEPX, timeout=0):
+        """Read the next complete line
+
+        Args:
+            lineSepX  regex: used to split lines
+            timeout   float: maximum number of seconds to wait for the line
+
+        Returns:
+            None if no complete line was received in time
+        """
+        deadline = time.time() + timeout
+        while not self.__lines:
+            data = self.__read(self.CHUNK_SIZE, max(0, deadline - time.time()))
+            if data:
+                lines = lineSepX.split(self.__tail + data)
+                self.__tail = lines.pop()
+                self.__lines.extend(lines)
+            elif time.time() >= deadline:
+                return None
+
+        return self.__lines.popleft()
+
+
 class OpenThreadTHCI(object):
     LOWEST_POSSIBLE_PARTATION_ID = 0x1
     LINK_QUALITY_CHANGE_TIME = 100
@@ -196,6 +237,8 @@ class OpenThreadTHCI(object):
     DOMAIN_NAME = 'Thread'
     MLR_TIMEOUT_MIN = 300
     NETWORK_ATTACHMENT_TIMEOUT = 10
+    # Longest time a command waits for the commissioning log reader to release the CLI
+    COMMISSIONING_LOG_READ_TIMEOUT = 0.05
 
     IsBorderRouter = False
     IsHost = False
@@ -240,9 +283,12 @@ class OpenThreadTHCI(object):
         """
 
     @abstractmethod
-    def _cliReadLine(self):
+    def _cliReadLine(self, timeout=0):
         """Read exactly one line from the device
 
+        Args:
+            timeout float: maximum number of seconds to wait for a line
+
         Returns:
             None if no data
         """
@@ -301,11 +347,7 @@ class OpenThreadTHCI(object):
             Value: successfully retrieve the desired value from reference unit
             Error: some errors occur, indicates by the followed specific error number
         """
-        if self.logThreadStatus == self.logStatus['running']:
-            self.logThreadStatus = self.logStatus['pauseReq']
-            while (self.logThreadStatus != self.logStatus['paused'] and
-                   self.logThreadStatus != self.logStatus['stop']):
-                pass
+        self.__pauseCommissioningLogs()
 
         try:
             self.__sendCommand(cmd)
@@ -313,9 +355,8 @@ class OpenThreadTHCI(object):
 
             t_end = time.time() + timeout
             while time.time() < t_end:
-                line = self.__readCliLine()
+                line = self.__readCliLine(timeout=t_end - time.time())
                 if line is None:
-                    time.sleep(0.01)
                     continue
 
                 # self.log("readline: %s", line)
@@ -338,9 +379,27 @@ class OpenThreadTHCI(object):
             self._disconnect()
             self._connect()
             raise e
+        finally:
+            self.__resumeCommissioningLogs()
 
         return response
 
+    def __pauseCommissioningLogs(self):
+        """Wait until the commissioning log reader, if running, has released the CLI"""
+        with self.__logCondition:
+            if self.logThreadStatus == self.logStatus['running']:
+                self.logThreadStatus = self.logStatus['pauseReq']
+
+            while self.logThreadStatus == self.logStatus['pauseReq']:
+                self.__logCondition.wait()
+
+    def __resumeCommissioningLogs(self):
+        """Hand the CLI back to the commissioning log reader, if it was paused"""
+        with self.__logCondition:
+            if self.logThreadStatus == self.logStatus['paused']:
+                self.logThreadStatus = self.logStatus['running']
+                self.__logCondition.notify_all()
+
     def __expect(self, expected, timeout=5, endswith=False):
         """Find the `expected` line within `times` tries.
 
@@ -352,7 +411,7 @@ class OpenThreadTHCI(object):
 
         deadline = time.time() + timeout
         while True:
-            line = self.__readCliLine()
+            line = self.__readCliLine(timeout=max(0, deadline - time.time()))
             if line is not None:
                 #self.log("readline: %s", line)
                 pass
@@ -361,7 +420,6 @@ class OpenThreadTHCI(object):
                 if time.time() >= deadline:
                     break
 
-                self.sleep(0.01)
                 continue
 
             matched = line.endswith(expected) if endswith else line == expected
@@ -371,12 +429,13 @@ class OpenThreadTHCI(object):
 
         raise Exception('failed to find expected string[%s]' % expected)
 
-    def __readCliLine(self, ignoreLogs=True):
-        """Read the next line from OT CLI.d"""
-        line = self._cliReadLine()
+    def __readCliLine(self, ignoreLogs=True, timeout=0):
+        """Read the next line from OT CLI, waiting at most `timeout` seconds for it."""
+        deadline = time.time() + timeout
+        line = self._cliReadLine(timeout=timeout)
         if ignoreLogs:
             while line is not None and LOGX.match(line):
-                line = self._cliReadLine()
+                line = self._cliReadLine(timeout=max(0, deadline - time.time()))
 
         return line
 
@@ -425,6 +484,8 @@ class OpenThreadTHCI(object):
             'failed': 'failed',
         }
         self.logThreadStatus = self.logStatus['stop']
+        # Guards `logThreadStatus`, commands and the commissioning log reader take turns on the CLI through it
+        self.__logCondition = threading.Condition()
 
         self.deviceConnected = False
 
@@ -731,22 +792,30 @@ class OpenThreadTHCI(object):
         Returns:
             Commissioning logs
         """
-        self.logThreadStatus = self.logStatus['running']
+        with self.__logCondition:
+            self.logThreadStatus = self.logStatus['running']
         logs = Queue()
         t_end = time.time() + durationInSeconds
         joinSucceed = False
 
         while time.time() < t_end:
 
-            if self.logThreadStatus == self.logStatus['pauseReq']:
-                self.logThreadStatus = self.logStatus['paused']
+            with self.__logCondition:
+                if self.logThreadStatus == self.logStatus['pauseReq']:
+                    self.logThreadStatus = self.logStatus['paused']
+                    self.__logCondition.notify_all()
 
-            if self.logThreadStatus != self.logStatus['running']:
-                self.sleep(0.01)
-                continue
+                # sleep until the command has completed
+                while self.logThreadStatus == self.logStatus['paused'] and time.time() < t_end:
+                    self.__logCondition.wait(t_end - time.time())
+
+                if self.logThreadStatus != self.logStatus['running']:
+                    continue
 
             try:
-                line = self.__readCliLine(ignoreLogs=False)
+                # Read in short slices so that a command waits at most one slice for the CLI
+                line = self.__readCliLine(ignoreLogs=False,
+                                          timeout=min(self.COMMISSIONING_LOG_READ_TIMEOUT, t_end - time.time()))
 
                 if line:
                     self.log("commissioning log: %s", line)
@@ -759,14 +828,14 @@ class OpenThreadTHCI(object):
                     elif 'Join failed' in line:
                         # read commissioning logs for 3 more seconds
                         t_end = time.time() + 3
-                elif line is None:
-                    self.sleep(0.01)
 
             except Exception:
                 pass
 
         self.joinCommissionedStatus = self.joinStatus['succeed'] if joinSucceed else self.joinStatus['failed']
-        self.logThreadStatus = self.logStatus['stop']
+        with self.__logCondition:
+            self.logThreadStatus = self.logStatus['stop']
+            self.__logCondition.notify_all()
         return logs
 
     # pylint: disable=no-self-use
@@ -3324,10 +3393,13 @@ class OpenThreadTHCI(object):
 
 
 class OpenThread(OpenThreadTHCI, IThci):
+    # Longest time a read waits for the serial port, the port is configured once as pyserial reconfigures the port
+    # on every change of the timeout
+    SERIAL_READ_TIMEOUT = 0.01
 
     def _connect(self):
         print('My port is %s' % self)
-        self.__lines = []
+        self.__reader = LineReader(self.__socRead)
         timeout = 10
         port_error = None
 
@@ -3335,7 +3407,7 @@ class OpenThread(OpenThreadTHCI, IThci):
             for _ in range(int(timeout / 0.5)):
                 time.sleep(0.5)
                 try:
-                    self.__handle = serial.Serial(self.port, 115200, timeout=0, write_timeout=1)
+                    self.__handle = serial.Serial(self.port, 115200, timeout=self.SERIAL_READ_TIMEOUT, write_timeout=1)
                     self.sleep(1)
                     self.__handle.write('\r\n')
                     self.sleep(0.1)
@@ -3358,11 +3430,21 @@ class OpenThread(OpenThreadTHCI, IThci):
             self.__handle.close()
             self.__handle = None
 
-    def __socRead(self, size=512):
+    def __socRead(self, size=512, timeout=0):
         if self._is_net:
-            return self.__handle.recv(size)
+            if not select.select([self.__handle], [], [], timeout)[0]:
+                return ''
+
+            data = self.__handle.recv(size)
+            if not data:
+                raise socket.error('connection closed by %s' % self.port)
+            return data
         else:
-            return self.__handle.read(size)
+            # wait up to SERIAL_READ_TIMEOUT for the first byte, then take everything already received
+            data = self.__handle.read(1)
+            if data:
+                data += self.__handle.read(min(size - 1, self.__handle.inWaiting()))
+            return data
 
     def __socWrite(self, data):
         if self._is_net:
@@ -3370,24 +3452,13 @@ class OpenThread(OpenThreadTHCI, IThci):
         else:
             self.__handle.write(data)
 
-    def _cliReadLine(self):
-        if len(self.__lines) > 1:
-            return self.__lines.pop(0)
-
-        tail = ''
-        if len(self.__lines) != 0:
-            tail = self.__lines.pop()
-
+    def _cliReadLine(self, timeout=0):
         try:
-            tail += self.__socRead()
+            return self.__reader.readLine(self._lineSepX, timeout)
         except socket.error:
             logging.exception('%s: No new data', self)
             self.sleep(0.1)
 
-        self.__lines += self._lineSepX.split(tail)
-        if len(self.__lines) > 1:
-            return self.__lines.pop(0)
-
     def _cliWriteLine(self, line):
         if self._cmdPrefix == ZEPHYR_PREFIX:
             if not line.startswith(self._cmdPrefix):
@@ -532,7 +532,7 @@ class OpenThread_BR(OpenThreadTHCI, IThci):
                 if address in prefix:
                     return fullIp
 
-    def _cliReadLine(self):
+    def _cliReadLine(self, timeout=0):
         # read commissioning log if it's commissioning
         if not self.__cli_output_lines:
             self.__readSyslogToCli()
@@ -540,6 +540,10 @@ class OpenThread_BR(OpenThreadTHCI, IThci):
         if self.__cli_output_lines:
             return self.__cli_output_lines.pop(0)
 
+        # command output is collected when the command is written, only the syslog needs to be polled
+        if timeout > 0:
+            time.sleep(min(timeout, 0.01))
+
         return None
 
     @watched
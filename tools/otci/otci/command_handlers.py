@@ -29,15 +29,25 @@
 import logging
 import queue
 import re
+import socket
 import threading
 import time
 from abc import abstractmethod, ABC
-from typing import Any, Callable, Optional, Union, List, Pattern
+from typing import Any, Callable, Dict, Optional, Union, List, Pattern, Tuple
 
 from .connectors import OtCliHandler
-from .errors import ExpectLineTimeoutError, CommandError
+from .errors import BatchExecutionError, ExpectLineTimeoutError, CommandError, OTCIError
 from .utils import match_line
 
+_ASYNC_COMMANDS = {'scan', 'ping', 'discover', 'networkdiagnostic get'}
+
+_PATTERN_BATCH_COMMAND_DONE_OR_ERROR = re.compile(r'(Done|Error \d+:.*)$')
+
+
+def _can_pipeline(cmd: str) -> bool:
+    """Checks if a command completes synchronously so that it can be pipelined with other commands."""
+    return cmd not in ('reset', 'factoryreset') and not any(cmd.startswith(x) for x in _ASYNC_COMMANDS)
+
 
 class OTCommandHandler(ABC):
     """This abstract class defines interfaces of a OT Command Handler."""
@@ -59,6 +69,24 @@ class OTCommandHandler(ABC):
         Note: each line of the command output MUST NOT contain '\r\n' at the end.
         """
 
+    def execute_batch(self, cmds: List[str], timeout: float) -> List[List[str]]:
+        """Method execute_batch should execute a list of OT CLI commands and return the output of each command.
+
+        The default implementation executes the commands one by one. Command handlers that are able to write
+        several commands back to back should override this method to save the round trip of each command.
+
+        Note: the output of each command follows the same conventions as `execute_command`. If the output of a
+        command is not received, `BatchExecutionError` should be raised with the outputs received before it.
+        """
+        outputs: List[List[str]] = []
+        try:
+            for cmd in cmds:
+                outputs.append(self.execute_command(cmd, timeout))
+        except OTCIError as e:
+            raise BatchExecutionError(cmds, outputs, e) from e
+
+        return outputs
+
     @abstractmethod
     def close(self):
         """Method close should close the OT Command Handler."""
@@ -107,7 +135,9 @@ class OtCliCommandRunner(OTCommandHandler):
     assert __pattern_log_line.match('[-] Settings------: none log')
     assert not __pattern_log_line.match('[-] Settings-----: none log')  # not enough `-` after module name
 
-    __ASYNC_COMMANDS = {'scan', 'ping', 'discover', 'networkdiagnostic get'}
+    BATCH_MAX_BYTES_IN_FLIGHT = 256
+    """max bytes of the batch commands written but not completed yet, so that they don't overflow the CLI UART RX
+    buffer (512 bytes by default) of real devices"""
 
     def __init__(self, otcli: OtCliHandler, is_spinel_cli: bool = False):
         self.__otcli: OtCliHandler = otcli
@@ -138,10 +168,40 @@ class OtCliCommandRunner(OTCommandHandler):
 
         output = self.__expect_line(timeout,
                                     OtCliCommandRunner.__PATTERN_COMMAND_DONE_OR_ERROR,
-                                    asynchronous=any(cmd.startswith(x) for x in OtCliCommandRunner.__ASYNC_COMMANDS))
+                                    asynchronous=any(cmd.startswith(x) for x in _ASYNC_COMMANDS))
 
         return output
 
+    def execute_batch(self, cmds: List[str], timeout: float = 10) -> List[List[str]]:
+        assert not self.__should_close.is_set(), "OT CLI is already closed."
+
+        # OT CLI ignores new commands while a command is pending, so only synchronous commands are pipelined.
+        if not all(_can_pipeline(cmd) for cmd in cmds):
+            return super().execute_batch(cmds, timeout)
+
+        outputs: List[List[str]] = []
+        num_written = 0
+        bytes_in_flight = 0
+        try:
+            for cmd in cmds:
+                # Write the following commands while their bytes fit in the window, always keeping one in flight
+                while num_written < len(cmds) and (num_written == len(outputs) or
+                                                   bytes_in_flight + len(cmds[num_written]) + 2
+                                                   <= OtCliCommandRunner.BATCH_MAX_BYTES_IN_FLIGHT):
+                    self.__otcli.writeline(cmds[num_written])
+                    bytes_in_flight += len(cmds[num_written]) + 2
+                    num_written += 1
+
+                if self.__expect_command_echoback:
+                    self.__expect_line(timeout, cmd)
+
+                outputs.append(self.__expect_line(timeout, OtCliCommandRunner.__PATTERN_COMMAND_DONE_OR_ERROR))
+                bytes_in_flight -= len(cmd) + 2
+        except ExpectLineTimeoutError as e:
+            raise BatchExecutionError(cmds, outputs, e) from e
+
+        return outputs
+
     def execute_platform_command(self, cmd: str, timeout: float = 10) -> List[str]:
         raise NotImplementedError(f'Platform command is not supported on {self.__class__.__name__}')
 
@@ -249,43 +309,282 @@ class OtCliCommandRunner(OTCommandHandler):
                 self.__pending_lines.put(line)
 
 
-class OtbrSshCommandRunner(OTCommandHandler):
+def _read_batch_output(readline: Callable[[], str], cmds: List[str]) -> List[List[str]]:
+    """Reads the output of an interactive ot-ctl session and splits it by the `Done` or `Error` line of each command.
+
+    Prompts (`> `) are stripped from the lines, and the command lines echoed back by the session are dropped.
+    """
+    outputs: List[List[str]] = []
+    output: List[str] = []
+    echo_index = 0
+
+    while len(outputs) < len(cmds):
+        try:
+            line = readline()
+        except socket.timeout:
+            line = ''
+
+        if not line:
+            # Timeout or EOF before all commands finished
+            raise BatchExecutionError(cmds, outputs, ExpectLineTimeoutError(_PATTERN_BATCH_COMMAND_DONE_OR_ERROR))
+
+        line = line.rstrip('\r\n')
+        while line.startswith('> '):
+            line = line[2:]
+
+        if echo_index < len(cmds) and line == cmds[echo_index]:
+            echo_index += 1
+            continue
+
+        if not line and not output:
+            continue
+
+        output.append(line)
+
+        if _PATTERN_BATCH_COMMAND_DONE_OR_ERROR.match(line):
+            outputs.append(output)
+            output = []
+            echo_index = max(echo_index, len(outputs))
+
+    return outputs
+
+
+class _OtCtlSession(object):
+    """An interactive ot-ctl session over an SSH channel.
+
+    Commands are written to the stdin of a single ot-ctl process, so they don't pay the cost of opening an SSH channel
+    and forking ot-ctl for each command.
+    """
+
+    def __init__(self, ssh: Any, sudo: bool):
+        sh_cmd = 'sudo ot-ctl' if sudo else 'ot-ctl'
+        self.__stdin, self.__stdout, _ = ssh.exec_command(sh_cmd, bufsize=1024)
+        self.__sh_cmd = sh_cmd
+
+    @property
+    def is_active(self) -> bool:
+        channel = self.__stdout.channel
+        return not channel.closed and not channel.exit_status_ready()
 
-    def __init__(self, host: str, port: int, username: str, password: str, sudo: bool):
+    def execute_batch(self, cmds: List[str], timeout: float) -> List[List[str]]:
+        self.__stdout.channel.settimeout(timeout)
+
+        outputs: List[List[str]] = []
+        error: Optional[BatchExecutionError] = None
+        try:
+            self.__stdin.write(''.join(f'{cmd}\n' for cmd in cmds))
+            self.__stdin.flush()
+            outputs = _read_batch_output(self.__stdout.readline, cmds)
+        except socket.timeout:
+            error = BatchExecutionError(cmds, [], ExpectLineTimeoutError(_PATTERN_BATCH_COMMAND_DONE_OR_ERROR))
+        except BatchExecutionError as e:
+            error = e
+
+        if error is not None:
+            outputs = error.outputs
+
+        # ot-ctl reports errors such as failing to connect to otbr-agent on stderr
+        errput = self.__read_errput()
+        if errput:
+            raise BatchExecutionError(cmds, outputs, CommandError(f'{self.__sh_cmd} {"; ".join(cmds)}',
+                                                                  errput)) from error
+
+        if error is not None:
+            raise error
+
+        return outputs
+
+    def close(self):
+        try:
+            self.__stdin.write('exit\n')
+            self.__stdin.flush()
+        except (OSError, EOFError):
+            pass
+
+        self.__stdout.channel.close()
+
+    def __read_errput(self) -> List[str]:
+        channel = self.__stdout.channel
+        errput = b''
+        while channel.recv_stderr_ready():
+            errput += channel.recv_stderr(1024)
+
+        return [line.rstrip('\r') for line in errput.decode(errors='replace').splitlines()]
+
+
+class _OtbrSshConnection(object):
+    """An SSH connection to an OTBR device.
+
+    The connection is established on the first use of `client`, and re-established when it's lost. Connections
+    acquired by `acquire` are shared by all command runners connecting to the same host with the same credentials in
+    the process, and keep one persistent ot-ctl session for each sudo mode.
+    """
+
+    __pool: Dict[Tuple[str, int, str, str], '_OtbrSshConnection'] = {}
+    __pool_lock = threading.Lock()
+
+    def __init__(self, host: str, port: int, username: str, password: str, keepalive: int = 0):
         import paramiko
 
         self.__host = host
         self.__port = port
-        self.__sudo = sudo
+        self.__username = username
+        self.__password = password
+        self.__keepalive = keepalive
         self.__ssh = paramiko.SSHClient()
         self.__ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.__sessions: Dict[bool, _OtCtlSession] = {}
+        self.__refcount = 0
+        self.__connected = False
 
-        self.__line_read_callback = None
+        self.lock = threading.RLock()
+        """Lock that serializes the commands executed in the persistent ot-ctl sessions and the reconnects."""
+
+    def __repr__(self):
+        return f'{self.__host}:{self.__port}'
+
+    @classmethod
+    def acquire(cls, host: str, port: int, username: str, password: str, keepalive: int) -> '_OtbrSshConnection':
+        """Acquires the shared connection to a host, or creates one if it does not exist."""
+        key = (host, port, username, password)
+
+        with cls.__pool_lock:
+            conn = cls.__pool.get(key)
+            if conn is None:
+                conn = cls.__pool[key] = cls(host, port, username, password, keepalive)
 
+            conn.__refcount += 1
+
+        # Connect outside of the pool lock, so that an unreachable host doesn't hold up connecting to other hosts
         try:
-            self.__ssh.connect(host,
-                               port=port,
-                               username=username,
-                               password=password,
+            conn.client
+        except Exception:
+            conn.release()
+            raise
+
+        return conn
+
+    def release(self):
+        """Releases a connection acquired by `acquire`, and closes it when no one uses it."""
+        with _OtbrSshConnection.__pool_lock:
+            self.__refcount -= 1
+            if self.__refcount > 0:
+                return
+
+            _OtbrSshConnection.__pool.pop((self.__host, self.__port, self.__username, self.__password), None)
+
+        self.close()
+
+    @property
+    def client(self) -> Any:
+        """Returns the paramiko SSH client, connecting if it's not connected or the connection is lost."""
+        with self.lock:
+            transport = self.__ssh.get_transport()
+            if transport is None or not transport.is_active():
+                if self.__connected:
+                    logging.warning('%s: SSH connection lost, reconnecting', self)
+                    self.close()
+                self.__connect()
+
+            return self.__ssh
+
+    def get_session(self, sudo: bool) -> _OtCtlSession:
+        """Returns the persistent ot-ctl session, starting a new one if it's not active."""
+        with self.lock:
+            session = self.__sessions.get(sudo)
+
+            if session is None or not session.is_active:
+                if session is not None:
+                    session.close()
+
+                session = self.__sessions[sudo] = _OtCtlSession(self.client, sudo)
+
+            return session
+
+    def close_session(self, sudo: bool):
+        with self.lock:
+            session = self.__sessions.pop(sudo, None)
+            if session is not None:
+                session.close()
+
+    def close(self):
+        with self.lock:
+            for sudo in list(self.__sessions):
+                self.close_session(sudo)
+
+            self.__ssh.close()
+            self.__connected = False
+
+    def __connect(self):
+        import paramiko
+
+        try:
+            self.__ssh.connect(self.__host,
+                               port=self.__port,
+                               username=self.__username,
+                               password=self.__password,
                                allow_agent=False,
                                look_for_keys=False)
         except paramiko.ssh_exception.AuthenticationException:
-            if not password:
+            if not self.__password:
                 transport = self.__ssh.get_transport()
                 assert transport is not None
-                transport.auth_none(username)
+                transport.auth_none(self.__username)
             else:
                 raise
 
+        if self.__keepalive > 0:
+            transport = self.__ssh.get_transport()
+            assert transport is not None
+            transport.set_keepalive(self.__keepalive)
+
+        self.__connected = True
+
+
+class OtbrSshCommandRunner(OTCommandHandler):
+
+    def __init__(self,
+                 host: str,
+                 port: int,
+                 username: str,
+                 password: str,
+                 sudo: bool,
+                 persistent: bool = False,
+                 keepalive: int = 30):
+        """
+        :param persistent: Whether to execute commands in a persistent ot-ctl session instead of running ot-ctl for
+                           each command. The SSH connection and the ot-ctl session are shared by all runners which
+                           connect to the same host in persistent mode.
+        :param keepalive: The interval (in seconds) of SSH keepalive packets in persistent mode, or 0 to disable.
+        """
+        self.__host = host
+        self.__port = port
+        self.__sudo = sudo
+        self.__persistent = persistent
+
+        if persistent:
+            self.__conn = _OtbrSshConnection.acquire(host, port, username, password, keepalive)
+        else:
+            self.__conn = _OtbrSshConnection(host, port, username, password)
+            self.__conn.client  # Connect right away
+
+        self.__line_read_callback = None
+
     def __repr__(self):
         return f'{self.__host}:{self.__port}'
 
     def execute_command(self, cmd: str, timeout: float) -> List[str]:
-        sh_cmd = f'ot-ctl {cmd}'
-        if self.__sudo:
-            sh_cmd = 'sudo ' + sh_cmd
+        if self.__persistent and cmd not in ('reset', 'factoryreset'):
+            try:
+                output = self.__execute_in_session([cmd], timeout)[0]
+            except BatchExecutionError as e:
+                raise e.error
+        else:
+            sh_cmd = f'ot-ctl {cmd}'
+            if self.__sudo:
+                sh_cmd = 'sudo ' + sh_cmd
 
-        output = self.shell(sh_cmd, timeout=timeout)
+            output = self.shell(sh_cmd, timeout=timeout)
 
         if self.__line_read_callback is not None:
             for line in output:
@@ -296,6 +595,27 @@ class OtbrSshCommandRunner(OTCommandHandler):
 
         return output
 
+    def execute_batch(self, cmds: List[str], timeout: float) -> List[List[str]]:
+        if not all(_can_pipeline(cmd) for cmd in cmds):
+            return super().execute_batch(cmds, timeout)
+
+        if self.__persistent:
+            outputs = self.__execute_in_session(cmds, timeout)
+        else:
+            # Run all commands in a single interactive ot-ctl session instead of one `ot-ctl <cmd>` per command.
+            session = _OtCtlSession(self.__conn.client, self.__sudo)
+            try:
+                outputs = session.execute_batch(cmds, timeout)
+            finally:
+                session.close()
+
+        if self.__line_read_callback is not None:
+            for output in outputs:
+                for line in output:
+                    self.__line_read_callback(line)
+
+        return outputs
+
     def execute_platform_command(self, cmd: str, timeout: float = 10) -> List[str]:
         if self.__sudo:
             cmd = 'sudo ' + cmd
@@ -303,7 +623,7 @@ class OtbrSshCommandRunner(OTCommandHandler):
         return self.shell(cmd, timeout=timeout)
 
     def shell(self, cmd: str, timeout: float) -> List[str]:
-        _, cmd_out, cmd_err = self.__ssh.exec_command(cmd, timeout=int(timeout), bufsize=1024)
+        _, cmd_out, cmd_err = self.__conn.client.exec_command(cmd, timeout=int(timeout), bufsize=1024)
         errput = [line.rstrip('\r\n') for line in cmd_err.readlines()]
         output = [line.rstrip('\r\n') for line in cmd_out.readlines()]
 
@@ -313,7 +633,10 @@ class OtbrSshCommandRunner(OTCommandHandler):
         return output
 
     def close(self):
-        self.__ssh.close()
+        if self.__persistent:
+            self.__conn.release()
+        else:
+            self.__conn.close()
 
     def wait(self, duration: float) -> List[str]:
         time.sleep(duration)
@@ -322,19 +645,61 @@ class OtbrSshCommandRunner(OTCommandHandler):
     def set_line_read_callback(self, callback: Optional[Callable[[str], Any]]):
         self.__line_read_callback = callback
 
+    def __execute_in_session(self, cmds: List[str], timeout: float) -> List[List[str]]:
+        with self.__conn.lock:
+            session = self.__conn.get_session(self.__sudo)
+
+            try:
+                return session.execute_batch(cmds, timeout)
+            except Exception:
+                # The session may still have pending output, so start a new session for the next command.
+                self.__conn.close_session(self.__sudo)
+                raise
+
+
+class _SharedAdbDevice(object):
+    """An ADB device connection shared by the ADB command runners in the process."""
+
+    def __init__(self, adb: Any):
+        self.adb = adb
+        self.lock = threading.Lock()
+        self.refcount = 0
+
 
 class OtbrAdbCommandRunner(OTCommandHandler):
 
     from adb_shell.adb_device import AdbDevice
 
-    def __init__(self, adb: AdbDevice, adb_key: Optional[str] = None):
+    __shared_devices: Dict[str, _SharedAdbDevice] = {}
+    __shared_devices_lock = threading.Lock()
+
+    def __init__(self, adb: AdbDevice, adb_key: Optional[str] = None, pool_key: Optional[str] = None):
+        """
+        :param pool_key: The key to share the ADB connection with all runners of the same key in the process, or None
+                         to use a dedicated connection.
+        """
         from adb_shell.auth.sign_pythonrsa import PythonRSASigner
 
-        self.__adb = adb
         self.__line_read_callback = None
-        rsa_keys = None if adb_key is None else [PythonRSASigner.FromRSAKeyPath(adb_key)]
+        self.__rsa_keys = None if adb_key is None else [PythonRSASigner.FromRSAKeyPath(adb_key)]
+        self.__pool_key = pool_key
 
-        self.__adb.connect(rsa_keys=rsa_keys, auth_timeout_s=0.1)
+        if pool_key is None:
+            self.__device = _SharedAdbDevice(adb)
+            self.__connect()
+            return
+
+        with OtbrAdbCommandRunner.__shared_devices_lock:
+            device = OtbrAdbCommandRunner.__shared_devices.get(pool_key)
+
+            if device is None:
+                self.__device = _SharedAdbDevice(adb)
+                self.__connect()
+                OtbrAdbCommandRunner.__shared_devices[pool_key] = self.__device
+            else:
+                self.__device = device
+
+            self.__device.refcount += 1
 
     def execute_command(self, cmd: str, timeout: float) -> List[str]:
         sh_cmd = f'ot-ctl {cmd}'
@@ -350,16 +715,43 @@ class OtbrAdbCommandRunner(OTCommandHandler):
 
         return output
 
+    def execute_batch(self, cmds: List[str], timeout: float) -> List[List[str]]:
+        if not all(_can_pipeline(cmd) for cmd in cmds):
+            return super().execute_batch(cmds, timeout)
+
+        # Run all commands in a single ADB shell stream instead of opening one stream per command.
+        sh_cmd = '; '.join(f'ot-ctl {cmd}' for cmd in cmds)
+        try:
+            lines = iter([line + '\n' for line in self.shell(sh_cmd, timeout=timeout * len(cmds))])
+        except ExpectLineTimeoutError as e:
+            raise BatchExecutionError(cmds, [], e) from e
+        outputs = _read_batch_output(lambda: next(lines, ''), cmds)
+
+        if self.__line_read_callback is not None:
+            for output in outputs:
+                for line in output:
+                    self.__line_read_callback(line)
+
+        return outputs
+
     def execute_platform_command(self, cmd: str, timeout: float = 10) -> List[str]:
         return self.shell(cmd, timeout=timeout)
 
     def shell(self, cmd: str, timeout: float) -> List[str]:
         from adb_shell.exceptions import UsbReadFailedError, AdbTimeoutError
 
-        try:
-            raw_out = self.__adb.shell(cmd, transport_timeout_s=timeout, read_timeout_s=timeout, timeout_s=timeout)
-        except (UsbReadFailedError, AdbTimeoutError):
-            raise ExpectLineTimeoutError(cmd)
+        with self.__device.lock:
+            if not self.__device.adb.available:
+                logging.warning('%s: ADB connection lost, reconnecting', self)
+                self.__connect()
+
+            try:
+                raw_out = self.__device.adb.shell(cmd,
+                                                  transport_timeout_s=timeout,
+                                                  read_timeout_s=timeout,
+                                                  timeout_s=timeout)
+            except (UsbReadFailedError, AdbTimeoutError):
+                raise ExpectLineTimeoutError(cmd)
 
         # Normalize ADB shell output for consistent line splitting.
         #   The ADB client may perform automatic newline conversion, potentially replace the '\n' with '\r\n'.
@@ -370,7 +762,15 @@ class OtbrAdbCommandRunner(OTCommandHandler):
         return out.splitlines()
 
     def close(self):
-        self.__adb.close()
+        if self.__pool_key is not None:
+            with OtbrAdbCommandRunner.__shared_devices_lock:
+                self.__device.refcount -= 1
+                if self.__device.refcount > 0:
+                    return
+
+                OtbrAdbCommandRunner.__shared_devices.pop(self.__pool_key, None)
+
+        self.__device.adb.close()
 
     def wait(self, duration: float) -> List[str]:
         time.sleep(duration)
@@ -379,17 +779,21 @@ class OtbrAdbCommandRunner(OTCommandHandler):
     def set_line_read_callback(self, callback: Optional[Callable[[str], Any]]):
         self.__line_read_callback = callback
 
+    def __connect(self):
+        self.__device.adb.connect(rsa_keys=self.__rsa_keys, auth_timeout_s=0.1)
+
 
 class OtbrAdbTcpCommandRunner(OtbrAdbCommandRunner):
 
-    def __init__(self, host: str, port: int, adb_key: Optional[str] = None):
+    def __init__(self, host: str, port: int, adb_key: Optional[str] = None, persistent: bool = False):
         from adb_shell.adb_device import AdbDeviceTcp
 
         self.__host = host
         self.__port = port
 
         adb = AdbDeviceTcp(host, port, default_transport_timeout_s=9.0)
-        super(OtbrAdbTcpCommandRunner, self).__init__(adb, adb_key)
+        pool_key = f'tcp:{host}:{port}' if persistent else None
+        super(OtbrAdbTcpCommandRunner, self).__init__(adb, adb_key, pool_key)
 
     def __repr__(self):
         return f'{self.__host}:{self.__port}'
@@ -397,13 +801,14 @@ class OtbrAdbTcpCommandRunner(OtbrAdbCommandRunner):
 
 class OtbrAdbUsbCommandRunner(OtbrAdbCommandRunner):
 
-    def __init__(self, serial: str, adb_key: Optional[str] = None):
+    def __init__(self, serial: str, adb_key: Optional[str] = None, persistent: bool = False):
         from adb_shell.adb_device import AdbDeviceUsb
 
         self.__serial = serial
 
         adb = AdbDeviceUsb(serial, port_path=None, default_transport_timeout_s=9.0)
-        super(OtbrAdbUsbCommandRunner, self).__init__(adb, adb_key)
+        pool_key = f'usb:{serial}' if persistent else None
+        super(OtbrAdbUsbCommandRunner, self).__init__(adb, adb_key, pool_key)
 
     def __repr__(self):
         return f'USB:{self.__serial}'
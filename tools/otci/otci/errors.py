@@ -65,6 +65,20 @@ class CommandError(OTCIError):
         return self.__output[-1]
 
 
+class BatchExecutionError(OTCIError):
+    """OTCI failed to receive the output of all commands of a batch.
+
+    The leading commands whose outputs are in `outputs` have been executed. The other commands may or may not have
+    been executed.
+    """
+
+    def __init__(self, cmds: List[str], outputs: List[List[str]], error: Exception):
+        self.outputs = outputs
+        self.error = error
+        super(BatchExecutionError, self).__init__("Received the output of %d of %d commands in batch: %s" %
+                                                  (len(outputs), len(cmds), error))
+
+
 class UnexpectedCommandOutput(OTCIError):
     """OTCI got unexpected command output."""
 
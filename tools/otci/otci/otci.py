@@ -37,8 +37,10 @@ from . import connectors
 from .command_handlers import OTCommandHandler, OtCliCommandRunner, OtbrSshCommandRunner, OtbrAdbTcpCommandRunner
 from .command_handlers import OtbrAdbUsbCommandRunner
 from .connectors import Simulator
-from .errors import UnexpectedCommandOutput, ExpectLineTimeoutError, CommandError, InvalidArgumentsError
+from .errors import UnexpectedCommandOutput, ExpectLineTimeoutError, CommandError, InvalidArgumentsError, \
+    BatchExecutionError
 from .types import ChildId, Rloc16, Ip4Addr, Ip6Addr, ThreadState, PartitionId, DeviceMode, RouterId, SecurityPolicy, Ip6Prefix
+from .tables import OutputCache, TableColumn, TableSchema
 from .types import RouterTableEntry, NetifIdentifier
 from .utils import match_line, constant_property, bits_set
 
@@ -53,6 +55,116 @@ class OTCI(object):
 
     __exec_command_retry = DEFAULT_EXEC_COMMAND_RETRY
 
+    _READ_ONLY_COMMANDS = frozenset((
+        'bbr',
+        'bbr config',
+        'bbr jitter',
+        'bbr state',
+        'bufferinfo',
+        'ccathreshold',
+        'channel',
+        'channel preferred',
+        'channel supported',
+        'child list',
+        'child table',
+        'childip',
+        'childip max',
+        'childmax',
+        'childsupervision checktimeout',
+        'childsupervision interval',
+        'childtimeout',
+        'coap resource',
+        'commissioner sessionid',
+        'commissioner state',
+        'contextreusedelay',
+        'counters',
+        'csl',
+        'dataset active',
+        'dataset pending',
+        'dataset tlvs',
+        'delaytimermin',
+        'dns compression',
+        'dns config',
+        'domainname',
+        'dua iid',
+        'eidcache',
+        'eui64',
+        'extaddr',
+        'extpanid',
+        'ifconfig',
+        'ipaddr',
+        'ipaddr linklocal',
+        'ipaddr mleid',
+        'ipaddr rloc',
+        'ipmaddr',
+        'ipmaddr llatn',
+        'ipmaddr rlatn',
+        'joiner id',
+        'joinerport',
+        'keysequence counter',
+        'keysequence guardtime',
+        'leaderdata',
+        'leaderweight',
+        'log level',
+        'mode',
+        'neighbor list',
+        'neighbor table',
+        'netdata show',
+        'netdata show -x',
+        'networkidtimeout',
+        'networkname',
+        'panid',
+        'parent',
+        'parentpriority',
+        'pollperiod',
+        'prefix',
+        'prefix meshlocal',
+        'promiscuous',
+        'rcp version',
+        'rloc16',
+        'route',
+        'router list',
+        'router table',
+        'routerdowngradethreshold',
+        'routereligible',
+        'routerselectionjitter',
+        'routerupgradethreshold',
+        'singleton',
+        'srp client autostart',
+        'srp client callback',
+        'srp client host',
+        'srp client host address',
+        'srp client host name',
+        'srp client host state',
+        'srp client keyleaseinterval',
+        'srp client leaseinterval',
+        'srp client server',
+        'srp client service',
+        'srp client service key',
+        'srp client state',
+        'srp server addrmode',
+        'srp server domain',
+        'srp server host',
+        'srp server lease',
+        'srp server seqnum',
+        'srp server service',
+        'srp server state',
+        'state',
+        'thread version',
+        'txpower',
+        'udp linksecurity',
+        'unsecureport get',
+        'vendor model',
+        'vendor name',
+        'vendor swversion',
+        'version',
+        'version api',
+    ))
+    """commands that never change the device state, and don't invalidate cached outputs"""
+
+    _READ_ONLY_COMMAND_PATTERN = re.compile(r'^((router|child) \d+|counters \S+)$')
+    """regex of read-only commands with arguments, e.g. `router 5`"""
+
     def __init__(self, otcmd: OTCommandHandler):
         """
         This method initializes an OTCI instance.
@@ -61,6 +173,7 @@ class OTCI(object):
         """
         self.__otcmd: OTCommandHandler = otcmd
         self.__logger = logging.getLogger(name=str(self))
+        self.__output_cache = OutputCache()
 
     def __repr__(self):
         """Gets the string representation of the OTCI instance."""
@@ -132,7 +245,16 @@ class OTCI(object):
         if not silent:
             self.log('info', '> %s', cmd)
 
-        output = self.__otcmd.execute_command(cmd, timeout)
+        is_read_only = self.__is_read_only_command(cmd)
+        if not is_read_only:
+            self.__output_cache.invalidate()
+
+        try:
+            output = self.__otcmd.execute_command(cmd, timeout)
+        finally:
+            if not is_read_only:
+                # Outputs cached by concurrent readers before the command took effect are stale
+                self.__output_cache.invalidate()
 
         if not silent:
             for line in output:
@@ -147,6 +269,75 @@ class OTCI(object):
         else:
             raise CommandError(cmd, output)
 
+    def execute_batch(self,
+                      cmds: List[str],
+                      timeout: float = 10,
+                      silent: bool = False,
+                      already_is_ok: bool = True,
+                      idempotent: bool = False) -> List[List[str]]:
+        """Execute a batch of OpenThread CLI commands.
+
+        The commands are written back to back if the command handler supports it, and the responses are split by
+        the command echoes and the `Done` or `Error` lines. Note that a device keeps executing the commands that
+        follow a failed one, so a batch should not contain commands that depend on each other's success.
+
+        If the output of some commands is not received (e.g. timeout), these commands are executed again one by one
+        with retries only if they are all read-only or `idempotent` is set. Otherwise, `BatchExecutionError` is raised
+        with the outputs of the commands that have been executed, since the others may have been executed too.
+
+        :param cmds: The commands to execute.
+        :param timeout: The timeout of each command.
+        :param silent: Whether to run the commands silent without logging.
+        :param already_is_ok: Whether to regard `Error 24: Already` as success.
+        :param idempotent: Whether the commands may be executed again (e.g. `dataset channel 11`), so that the failed
+                           ones are retried one by one like `execute_command` does.
+        :returns: The output of each command as a list of lines.
+        """
+        if not cmds:
+            return []
+
+        is_read_only = all(self.__is_read_only_command(cmd) for cmd in cmds)
+        if not is_read_only:
+            self.__output_cache.invalidate()
+
+        error = None
+        try:
+            outputs = self.__otcmd.execute_batch(cmds, timeout)
+        except BatchExecutionError as e:
+            outputs, error = e.outputs, e.error
+        finally:
+            if not is_read_only:
+                # Outputs cached by concurrent readers before the commands took effect are stale
+                self.__output_cache.invalidate()
+
+        results: List[List[str]] = []
+        for cmd, output in zip(cmds, outputs):
+            if not silent:
+                self.log('info', '> %s', cmd)
+                for line in output:
+                    self.log('info', '%s', line)
+
+            if cmd in ('reset', 'factoryreset'):
+                results.append(output)
+            elif output and (output[-1] == 'Done' or (already_is_ok and output[-1] == 'Error 24: Already')):
+                results.append(output[:-1])
+            elif idempotent:
+                results.append(self.execute_command(cmd, timeout, silent, already_is_ok=already_is_ok))
+            else:
+                raise CommandError(cmd, output)
+
+        if error is not None:
+            remaining_cmds = cmds[len(outputs):]
+            if not remaining_cmds or not (idempotent or
+                                          all(self.__is_read_only_command(cmd) for cmd in remaining_cmds)):
+                raise BatchExecutionError(cmds, results, error)
+
+            self.log('warning', 'failed to execute commands in batch: %s', error)
+            for cmd in remaining_cmds:
+                results.append(self.execute_command(cmd, timeout, silent, already_is_ok=already_is_ok))
+
+        return results
+
     def execute_platform_command(self, cmd: str, timeout: float = 10, silent: bool = False) -> List[str]:
         """Execute the platform command.
 
@@ -158,6 +349,7 @@ class OTCI(object):
         if not silent:
             self.log('info', '> %s', cmd)
 
+        self.__output_cache.invalidate()
         output = self.__otcmd.execute_platform_command(cmd, timeout)
 
         if not silent:
@@ -172,11 +364,27 @@ class OTCI(object):
 
     def shell(self, cmd: str, timeout: float = 10):
         self.log('info', '# %s', cmd)
+        self.__output_cache.invalidate()
         output = self.__otcmd.shell(cmd, timeout=timeout)
         for line in output:
             self.log('info', '%s', line)
         return output
 
+    def set_output_cache_ttl(self, ttl: float):
+        """Set the time (in seconds) for which parsed table outputs (e.g. `router table`, `netdata show`) are reused
+        without executing the command again.
+
+        The cached outputs are invalidated when a command which may change the device state is executed. Setting the
+        TTL to 0 (the default) disables reusing outputs without executing the command, but unchanged outputs are still
+        not parsed again.
+        """
+        assert ttl >= 0
+        self.__output_cache.ttl = ttl
+
+    @staticmethod
+    def __is_read_only_command(cmd: str) -> bool:
+        return cmd in OTCI._READ_ONLY_COMMANDS or OTCI._READ_ONLY_COMMAND_PATTERN.match(cmd) is not None
+
     def set_logger(self, logger: Optional[logging.Logger]):
         """Set the logger for the OTCI instance, or None to disable logging."""
         self.__logger = logger
@@ -274,6 +482,7 @@ class OTCI(object):
         r'^(?P<transmitted>\d+) packets transmitted, (?P<received>\d+) packets received.' +
         r'(?: Packet loss = (?P<loss>\d+\.\d+)%.)?' +
         r'(?: Round-trip min/avg/max = (?P<min>\d+)/(?P<avg>\d+\.\d+)/(?P<max>\d+) ms.)?$')
+    _PING_REPLY_PATTERN = re.compile(r'^\d+ bytes from \S+: icmp_seq=\d+ hlim=\d+ time=(?P<time>\d+)ms$')
 
     def ping(self,
              dst: Union[str, Ip6Addr],
@@ -282,7 +491,7 @@ class OTCI(object):
              count: int = 1,
              interval: float = 1,
              hoplimit: int = 64,
-             timeout: float = 3) -> Dict[str, Union[int, float, Dict[str, Union[int, float]]]]:
+             timeout: float = 3) -> Dict[str, Union[int, float, Dict[str, Union[int, float]], List[int]]]:
         """Send an ICMPv6 Echo Request.
         The default arguments are consistent with
             https://github.com/openthread/openthread/blob/main/src/core/utils/ping_sender.hpp.
@@ -297,14 +506,22 @@ class OTCI(object):
                          OPENTHREAD_CONFIG_IP6_HOP_LIMIT_DEFAULT in src/core/config/ip6.h.
         :param timeout: The maximum duration in seconds for the ping command to wait after the final echo request is
                         sent. Default is 3.
+        :returns: The statistics of the ping, `round_trip_times` holds the round trip time in milliseconds of each
+                  Echo Reply in the order they are received.
         """
         cmd = f'ping {"" if not src else "-I %s" % src} {dst} {size} {count} {interval} {hoplimit} {timeout}'
 
         timeout_allowance = 3
         lines = self.execute_command(cmd, timeout=(count - 1) * interval + timeout + timeout_allowance)
 
-        statistics: Dict[str, Union[int, float, Dict[str, Union[int, float]]]] = {}
+        statistics: Dict[str, Union[int, float, Dict[str, Union[int, float]], List[int]]] = {}
+        round_trip_times: List[int] = []
         for line in lines:
+            m = OTCI._PING_REPLY_PATTERN.match(line)
+            if m is not None:
+                round_trip_times.append(int(m.group('time')))
+                continue
+
             m = OTCI._PING_STATISTICS_PATTERN.match(line)
             if m is not None:
                 if m.group('transmitted') is not None:
@@ -318,6 +535,8 @@ class OTCI(object):
                         'avg': float(m.group('avg')),
                         'max': int(m.group('max'))
                     }
+
+        statistics['round_trip_times'] = round_trip_times
         return statistics
 
     def ping_stop(self):
@@ -715,12 +934,23 @@ class OTCI(object):
         line = self.__parse_str(self.execute_command('router list'))
         return list(map(RouterId, line.strip().split()))
 
+    _ROUTER_TABLE_SCHEMA = TableSchema(
+        TableColumn('ID', 'id', RouterId),
+        TableColumn('RLOC16', 'rloc16', lambda x: Rloc16(x, 16)),
+        TableColumn('Next Hop', 'next_hop', int),
+        TableColumn('Path Cost', 'path_cost', int),
+        TableColumn('LQ In', 'lq_in', int),
+        TableColumn('LQ Out', 'lq_out', int),
+        TableColumn('Age', 'age', int),
+        TableColumn('Extended MAC', 'extaddr'),
+        TableColumn('Link', 'link', int, optional=True),
+    )
+
     def get_router_table(self) -> Dict[RouterId, RouterTableEntry]:
         """table of routers."""
-        output = self.execute_command('router table')
-        if len(output) < 2:
-            raise UnexpectedCommandOutput(output)
+        return self.__output_cache.get('router table', self.execute_command, self.__parse_router_table)
 
+    def __parse_router_table(self, output: List[str]) -> Dict[RouterId, RouterTableEntry]:
         #
         # Example output:
         #
@@ -731,39 +961,13 @@ class OTCI(object):
         # Done
         #
 
-        headers = self.__split_table_row(output[0])
-
         table: Dict[RouterId, RouterTableEntry] = {}
-        for line in output[2:]:
-            line = line.strip()
-            if not line:
-                continue
-
-            fields = self.__split_table_row(line)
-            if len(fields) != len(headers):
-                raise UnexpectedCommandOutput(output)
-
-            def col(col_name: str):
-                return self.__get_table_col(col_name, headers, fields)
-
-            id = col('ID')
+        for row in OTCI._ROUTER_TABLE_SCHEMA.parse(output):
+            table[row['id']] = router = RouterTableEntry(row)
 
-            table[RouterId(id)] = router = RouterTableEntry({
-                'id': RouterId(id),
-                'rloc16': Rloc16(col('RLOC16'), 16),
-                'next_hop': int(col('Next Hop')),
-                'path_cost': int(col('Path Cost')),
-                'lq_in': int(col('LQ In')),
-                'lq_out': int(col('LQ Out')),
-                'age': int(col('Age')),
-                'extaddr': col('Extended MAC'),
-            })
-
-            if 'Link' in headers:
-                router['link'] = int(col('Link'))
-            else:
+            if 'link' not in router:
                 # support older version of OT which does not output `Link` field
-                router['link'] = self.get_router_info(RouterId(id), silent=True)['link']
+                router['link'] = self.get_router_info(router['id'], silent=True)['link']
 
         return table
 
@@ -790,12 +994,28 @@ class OTCI(object):
     # Router utilities: Child management
     #
 
+    _CHILD_TABLE_SCHEMA = TableSchema(
+        TableColumn('ID', 'id', ChildId),
+        TableColumn('RLOC16', 'rloc16', lambda x: Rloc16(x, 16)),
+        TableColumn('Timeout', 'timeout', int),
+        TableColumn('Age', 'age', int),
+        TableColumn('LQ In', 'lq_in', int),
+        TableColumn('C_VN', 'c_vn', int),
+        TableColumn('R', 'r', int),
+        TableColumn('D', 'd', int),
+        TableColumn('N', 'n', int),
+        TableColumn('Extended MAC', 'extaddr'),
+        TableColumn('Ver', 'ver', int, optional=True),
+        TableColumn('CSL', 'csl', lambda x: bool(int(x)), optional=True),
+        TableColumn('QMsgCnt', 'qmsgcnt', int, optional=True),
+        TableColumn('Suprvsn', 'suprvsn', int, optional=True),
+    )
+
     def get_child_table(self) -> Dict[ChildId, Dict[str, Union[ChildId, Rloc16, int, str]]]:
         """Get the table of attached children."""
-        output = self.execute_command('child table')
-        if len(output) < 2:
-            raise UnexpectedCommandOutput(output)
+        return self.__output_cache.get('child table', self.execute_command, self.__parse_child_table)
 
+    def __parse_child_table(self, output: List[str]) -> Dict[ChildId, Dict[str, Union[ChildId, Rloc16, int, str]]]:
         #
         # Example output:
         # | ID  | RLOC16 | Timeout    | Age        | LQ In | C_VN |R|D|N|Ver|CSL|QMsgCnt| Extended MAC     |
@@ -805,21 +1025,9 @@ class OTCI(object):
         # Done
         #
 
-        headers = self.__split_table_row(output[0])
-
         table: Dict[ChildId, Dict[str, Union[ChildId, Rloc16, int, str]]] = {}
-        for line in output[2:]:
-            line = line.strip()
-            if not line:
-                continue
-
-            fields = self.__split_table_row(line)
-
-            def col(col_name: str):
-                return self.__get_table_col(col_name, headers, fields)
-
-            id = int(col("ID"))
-            r, d, n = int(col("R")), int(col("D")), int(col("N"))
+        for row in OTCI._CHILD_TABLE_SCHEMA.parse(output):
+            r, d, n = row.pop('r'), row.pop('d'), row.pop('n')
 
             #
             # Device mode flags:
@@ -828,33 +1036,10 @@ class OTCI(object):
             # d: Full Thread Device
             # n: Full Network Data
             # -: no flags set (rx-off-when-idle, minimal Thread device, stable network data)
-            mode = DeviceMode(
+            row['mode'] = DeviceMode(
                 f'{"r" if r else ""}{"d" if d else ""}{"n" if n else ""}{"-" if r == d == n == 0 else ""}')
 
-            child: Dict[str, Union[ChildId, Rloc16, int, str]] = {
-                'id': ChildId(id),
-                'rloc16': Rloc16(col('RLOC16'), 16),
-                'timeout': int(col('Timeout')),
-                'age': int(col('Age')),
-                'lq_in': int(col('LQ In')),
-                'c_vn': int(col('C_VN')),
-                'mode': mode,
-                'extaddr': col('Extended MAC')
-            }
-
-            if 'Ver' in headers:
-                child['ver'] = int(col('Ver'))
-
-            if 'CSL' in headers:
-                child['csl'] = bool(int(col('CSL')))
-
-            if 'QMsgCnt' in headers:
-                child['qmsgcnt'] = int(col('QMsgCnt'))
-
-            if 'Suprvsn' in headers:
-                child['suprvsn'] = int(col('Suprvsn'))
-
-            table[ChildId(id)] = child
+            table[row['id']] = row
 
         return table
 
@@ -1126,12 +1311,11 @@ class OTCI(object):
 
     def srp_server_get_hosts(self) -> List[Dict[str, Any]]:
         """Get SRP server registered hosts."""
-        return self.__parse_srp_server_hosts(self.execute_command('srp server host'))
+        return self.__output_cache.get('srp server host', self.execute_command, self.__parse_srp_server_hosts)
 
     def srp_server_get_services(self) -> List[Dict[str, Any]]:
         """Get SRP server registered services."""
-        output = self.execute_command('srp server service')
-        return self.__parse_srp_server_services(output)
+        return self.__output_cache.get('srp server service', self.execute_command, self.__parse_srp_server_services)
 
     def __parse_srp_server_hosts(self, output: List[str]) -> List[Dict[str, Any]]:
         result: List[Dict[str, Any]] = []
@@ -1392,14 +1576,6 @@ class OTCI(object):
         """Disable SRP client "service key record inclusion" mode."""
         self.execute_command('srp client service key disable')
 
-    def __split_table_row(self, row: str) -> List[str]:
-        if not (row.startswith('|') and row.endswith('|')):
-            raise ValueError(row)
-
-        fields = row.split('|')
-        fields = [x.strip() for x in fields[1:-1]]
-        return fields
-
     def __get_table_col(self, col_name: str, headers: List[str], fields: List[str]) -> str:
         return fields[headers.index(col_name)]
 
@@ -1509,11 +1685,22 @@ class OTCI(object):
         line = self.__parse_str(self.execute_command('neighbor list')).strip()
         return [Rloc16(id, 16) for id in line.split()]
 
+    _NEIGHBOR_TABLE_SCHEMA = TableSchema(
+        TableColumn('Role', 'is_router', lambda x: x == 'R'),
+        TableColumn('RLOC16', 'rloc16', lambda x: Rloc16(x, 16)),
+        TableColumn('Age', 'age', int),
+        TableColumn('Avg RSSI', 'avg_rssi', int),
+        TableColumn('Last RSSI', 'last_rssi', int),
+        TableColumn('R', 'r', int),
+        TableColumn('D', 'd', int),
+        TableColumn('N', 'n', int),
+        TableColumn('Extended MAC', 'extaddr'),
+    )
+
     def get_neighbor_table(self) -> Dict[Rloc16, Dict[str, Any]]:
-        output = self.execute_command('neighbor table')
-        if len(output) < 2:
-            raise UnexpectedCommandOutput(output)
+        return self.__output_cache.get('neighbor table', self.execute_command, self.__parse_neighbor_table)
 
+    def __parse_neighbor_table(self, output: List[str]) -> Dict[Rloc16, Dict[str, Any]]:
         #
         # Example output:
         #
@@ -1525,34 +1712,19 @@ class OTCI(object):
         # Done
         #
 
-        headers = self.__split_table_row(output[0])
-
         table: Dict[Rloc16, Dict[str, Any]] = {}
-        for line in output[2:]:
-            line = line.strip()
-            if not line:
-                continue
-
-            fields = self.__split_table_row(line)
-
-            def col(col_name: str) -> str:
-                return self.__get_table_col(col_name, headers, fields)
-
-            role = col('Role')
-            is_router = role == 'R'
-            r, d, n = int(col('R')), int(col('D')), int(col('N'))
+        for row in OTCI._NEIGHBOR_TABLE_SCHEMA.parse(output):
+            r, d, n = row.pop('r'), row.pop('d'), row.pop('n')
             mode = DeviceMode(f'{"r" if r else ""}{"d" if d else ""}{"n" if n else ""}')
 
-            rloc16 = Rloc16(col('RLOC16'), 16)
-
-            table[rloc16] = {
-                'is_router': is_router,
-                'rloc16': rloc16,
-                'age': int(col('Age')),
-                'avg_rssi': int(col('Avg RSSI')),
-                'last_rssi': int(col('Last RSSI')),
+            table[row['rloc16']] = {
+                'is_router': row['is_router'],
+                'rloc16': row['rloc16'],
+                'age': row['age'],
+                'avg_rssi': row['avg_rssi'],
+                'last_rssi': row['last_rssi'],
                 'mode': mode,
-                'extaddr': col('Extended MAC'),
+                'extaddr': row['extaddr'],
             }
 
         return table
@@ -1878,41 +2050,30 @@ class OTCI(object):
     def network_data_unpublish_dnssrp(self):
         self.execute_command('netdata unpublish dnssrp')
 
+    _NETWORK_DATA_SECTIONS = ('Prefixes:', 'Routes:', 'Services:', 'Contexts:')
+
     def get_network_data(self) -> Dict[str, List[Any]]:
-        output = self.execute_command('netdata show')
+        return self.__output_cache.get('netdata show', self.execute_command, self.__parse_network_data)
 
-        netdata: Dict[str, List[Any]] = {}
-        if output.pop(0) != 'Prefixes:':
+    def __parse_network_data(self, output: List[str]) -> Dict[str, List[Any]]:
+        # Split the output into the sections, lines after `Contexts:` are ignored.
+        sections: List[List[str]] = []
+        for line in output:
+            if len(sections) < len(OTCI._NETWORK_DATA_SECTIONS) and line == OTCI._NETWORK_DATA_SECTIONS[len(sections)]:
+                sections.append([])
+            elif not sections:
+                raise UnexpectedCommandOutput(output)
+            elif len(sections) < len(OTCI._NETWORK_DATA_SECTIONS):
+                sections[-1].append(line)
+
+        if len(sections) != len(OTCI._NETWORK_DATA_SECTIONS):
             raise UnexpectedCommandOutput(output)
 
-        prefixes_output: List[str] = []
-        while True:
-            line = output.pop(0)
-            if line == 'Routes:':
-                break
-            else:
-                prefixes_output.append(line)
+        prefixes_output, routes_output, services_output, _ = sections
 
+        netdata: Dict[str, List[Any]] = {}
         netdata['prefixes'] = self.__parse_prefixes(prefixes_output)
-
-        routes_output: List[str] = []
-        while True:
-            line = output.pop(0)
-            if line == 'Services:':
-                break
-            else:
-                routes_output.append(line)
-
         netdata['routes'] = self.__parse_routes(routes_output)
-
-        services_output: List[str] = []
-        while True:
-            line = output.pop(0)
-            if line == 'Contexts:':
-                break
-            else:
-                services_output.append(line)
-
         netdata['services'] = self.__parse_services(services_output)
 
         return netdata
@@ -2134,43 +2295,47 @@ class OTCI(object):
                            pskc: Optional[str] = None,
                            security_policy: Optional[tuple[int, str]] = None,
                            pending_timestamp: Optional[int] = None):
+        cmds: List[str] = []
+
         if active_timestamp is not None:
-            self.execute_command(f'dataset activetimestamp {active_timestamp}')
+            cmds.append(f'dataset activetimestamp {active_timestamp}')
 
         if channel is not None:
-            self.execute_command(f'dataset channel {channel}')
+            cmds.append(f'dataset channel {channel}')
 
         if wakeupchannel is not None:
-            self.execute_command(f'dataset wakeupchannel {wakeupchannel}')
+            cmds.append(f'dataset wakeupchannel {wakeupchannel}')
 
         if channel_mask is not None:
-            self.execute_command(f'dataset channelmask {channel_mask:#08x}')
+            cmds.append(f'dataset channelmask {channel_mask:#08x}')
 
         if extpanid is not None:
-            self.execute_command(f'dataset extpanid {extpanid}')
+            cmds.append(f'dataset extpanid {extpanid}')
 
         if mesh_local_prefix is not None:
-            self.execute_command(f'dataset meshlocalprefix {mesh_local_prefix}')
+            cmds.append(f'dataset meshlocalprefix {mesh_local_prefix}')
 
         if network_key is not None:
             nwk_cmd = self.__detect_networkkey_cmd()
-            self.execute_command(f'dataset {nwk_cmd} {network_key}')
+            cmds.append(f'dataset {nwk_cmd} {network_key}')
 
         if network_name is not None:
-            self.execute_command(f'dataset networkname {self.__escape_escapable(network_name)}')
+            cmds.append(f'dataset networkname {self.__escape_escapable(network_name)}')
 
         if panid is not None:
-            self.execute_command(f'dataset panid {panid:#04x}')
+            cmds.append(f'dataset panid {panid:#04x}')
 
         if pskc is not None:
-            self.execute_command(f'dataset pskc {pskc}')
+            cmds.append(f'dataset pskc {pskc}')
 
         if security_policy is not None:
             rotation_time, flags = security_policy
-            self.execute_command(f'dataset securitypolicy {rotation_time} {flags}')
+            cmds.append(f'dataset securitypolicy {rotation_time} {flags}')
 
         if pending_timestamp is not None:
-            self.execute_command(f'dataset pendingtimestamp {pending_timestamp}')
+            cmds.append(f'dataset pendingtimestamp {pending_timestamp}')
+
+        self.execute_batch(cmds, idempotent=True)
 
     def dataset_mgmt_get_command(self,
                                  dataset: str,
@@ -3020,8 +3185,8 @@ class OTCI(object):
         """Transmit a fixed number of packets."""
         command = 'diag send '
         command += 'async ' if is_async else ''
-        command += f'{packets} '
-        command += f'{length}' if length is not None else ''
+        command += f'{packets}'
+        command += f' {length}' if length is not None else ''
 
         self.execute_command(command)
 
@@ -3683,18 +3848,34 @@ def connect_otbr_ssh(host: str,
                      port: int = 22,
                      username: str = 'pi',
                      password: str = 'raspberry',
-                     sudo: bool = True) -> OTCI:
-    cmd_handler = OtbrSshCommandRunner(host, port, username, password, sudo=sudo)
+                     sudo: bool = True,
+                     persistent: bool = False) -> OTCI:
+    """Connect to an OTBR device via SSH.
+
+    :param persistent: Whether to execute commands in a persistent ot-ctl session. The SSH connection and the ot-ctl
+                       session are shared by all OTCI instances connecting to the same host in persistent mode.
+    """
+    cmd_handler = OtbrSshCommandRunner(host, port, username, password, sudo=sudo, persistent=persistent)
     return OTCI(cmd_handler)
 
 
-def connect_otbr_adb_tcp(host: str, port: int = 5555, adb_key: Optional[str] = None) -> OTCI:
-    cmd_handler = OtbrAdbTcpCommandRunner(host, port, adb_key)
+def connect_otbr_adb_tcp(host: str, port: int = 5555, adb_key: Optional[str] = None, persistent: bool = False) -> OTCI:
+    """Connect to an OTBR device via ADB over TCP.
+
+    :param persistent: Whether to share the ADB connection with all OTCI instances connecting to the same device in
+                       persistent mode.
+    """
+    cmd_handler = OtbrAdbTcpCommandRunner(host, port, adb_key, persistent=persistent)
     return OTCI(cmd_handler)
 
 
-def connect_otbr_adb_usb(serial: str, adb_key: Optional[str] = None) -> OTCI:
-    cmd_handler = OtbrAdbUsbCommandRunner(serial, adb_key)
+def connect_otbr_adb_usb(serial: str, adb_key: Optional[str] = None, persistent: bool = False) -> OTCI:
+    """Connect to an OTBR device via ADB over USB.
+
+    :param persistent: Whether to share the ADB connection with all OTCI instances connecting to the same device in
+                       persistent mode.
+    """
+    cmd_handler = OtbrAdbUsbCommandRunner(serial, adb_key, persistent=persistent)
     return OTCI(cmd_handler)
 
 
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2020, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+"""
+This module implements a telemetry poller which periodically collects metrics (e.g. counters, router tables) from
+many OTCI devices and exports them to a local time-series file.
+
+Each device and metric is polled at its own interval. The poll jobs are scheduled on a shared timer wheel, and the
+number of concurrent commands on each transport is capped, so that polling does not starve other commands which are
+executed on the same CLI.
+
+Example:
+
+    poller = Poller(SqliteExporter('telemetry.db'))
+    for node in nodes:
+        poller.add(node, counter_metric('mac', interval=10))
+        poller.add(node, router_table_metric(interval=30))
+
+    poller.start()
+    ...
+    with poller.transport_lock(nodes[0]):
+        nodes[0].thread_stop()
+    ...
+    poller.stop()
+"""
+
+import csv
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .otci import OTCI
+from .types import Ip6Addr
+
+MetricValue = Union[int, float, str, bool]
+
+
+class Sample(object):
+    """Represents a sample of a metric value collected from a device."""
+
+    __slots__ = ('timestamp', 'device', 'metric', 'key', 'value', 'delta')
+
+    def __init__(self, timestamp: float, device: str, metric: str, key: str, value: MetricValue, delta: Optional[int]):
+        self.timestamp = timestamp
+        self.device = device
+        self.metric = metric
+        self.key = key
+        self.value = value
+        self.delta = delta
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.timestamp, self.device, self.metric, self.key, self.value, self.delta))
+
+    def __repr__(self):
+        return f'Sample{tuple(self)!r}'
+
+
+class Metric(object):
+    """Represents a metric to poll from devices."""
+
+    def __init__(self,
+                 name: str,
+                 collect: Callable[[OTCI], Dict[str, MetricValue]],
+                 interval: float,
+                 is_counter: bool = False):
+        """
+        :param name: The metric name.
+        :param collect: The function to collect the metric values from a device, as a dict from keys to values.
+        :param interval: The poll interval (in seconds).
+        :param is_counter: Whether the values are monotonic counters, of which deltas are computed.
+        """
+        assert interval > 0
+        self.name = name
+        self.collect = collect
+        self.interval = interval
+        self.is_counter = is_counter
+
+    def __repr__(self):
+        return f'Metric({self.name}, interval={self.interval})'
+
+
+def counter_metric(name: str, interval: float) -> Metric:
+    """Returns a metric of the counters (e.g. `mac`, `mle`) reported by `counters <name>`."""
+    return Metric(f'counters {name}', lambda node: dict(node.get_counter(name)), interval, is_counter=True)
+
+
+def router_table_metric(interval: float) -> Metric:
+    """Returns a metric of the router table, keyed by `<router id>.<field>`."""
+
+    def _collect(node: OTCI) -> Dict[str, MetricValue]:
+        values: Dict[str, MetricValue] = {}
+        for router_id, router in node.get_router_table().items():
+            for field in ('rloc16', 'next_hop', 'path_cost', 'lq_in', 'lq_out', 'age', 'link'):
+                values[f'{router_id}.{field}'] = int(router[field])
+
+        return values
+
+    return Metric('router table', _collect, interval)
+
+
+def srp_server_metric(interval: float) -> Metric:
+    """Returns a metric of the SRP server state and the number of registered hosts and services."""
+
+    def _collect(node: OTCI) -> Dict[str, MetricValue]:
+        hosts = node.srp_server_get_hosts()
+        services = node.srp_server_get_services()
+
+        return {
+            'state': node.srp_server_get_state(),
+            'hosts': sum(1 for host in hosts if not host['deleted']),
+            'deleted_hosts': sum(1 for host in hosts if host['deleted']),
+            'services': sum(1 for service in services if not service['deleted']),
+            'deleted_services': sum(1 for service in services if service['deleted']),
+        }
+
+    return Metric('srp server', _collect, interval)
+
+
+def network_diagnostics_metric(addr: Union[str, Ip6Addr], tlvs: List[int], interval: float) -> Metric:
+    """Returns a metric of the network diagnostics of a destination, keyed by `<TLV>` or `<TLV>.<field>`."""
+
+    def _collect(node: OTCI) -> Dict[str, MetricValue]:
+        values: Dict[str, MetricValue] = {}
+        for name, value in node.get_network_diagnostics(addr, tlvs).items():
+            if isinstance(value, dict):
+                for field, field_value in value.items():
+                    values[f'{name}.{field}'] = field_value
+            else:
+                values[name] = value
+
+        return values
+
+    return Metric(f'networkdiagnostic {addr}', _collect, interval)
+
+
+class Exporter(ABC):
+    """This abstract class defines interfaces of a metric sample exporter."""
+
+    @abstractmethod
+    def open(self):
+        """Method open should open the time-series storage, it's called again when a stopped poller is restarted."""
+
+    @abstractmethod
+    def export(self, samples: List[Sample]):
+        """Method export should write the samples to the time-series storage."""
+
+    @abstractmethod
+    def close(self):
+        """Method close should flush and close the time-series storage."""
+
+
+class CsvExporter(Exporter):
+    """Exports samples to a CSV file."""
+
+    _HEADER = ('timestamp', 'device', 'metric', 'key', 'value', 'delta')
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.open()
+
+    def open(self):
+        is_new = not os.path.exists(self.__path) or os.path.getsize(self.__path) == 0
+
+        self.__file = open(self.__path, 'a', newline='')
+        self.__writer = csv.writer(self.__file)
+
+        if is_new:
+            self.__writer.writerow(CsvExporter._HEADER)
+
+    def export(self, samples: List[Sample]):
+        self.__writer.writerows(samples)
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+class SqliteExporter(Exporter):
+    """Exports samples to a SQLite database, in the table `samples`."""
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.open()
+
+    def open(self):
+        self.__db = sqlite3.connect(self.__path, check_same_thread=False)
+        self.__db.execute('CREATE TABLE IF NOT EXISTS samples '
+                          '(timestamp REAL, device TEXT, metric TEXT, key TEXT, value, delta INTEGER)')
+        self.__db.execute('CREATE INDEX IF NOT EXISTS samples_device_metric ON samples (device, metric, timestamp)')
+        self.__db.commit()
+
+    def export(self, samples: List[Sample]):
+        self.__db.executemany('INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?)', (tuple(sample) for sample in samples))
+        self.__db.commit()
+
+    def close(self):
+        self.__db.close()
+
+
+class TimerWheel(object):
+    """A hashed timer wheel which expires items at the granularity of ticks.
+
+    Scheduling and expiring an item costs O(1), regardless of how many items are scheduled.
+    """
+
+    def __init__(self, tick: float, num_slots: int = 512):
+        """
+        :param tick: The duration (in seconds) of each tick.
+        :param num_slots: The number of slots of the wheel.
+        """
+        assert tick > 0 and num_slots > 0
+        self.__tick = tick
+        self.__slots: List[List[Tuple[int, Any]]] = [[] for _ in range(num_slots)]
+        self.__start_time = time.monotonic()
+        self.__current_tick = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def tick(self) -> float:
+        return self.__tick
+
+    def schedule(self, delay: float, item: Any):
+        """Schedules an item to expire after a delay (in seconds), rounded up to the next tick."""
+        ticks = max(1, math.ceil(delay / self.__tick))
+
+        with self.__lock:
+            expire_tick = self.__current_tick + ticks
+            self.__slots[expire_tick % len(self.__slots)].append((expire_tick, item))
+
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """Advances the wheel to the current time, and returns the expired items."""
+        if now is None:
+            now = time.monotonic()
+
+        target_tick = int((now - self.__start_time) / self.__tick)
+        expired: List[Any] = []
+
+        with self.__lock:
+            while self.__current_tick < target_tick:
+                self.__current_tick += 1
+                slot = self.__slots[self.__current_tick % len(self.__slots)]
+                if not slot:
+                    continue
+
+                # Items which are more than one round away stay in the slot.
+                remaining = [entry for entry in slot if entry[0] > self.__current_tick]
+                expired.extend(item for expire_tick, item in slot if expire_tick <= self.__current_tick)
+                slot[:] = remaining
+
+        return expired
+
+
+class _PollJob(object):
+    __slots__ = ('device', 'name', 'metric', 'transport')
+
+    def __init__(self, device: OTCI, name: str, metric: Metric, transport: str):
+        self.device = device
+        self.name = name
+        self.metric = metric
+        self.transport = transport
+
+
+class Poller(object):
+    """Polls metrics from devices and exports the samples."""
+
+    def __init__(self,
+                 exporter: Exporter,
+                 max_commands_per_transport: int = 1,
+                 max_workers: int = 16,
+                 tick: float = 0.1):
+        """
+        :param exporter: The exporter of the collected samples.
+        :param max_commands_per_transport: The max number of metrics collected concurrently on each transport.
+        :param max_workers: The max number of metrics collected concurrently on all transports.
+        :param tick: The scheduling granularity (in seconds).
+        """
+        assert max_commands_per_transport > 0
+        self.__exporter = exporter
+        self.__max_commands_per_transport = max_commands_per_transport
+        self.__max_workers = max_workers
+        self.__tick = tick
+        self.__wheel = TimerWheel(tick)
+        self.__jobs: List[_PollJob] = []
+        self.__transport_locks: Dict[str, threading.BoundedSemaphore] = {}
+        self.__last_values: Dict[Tuple[str, str, str], int] = {}
+        self.__lock = threading.Lock()
+        self.__should_stop = threading.Event()
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__scheduler: Optional[threading.Thread] = None
+        self.__exporter_closed = False
+
+    def add(self, device: OTCI, metric: Metric, name: Optional[str] = None, transport: Optional[str] = None):
+        """Adds a metric to poll from a device.
+
+        :param device: The device to poll.
+        :param metric: The metric to poll.
+        :param name: The device name in the samples, `repr(device)` by default.
+        :param transport: The transport of the device, `repr(device)` by default. Devices sharing a transport (e.g.
+                          the same OTBR host) share the cap of concurrent commands.
+        """
+        job = _PollJob(device, name or repr(device), metric, transport or repr(device))
+
+        with self.__lock:
+            self.__jobs.append(job)
+            if job.transport not in self.__transport_locks:
+                self.__transport_locks[job.transport] = threading.BoundedSemaphore(self.__max_commands_per_transport)
+
+            if self.__executor is not None:
+                self.__wheel.schedule(0, job)
+
+    def transport_lock(self, device: OTCI, transport: Optional[str] = None) -> threading.BoundedSemaphore:
+        """Returns the lock of a device's transport.
+
+        Other users of the device should hold the lock (e.g. `with poller.transport_lock(node): ...`) while executing
+        commands, so that they do not interleave with the poller on the same CLI.
+        """
+        transport = transport or repr(device)
+
+        with self.__lock:
+            if transport not in self.__transport_locks:
+                self.__transport_locks[transport] = threading.BoundedSemaphore(self.__max_commands_per_transport)
+
+            return self.__transport_locks[transport]
+
+    def start(self):
+        """Starts polling in background threads, reopening the exporter if the poller was stopped."""
+        assert self.__executor is None, 'Poller is already started'
+
+        if self.__exporter_closed:
+            self.__exporter.open()
+            self.__exporter_closed = False
+
+        self.__should_stop.clear()
+
+        with self.__lock:
+            # Polls scheduled before stopping are dropped, all jobs are polled right away.
+            self.__wheel = TimerWheel(self.__tick)
+            self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix='otci-poller')
+            for job in self.__jobs:
+                self.__wheel.schedule(0, job)
+
+        self.__scheduler = threading.Thread(target=self.__schedule_routine, daemon=True)
+        self.__scheduler.start()
+
+    def stop(self):
+        """Stops polling, waits for the running polls and closes the exporter.
+
+        The poller may be started again, which reopens the exporter.
+        """
+        if self.__executor is None:
+            return
+
+        self.__should_stop.set()
+        assert self.__scheduler is not None
+        self.__scheduler.join()
+        self.__executor.shutdown(wait=True)
+        with self.__lock:
+            self.__executor = None
+        self.__exporter.close()
+        self.__exporter_closed = True
+
+    def __schedule_routine(self):
+        while not self.__should_stop.wait(self.__wheel.tick):
+            for job in self.__wheel.advance():
+                assert self.__executor is not None
+                self.__executor.submit(self.__poll, job)
+
+    def __poll(self, job: _PollJob):
+        start_time = time.monotonic()
+
+        try:
+            with self.transport_lock(job.device, job.transport):
+                if self.__should_stop.is_set():
+                    return
+
+                timestamp = time.time()
+                values = job.metric.collect(job.device)
+
+            self.__export(job, timestamp, values)
+        except Exception as e:
+            logging.warning('%s: failed to poll %s: %s', job.name, job.metric.name, e)
+        finally:
+            if not self.__should_stop.is_set():
+                # Reschedule after the poll finishes, so that a slow poll is skipped instead of piling up.
+                elapsed = time.monotonic() - start_time
+                self.__wheel.schedule(max(0.0, job.metric.interval - elapsed), job)
+
+    def __export(self, job: _PollJob, timestamp: float, values: Dict[str, MetricValue]):
+        samples: List[Sample] = []
+
+        with self.__lock:
+            for key, value in values.items():
+                delta = None
+
+                if job.metric.is_counter and isinstance(value, int):
+                    last_key = (job.name, job.metric.name, key)
+                    last_value = self.__last_values.get(last_key)
+                    if last_value is not None:
+                        # A counter lower than the last value means the counter is reset (e.g. device reboot).
+                        delta = value - last_value if value >= last_value else value
+
+                    self.__last_values[last_key] = value
+
+                samples.append(Sample(timestamp, job.name, job.metric.name, key, value, delta))
+
+            self.__exporter.export(samples)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2020, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .errors import UnexpectedCommandOutput
+
+
+class TableColumn(object):
+    """Represents a column of an OT CLI table and how to convert its fields."""
+
+    __slots__ = ('header', 'key', 'convert', 'optional')
+
+    def __init__(self, header: str, key: str, convert: Callable[[str], Any] = str, optional: bool = False):
+        """
+        :param header: The column header in the CLI output (e.g. `Next Hop`).
+        :param key: The key of the field in the parsed row.
+        :param convert: The function to convert the field string.
+        :param optional: Whether the column is missing in the output of older OT versions.
+        """
+        self.header = header
+        self.key = key
+        self.convert = convert
+        self.optional = optional
+
+
+class TableSchema(object):
+    """Represents the schema of an OT CLI table (e.g. `router table`).
+
+    The column layout is resolved once for each distinct header line, so parsing a row only splits the line and
+    converts the fields by index.
+    """
+
+    __slots__ = ('__columns', '__layouts')
+
+    def __init__(self, *columns: TableColumn):
+        self.__columns = columns
+        self.__layouts: Dict[str, Tuple[int, Tuple[Tuple[int, str, Callable[[str], Any]], ...]]] = {}
+
+    def parse(self, output: List[str]) -> List[Dict[str, Any]]:
+        """Parses the table output into a list of rows, each of which is a dict from column keys to values.
+
+        Optional columns which are missing in the output are missing in the rows.
+        """
+        if len(output) < 2:
+            raise UnexpectedCommandOutput(output)
+
+        try:
+            num_fields, layout = self.__get_layout(output[0])
+
+            rows: List[Dict[str, Any]] = []
+            for line in output[2:]:
+                line = line.strip()
+                if not line:
+                    continue
+
+                fields = split_table_row(line)
+                if len(fields) != num_fields:
+                    raise UnexpectedCommandOutput(output)
+
+                rows.append({key: convert(fields[index]) for index, key, convert in layout})
+        except ValueError:
+            raise UnexpectedCommandOutput(output)
+
+        return rows
+
+    def __get_layout(self, header_line: str) -> Tuple[int, Tuple[Tuple[int, str, Callable[[str], Any]], ...]]:
+        layout = self.__layouts.get(header_line)
+        if layout is not None:
+            return layout
+
+        headers = split_table_row(header_line.strip())
+        columns: List[Tuple[int, str, Callable[[str], Any]]] = []
+
+        for column in self.__columns:
+            if column.header in headers:
+                columns.append((headers.index(column.header), column.key, column.convert))
+            elif not column.optional:
+                raise ValueError(header_line)
+
+        layout = self.__layouts[header_line] = (len(headers), tuple(columns))
+        return layout
+
+
+def split_table_row(row: str) -> List[str]:
+    """Splits a row of an OT CLI table (e.g. `| 21 | 0x5400 |`) into stripped fields."""
+    if not (row.startswith('|') and row.endswith('|')):
+        raise ValueError(row)
+
+    return [x.strip() for x in row[1:-1].split('|')]
+
+
+class _CachedOutput(object):
+    __slots__ = ('time', 'output', 'result')
+
+    def __init__(self, time: float, output: List[str], result: Any):
+        self.time = time
+        self.output = output
+        self.result = result
+
+
+class OutputCache(object):
+    """Caches the parsed results of read-only commands (e.g. `router table`).
+
+    A result is reused without executing the command again within the TTL, and is reused without parsing again if
+    the command output does not change. Callers should invalidate the cache when a command may change the state.
+
+    The cache may be used from multiple threads. Commands are executed without holding the lock, and their outputs
+    are not cached if the cache is invalidated meanwhile.
+    """
+
+    def __init__(self, ttl: float = 0):
+        """
+        :param ttl: The time (in seconds) a result is reused without executing the command, or 0 to always execute.
+        """
+        self.ttl = ttl
+        self.__entries: Dict[str, _CachedOutput] = {}
+        self.__generation = 0  # Incremented on each invalidation
+        self.__lock = threading.Lock()
+
+    def get(self, cmd: str, execute: Callable[[str], List[str]], parse: Callable[[List[str]], Any]) -> Any:
+        """Gets the parsed result of a command, executing and parsing it only when necessary."""
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(cmd)
+            generation = self.__generation
+
+        if entry is not None and now - entry.time < self.ttl:
+            return _copy_result(entry.result)
+
+        output = execute(cmd)
+
+        if entry is None or entry.output != output:
+            entry = _CachedOutput(now, output, parse(list(output)))
+        else:
+            entry = _CachedOutput(now, entry.output, entry.result)
+
+        with self.__lock:
+            if generation == self.__generation:
+                self.__entries[cmd] = entry
+
+        return _copy_result(entry.result)
+
+    def invalidate(self, cmd: Optional[str] = None):
+        """Invalidates the cached result of a command, or all results if `cmd` is None."""
+        with self.__lock:
+            self.__generation += 1
+            if cmd is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(cmd, None)
+
+
+def _copy_result(result: Any) -> Any:
+    # Copy the containers so that callers may modify the result, values such as `Rloc16` are immutable.
+    if isinstance(result, dict):
+        return type(result)((k, _copy_result(v)) for k, v in result.items())
+    elif isinstance(result, list):
+        return [_copy_result(v) for v in result]
+    else:
+        return result
@@ -33,7 +33,7 @@ import os
 import subprocess
 import unittest
 
-from typing import cast, Dict
+from typing import cast, Dict, List
 
 import otci
 from otci import OTCI
@@ -170,6 +170,11 @@ class TestOTCI(unittest.TestCase):
         leader.set_network_name(TEST_NETWORK_NAME)
         self.assertEqual(TEST_NETWORK_NAME, leader.get_network_name())
 
+        panid, channel, network_name = leader.execute_batch(['panid', 'channel', 'networkname'])
+        self.assertEqual([f'{TEST_PANID:#06x}'], panid)
+        self.assertEqual([str(TEST_CHANNEL)], channel)
+        self.assertEqual([TEST_NETWORK_NAME], network_name)
+
         self.assertEqual('rdn', leader.get_mode())
         leader.set_mode('-')
         self.assertEqual('-', leader.get_mode())
@@ -294,6 +299,10 @@ class TestOTCI(unittest.TestCase):
         logging.info("Leader router table: %r", leader.get_router_table())
         self.assertFalse(list(leader.get_router_table().values())[0].is_link_established)
 
+        leader.set_output_cache_ttl(10)
+        self.assertEqual(leader.get_router_table(), leader.get_router_table())
+        leader.set_output_cache_ttl(0)
+
         logging.info('discover: %r', leader.discover())
         logging.info('scan: %r', leader.scan())
         logging.info('scan energy: %r', leader.scan_energy())
@@ -635,6 +644,9 @@ class TestOTCI(unittest.TestCase):
             self.assertAlmostEqual(cast(float, statistics['packet_loss']), 0.0, delta=1e-9)
             rtt: Dict[str, float] = cast(Dict[str, float], statistics['round_trip_time'])
             self.assertTrue(rtt['min'] - 1e-9 <= rtt['avg'] <= rtt['max'] + 1e-9)
+            round_trip_times = cast(List[int], statistics['round_trip_times'])
+            self.assertEqual(len(round_trip_times), 10)
+            self.assertTrue(all(rtt['min'] <= t <= rtt['max'] for t in round_trip_times))
             commissioner.wait(1)
 
         self.assertEqual('disabled', commissioner.get_commissioner_state())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2025, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+import csv
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from typing import Any, Callable, List, Optional
+
+import otci
+from otci.command_handlers import OTCommandHandler
+from otci.poller import CsvExporter, Metric, Poller, Sample, SqliteExporter, TimerWheel, counter_metric
+
+
+class TestTimerWheel(unittest.TestCase):
+
+    def setUp(self):
+        self.wheel = TimerWheel(1.0, num_slots=4)
+        # The wheel starts before this, advancing to `start + n + 0.5` reaches tick n
+        self.start = time.monotonic()
+
+    def __advance(self, tick: int) -> List[Any]:
+        return self.wheel.advance(self.start + tick + 0.5)
+
+    def testScheduleRoundsUpToNextTick(self):
+        self.wheel.schedule(0, 'a')
+        self.wheel.schedule(1.5, 'b')
+        self.wheel.schedule(2, 'c')
+
+        self.assertEqual(self.__advance(0), [])
+        self.assertEqual(self.__advance(1), ['a'])
+        self.assertEqual(self.__advance(2), ['b', 'c'])
+        self.assertEqual(self.__advance(3), [])
+
+    def testAdvanceSeveralTicks(self):
+        for i in range(3):
+            self.wheel.schedule(i + 1, i)
+
+        self.assertEqual(self.__advance(3), [0, 1, 2])
+
+    def testScheduleBeyondOneRound(self):
+        # Expires at tick 6, which shares the slot with tick 2
+        self.wheel.schedule(6, 'late')
+        self.wheel.schedule(2, 'early')
+
+        self.assertEqual(self.__advance(2), ['early'])
+        self.assertEqual(self.__advance(5), [])
+        self.assertEqual(self.__advance(6), ['late'])
+
+    def testScheduleRelativeToCurrentTick(self):
+        self.__advance(2)
+        self.wheel.schedule(1, 'a')
+
+        self.assertEqual(self.__advance(2), [])
+        self.assertEqual(self.__advance(3), ['a'])
+
+
+class _FakeCounterRunner(OTCommandHandler):
+    """Reports counters which increase on each `counters mac`, and tracks the concurrent commands."""
+
+    def __init__(self, step: int = 10, delay: float = 0):
+        self.step = step
+        self.delay = delay
+        self.polls = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.__lock = threading.Lock()
+
+    def execute_command(self, cmd: str, timeout: float) -> List[str]:
+        assert cmd == 'counters mac', cmd
+
+        with self.__lock:
+            self.polls += 1
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            value = self.polls * self.step
+
+        time.sleep(self.delay)
+
+        with self.__lock:
+            self.concurrent -= 1
+
+        return [f'TxTotal: {value}', f'RxTotal: {2 * value}', 'Done']
+
+    def execute_platform_command(self, cmd: str, timeout: float) -> List[str]:
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+    def wait(self, duration: float) -> List[str]:
+        return []
+
+    def set_line_read_callback(self, callback: Optional[Callable[[str], Any]]):
+        pass
+
+
+class _ListExporter(object):
+
+    def __init__(self):
+        self.samples: List[Sample] = []
+        self.is_open = True
+        self.opens = 0
+
+    def open(self):
+        self.is_open = True
+        self.opens += 1
+
+    def export(self, samples: List[Sample]):
+        assert self.is_open
+        self.samples.extend(samples)
+
+    def close(self):
+        self.is_open = False
+
+
+class TestPoller(unittest.TestCase):
+
+    def testPollCounters(self):
+        runner = _FakeCounterRunner()
+        exporter = _ListExporter()
+        poller = Poller(exporter, tick=0.01)
+        poller.add(otci.connect_cmd_handler(runner), counter_metric('mac', interval=0.05), name='node1')
+
+        poller.start()
+        time.sleep(0.5)
+        poller.stop()
+
+        self.assertFalse(exporter.is_open)
+        self.assertGreaterEqual(runner.polls, 3)
+        self.assertEqual(len(exporter.samples), 2 * runner.polls)
+
+        tx_samples = [sample for sample in exporter.samples if sample.key == 'TxTotal']
+        self.assertEqual([sample.value for sample in tx_samples], [10 * (i + 1) for i in range(runner.polls)])
+        self.assertEqual([sample.delta for sample in tx_samples], [None] + [10] * (runner.polls - 1))
+        self.assertTrue(all(sample.device == 'node1' and sample.metric == 'counters mac' for sample in tx_samples))
+
+    def testCounterReset(self):
+        exporter = _ListExporter()
+        values = iter([100, 150, 20])
+        poller = Poller(exporter, tick=0.01)
+        poller.add(object(), Metric('counter', lambda _: {'c': next(values, 20)}, interval=0.05, is_counter=True))
+
+        poller.start()
+        time.sleep(0.4)
+        poller.stop()
+
+        # A counter lower than the last value is reset, so the value is the delta
+        self.assertEqual([sample.delta for sample in exporter.samples[:3]], [None, 50, 20])
+
+    def testTransportCap(self):
+        runners = [_FakeCounterRunner(delay=0.05) for _ in range(4)]
+        exporter = _ListExporter()
+        poller = Poller(exporter, max_commands_per_transport=1, tick=0.01)
+        for runner in runners:
+            poller.add(otci.connect_cmd_handler(runner), counter_metric('mac', interval=0.01), transport='otbr')
+
+        poller.start()
+        time.sleep(0.5)
+        poller.stop()
+
+        # Only one of the devices sharing the transport is polled at a time
+        self.assertTrue(all(runner.polls > 0 for runner in runners))
+        self.assertLessEqual(sum(runner.polls for runner in runners), 0.5 / 0.05 + 1)
+        self.assertTrue(all(runner.max_concurrent == 1 for runner in runners))
+
+    def testFailedPollIsRetried(self):
+        exporter = _ListExporter()
+        polls = []
+
+        def collect(_):
+            polls.append(time.monotonic())
+            if len(polls) == 1:
+                raise ValueError('failed')
+            return {'value': len(polls)}
+
+        poller = Poller(exporter, tick=0.01)
+        poller.add(object(), Metric('flaky', collect, interval=0.05))
+        poller.start()
+        time.sleep(0.4)
+        poller.stop()
+
+        self.assertGreaterEqual(len(polls), 2)
+        self.assertEqual(exporter.samples[0].value, 2)
+
+    def testRestart(self):
+        runner = _FakeCounterRunner()
+        exporter = _ListExporter()
+        poller = Poller(exporter, tick=0.01)
+        poller.add(otci.connect_cmd_handler(runner), counter_metric('mac', interval=0.5))
+
+        poller.start()
+        time.sleep(0.1)
+        poller.stop()
+        self.assertEqual(runner.polls, 1)
+
+        # The exporter is reopened, and the jobs are polled right away
+        poller.start()
+        self.assertTrue(exporter.is_open)
+        time.sleep(0.1)
+        poller.stop()
+
+        self.assertEqual(exporter.opens, 1)
+        self.assertEqual(runner.polls, 2)
+        self.assertEqual(len(exporter.samples), 2 * runner.polls)
+
+
+class TestExporters(unittest.TestCase):
+
+    SAMPLES = [
+        Sample(1.5, 'node1', 'counters mac', 'TxTotal', 10, None),
+        Sample(2.5, 'node1', 'counters mac', 'TxTotal', 25, 15),
+        Sample(2.5, 'node1', 'srp server', 'state', 'running', None),
+    ]
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def testCsvExporter(self):
+        path = os.path.join(self.dir.name, 'samples.csv')
+
+        exporter = CsvExporter(path)
+        exporter.export(self.SAMPLES[:2])
+        exporter.close()
+
+        # The header is written only once when reopening
+        exporter.open()
+        exporter.export(self.SAMPLES[2:])
+        exporter.close()
+
+        with open(path, newline='') as file:
+            rows = list(csv.reader(file))
+
+        self.assertEqual(rows, [
+            ['timestamp', 'device', 'metric', 'key', 'value', 'delta'],
+            ['1.5', 'node1', 'counters mac', 'TxTotal', '10', ''],
+            ['2.5', 'node1', 'counters mac', 'TxTotal', '25', '15'],
+            ['2.5', 'node1', 'srp server', 'state', 'running', ''],
+        ])
+
+    def testSqliteExporter(self):
+        path = os.path.join(self.dir.name, 'samples.db')
+
+        exporter = SqliteExporter(path)
+        exporter.export(self.SAMPLES[:2])
+        exporter.close()
+
+        exporter.open()
+        exporter.export(self.SAMPLES[2:])
+        exporter.close()
+
+        db = sqlite3.connect(path)
+        try:
+            rows = db.execute('SELECT * FROM samples ORDER BY rowid').fetchall()
+        finally:
+            db.close()
+
+        self.assertEqual(rows, [tuple(sample) for sample in self.SAMPLES])
+
+    def testPollerWithSqliteExporter(self):
+        path = os.path.join(self.dir.name, 'samples.db')
+        poller = Poller(SqliteExporter(path), tick=0.01)
+        poller.add(otci.connect_cmd_handler(_FakeCounterRunner()), counter_metric('mac', interval=0.05), name='node1')
+
+        for _ in range(2):
+            poller.start()
+            time.sleep(0.2)
+            poller.stop()
+
+        db = sqlite3.connect(path)
+        try:
+            deltas = [delta for delta, in db.execute("SELECT delta FROM samples WHERE key = 'TxTotal' ORDER BY rowid")]
+        finally:
+            db.close()
+
+        self.assertGreaterEqual(len(deltas), 4)
+        self.assertEqual(deltas, [None] + [10] * (len(deltas) - 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+#
+#  Copyright (c) 2025, The OpenThread Authors.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#  3. Neither the name of the copyright holder nor the
+#     names of its contributors may be used to endorse or promote products
+#     derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+import threading
+import unittest
+
+from typing import Any, Callable, List, Optional
+
+import otci
+from otci.command_handlers import OTCommandHandler
+from otci.errors import UnexpectedCommandOutput
+from otci.tables import OutputCache, TableColumn, TableSchema
+from otci.types import Rloc16
+
+ROUTER_TABLE_OUTPUT = [
+    '| ID | RLOC16 | Next Hop | Path Cost | LQ In | LQ Out | Age | Extended MAC     | Link |',
+    '+----+--------+----------+-----------+-------+--------+-----+------------------+------+',
+    '| 22 | 0x5800 |       63 |         0 |     0 |      0 |   0 | 0aeb8196c9f61658 |    0 |',
+    '| 49 | 0xc400 |       63 |         0 |     3 |      3 |   0 | faa1c03908e2dbf2 |    1 |',
+]
+
+ROUTER_TABLE_SCHEMA = TableSchema(
+    TableColumn('ID', 'id', int),
+    TableColumn('RLOC16', 'rloc16', lambda x: Rloc16(x, 16)),
+    TableColumn('Path Cost', 'path_cost', int),
+    TableColumn('Extended MAC', 'extaddr'),
+    TableColumn('Link', 'link', int, optional=True),
+)
+
+
+class TestTableSchema(unittest.TestCase):
+
+    def testParse(self):
+        rows = ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT)
+        self.assertEqual(rows, [
+            {
+                'id': 22,
+                'rloc16': 0x5800,
+                'path_cost': 0,
+                'extaddr': '0aeb8196c9f61658',
+                'link': 0
+            },
+            {
+                'id': 49,
+                'rloc16': 0xc400,
+                'path_cost': 0,
+                'extaddr': 'faa1c03908e2dbf2',
+                'link': 1
+            },
+        ])
+        self.assertIsInstance(rows[0]['rloc16'], Rloc16)
+
+    def testParseEmptyTable(self):
+        self.assertEqual(ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT[:2] + ['']), [])
+
+    def testParseMissingOptionalColumn(self):
+        output = [
+            '| ID | RLOC16 | Path Cost | Extended MAC     |',
+            '+----+--------+-----------+------------------+',
+            '| 22 | 0x5800 |         0 | 0aeb8196c9f61658 |',
+        ]
+        self.assertEqual(ROUTER_TABLE_SCHEMA.parse(output), [{
+            'id': 22,
+            'rloc16': 0x5800,
+            'path_cost': 0,
+            'extaddr': '0aeb8196c9f61658'
+        }])
+
+    def testParseColumnsInAnyOrder(self):
+        output = [
+            '| Extended MAC     | Path Cost | RLOC16 | ID |',
+            '+------------------+-----------+--------+----+',
+            '| 0aeb8196c9f61658 |         0 | 0x5800 | 22 |',
+        ]
+        self.assertEqual(ROUTER_TABLE_SCHEMA.parse(output)[0]['id'], 22)
+        # The layout of the other header line is still resolved on its own
+        self.assertEqual(ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT)[0]['id'], 22)
+
+    def testParseInvalidOutput(self):
+        # Missing required column
+        with self.assertRaises(UnexpectedCommandOutput):
+            ROUTER_TABLE_SCHEMA.parse(['| ID | Extended MAC |', '+----+--------------+', '| 22 | 0aeb8196c9f61658 |'])
+
+        # Row with a wrong number of fields
+        with self.assertRaises(UnexpectedCommandOutput):
+            ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT + ['| 50 | 0xc800 |'])
+
+        # Field that fails to convert
+        with self.assertRaises(UnexpectedCommandOutput):
+            ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT + [ROUTER_TABLE_OUTPUT[2].replace('22', 'xx')])
+
+        # Header only
+        with self.assertRaises(UnexpectedCommandOutput):
+            ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT[:1])
+
+
+class _CountingCommand(object):
+
+    def __init__(self, output: List[str]):
+        self.output = output
+        self.executed = 0
+        self.parsed = 0
+
+    def execute(self, cmd: str) -> List[str]:
+        self.executed += 1
+        return list(self.output)
+
+    def parse(self, output: List[str]) -> Any:
+        self.parsed += 1
+        return ROUTER_TABLE_SCHEMA.parse(output)
+
+
+class TestOutputCache(unittest.TestCase):
+
+    def testParseOnlyChangedOutput(self):
+        cache = OutputCache()
+        command = _CountingCommand(ROUTER_TABLE_OUTPUT)
+
+        self.assertEqual(len(cache.get('router table', command.execute, command.parse)), 2)
+        self.assertEqual(len(cache.get('router table', command.execute, command.parse)), 2)
+        self.assertEqual((command.executed, command.parsed), (2, 1))
+
+        command.output = ROUTER_TABLE_OUTPUT[:3]
+        self.assertEqual(len(cache.get('router table', command.execute, command.parse)), 1)
+        self.assertEqual((command.executed, command.parsed), (3, 2))
+
+    def testReuseWithinTtl(self):
+        cache = OutputCache(ttl=3600)
+        command = _CountingCommand(ROUTER_TABLE_OUTPUT)
+
+        cache.get('router table', command.execute, command.parse)
+        cache.get('router table', command.execute, command.parse)
+        self.assertEqual((command.executed, command.parsed), (1, 1))
+
+    def testResultIsCopied(self):
+        cache = OutputCache(ttl=3600)
+        command = _CountingCommand(ROUTER_TABLE_OUTPUT)
+
+        rows = cache.get('router table', command.execute, command.parse)
+        rows[0]['id'] = 0
+        rows.pop()
+        self.assertEqual(cache.get('router table', command.execute, command.parse),
+                         ROUTER_TABLE_SCHEMA.parse(ROUTER_TABLE_OUTPUT))
+
+    def testInvalidate(self):
+        cache = OutputCache(ttl=3600)
+        command = _CountingCommand(ROUTER_TABLE_OUTPUT)
+        other = _CountingCommand(ROUTER_TABLE_OUTPUT)
+
+        cache.get('router table', command.execute, command.parse)
+        cache.get('other table', other.execute, other.parse)
+
+        cache.invalidate('other table')
+        cache.get('router table', command.execute, command.parse)
+        cache.get('other table', other.execute, other.parse)
+        self.assertEqual((command.executed, other.executed), (1, 2))
+
+        cache.invalidate()
+        cache.get('router table', command.execute, command.parse)
+        cache.get('other table', other.execute, other.parse)
+        self.assertEqual((command.executed, other.executed), (2, 3))
+
+        # The outputs are not changed, but parsed again after invalidating
+        self.assertEqual((command.parsed, other.parsed), (2, 3))
+
+    def testInvalidateWhileExecuting(self):
+        cache = OutputCache(ttl=3600)
+        command = _CountingCommand(ROUTER_TABLE_OUTPUT)
+
+        def execute_and_invalidate(cmd: str) -> List[str]:
+            thread = threading.Thread(target=cache.invalidate)
+            thread.start()
+            thread.join()
+            return command.execute(cmd)
+
+        # The output may be stale, so it's returned but not cached
+        self.assertEqual(len(cache.get('router table', execute_and_invalidate, command.parse)), 2)
+        cache.get('router table', command.execute, command.parse)
+        self.assertEqual(command.executed, 2)
+
+    def testConcurrentGet(self):
+        cache = OutputCache()
+        command = _CountingCommand(ROUTER_TABLE_OUTPUT)
+        results = []
+
+        def get():
+            for _ in range(100):
+                results.append(cache.get('router table', command.execute, command.parse))
+                cache.invalidate('router table')
+
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 400)
+        self.assertTrue(all(result == results[0] for result in results))
+
+
+class _FakeCommandHandler(OTCommandHandler):
+
+    def __init__(self):
+        self.executed: List[str] = []
+        self.on_execute: Optional[Callable[[str], None]] = None
+
+    def execute_command(self, cmd: str, timeout: float) -> List[str]:
+        self.executed.append(cmd)
+        if self.on_execute is not None:
+            self.on_execute(cmd)
+
+        if cmd == 'router table':
+            return ROUTER_TABLE_OUTPUT + ['Done']
+        elif cmd in ('reset', 'factoryreset'):
+            return []
+        else:
+            return ['Done']
+
+    def execute_platform_command(self, cmd: str, timeout: float) -> List[str]:
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+    def wait(self, duration: float) -> List[str]:
+        return []
+
+    def set_line_read_callback(self, callback: Optional[Callable[[str], Any]]):
+        pass
+
+
+class TestOtciOutputCacheInvalidation(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = _FakeCommandHandler()
+        self.node = otci.connect_cmd_handler(self.handler)
+        self.node.set_output_cache_ttl(3600)
+
+    def __get_router_table_executions(self) -> int:
+        self.node.get_router_table()
+        return self.handler.executed.count('router table')
+
+    def testReadOnlyCommandsKeepCache(self):
+        self.assertEqual(self.__get_router_table_executions(), 1)
+
+        for cmd in ('state', 'rloc16', 'router list', 'router 22', 'child 1', 'counters mac', 'netdata show -x',
+                    'srp server host', 'ipaddr mleid'):
+            self.node.execute_command(cmd)
+            self.assertEqual(self.__get_router_table_executions(), 1, cmd)
+
+    def testStateChangingCommandsInvalidateCache(self):
+        expected = 1
+        self.assertEqual(self.__get_router_table_executions(), expected)
+
+        for cmd in ('reset', 'factoryreset', 'thread stop', 'ifconfig down', 'counters mac reset',
+                    'routerselectionjitter 1', 'channel 11', 'ipaddr add fd00::1', 'ping fd00::1', 'unknowncommand'):
+            self.node.execute_command(cmd)
+            expected += 1
+            self.assertEqual(self.__get_router_table_executions(), expected, cmd)
+
+    def testBatchInvalidatesCache(self):
+        self.assertEqual(self.__get_router_table_executions(), 1)
+
+        self.node.execute_batch(['state', 'rloc16'])
+        self.assertEqual(self.__get_router_table_executions(), 1)
+
+        self.node.execute_batch(['state', 'thread start'])
+        self.assertEqual(self.__get_router_table_executions(), 2)
+
+    def testReadWhileStateChangingCommandRuns(self):
+        reads = []
+
+        def read_concurrently(cmd: str):
+            if cmd in ('thread stop', 'ifconfig down'):
+                # A reader on another thread reads the table before the command takes effect
+                thread = threading.Thread(target=lambda: reads.append(self.node.get_router_table()))
+                thread.start()
+                thread.join()
+
+        self.handler.on_execute = read_concurrently
+
+        self.node.execute_command('thread stop')
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(self.__get_router_table_executions(), 2)
+
+        self.node.execute_batch(['state', 'ifconfig down'])
+        self.assertEqual(len(reads), 2)
+        self.assertEqual(self.__get_router_table_executions(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+"""
+  Copyright (c) 2024, The OpenThread Authors.
+  All rights reserved.
+
+  Redistribution and use in source and binary forms, with or without
+  modification, are permitted provided that the following conditions are met:
+  1. Redistributions of source code must retain the above copyright
+     notice, this list of conditions and the following disclaimer.
+  2. Redistributions in binary form must reproduce the above copyright
+     notice, this list of conditions and the following disclaimer in the
+     documentation and/or other materials provided with the distribution.
+  3. Neither the name of the copyright holder nor the
+     names of its contributors may be used to endorse or promote products
+     derived from this software without specific prior written permission.
+
+  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+  POSSIBILITY OF SUCH DAMAGE.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shlex
+from time import time
+from typing import List, Optional
+
+from ble.ble_connection_constants import BBTC_SERVICE_UUID, BBTC_TX_CHAR_UUID, \
+    BBTC_RX_CHAR_UUID
+from ble.ble_stream import BleStream
+from ble.ble_stream_secure import BleStreamSecure
+from ble.udp_stream import UdpStream
+from ble import ble_scanner
+from cli.base_commands import BleCommand
+from cli.cli import CLI
+from dataset.dataset import ThreadDataset
+from tlv.tlv import TLV
+from tlv.tcat_tlv import TcatTLVType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_COMMANDS = 'hello; commission; get_dataset'
+
+
+class BatchError(Exception):
+    pass
+
+
+def load_device_list(filename) -> List[str]:
+    """Reads device specifiers, one per line: 'mac:<ADDRESS>', 'name:<NAME>' or 'sim:<NODE ID>'.
+    Empty lines and lines starting with '#' are ignored."""
+    devices = []
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            kind, _, value = line.partition(':')
+            if kind not in ('mac', 'name', 'sim') or not value:
+                raise BatchError(f'Invalid device specifier: {line}')
+            devices.append(line)
+    return devices
+
+
+async def open_device_stream(device: str, adapter: Optional[str] = None):
+    kind, _, value = device.partition(':')
+    if kind == 'sim':
+        return await UdpStream.create('127.0.0.1', int(value))
+
+    if kind == 'mac':
+        ble_device = await ble_scanner.find_first_by_mac(value, adapter=adapter)
+    else:
+        ble_device = await ble_scanner.find_first_by_name(value, adapter=adapter)
+    if ble_device is None:
+        raise BatchError('device not found')
+    return await BleStream.create(ble_device, BBTC_SERVICE_UUID, BBTC_TX_CHAR_UUID, BBTC_RX_CHAR_UUID, adapter=adapter)
+
+
+def resolve_command(commands, command_line: str):
+    """Resolves a CLI command line (e.g. 'thread start') to a BleCommand and its arguments."""
+    parts = shlex.split(command_line)
+    if not parts or parts[0] not in commands:
+        raise BatchError(f'Invalid command: {command_line}')
+    command = commands[parts[0]]
+    args = parts[1:]
+    while args and args[0] in command._subcommands:
+        command = command._subcommands[args[0]]
+        args = args[1:]
+    if not isinstance(command, BleCommand):
+        raise BatchError(f'Command not supported in batch mode: {command_line}')
+    return command, args
+
+
+def is_successful_response(tlv: TLV) -> bool:
+    if tlv.type == TcatTLVType.RESPONSE_W_STATUS.value:
+        return len(tlv.value) > 0 and tlv.value[0] == 0
+    return tlv.type in (TcatTLVType.RESPONSE_W_PAYLOAD.value, TcatTLVType.APPLICATION.value)
+
+
+async def commission_device(device: str,
+                            command_lines: List[str],
+                            dataset_bytes: Optional[bytes],
+                            cert_path: str,
+                            adapter: Optional[str] = None,
+                            handshake_timeout: float = 30.0):
+    """Connects to a device, runs the given CLI commands over TCAT and returns a per-device result dict."""
+    result = {'device': device, 'adapter': adapter, 'success': False, 'error': None, 'steps': []}
+    start = time()
+    stream = None
+    ble_sstream = None
+
+    def add_step(name, step_start, success, **info):
+        result['steps'].append({'step': name, 'success': success, 'duration': time() - step_start, **info})
+
+    try:
+        step_start = time()
+        stream = await open_device_stream(device, adapter)
+        add_step('connect', step_start, True)
+
+        step_start = time()
+        ble_sstream = BleStreamSecure(stream)
+        ble_sstream.load_cert(
+            certfile=os.path.join(cert_path, 'commissioner_cert.pem'),
+            keyfile=os.path.join(cert_path, 'commissioner_key.pem'),
+            cafile=os.path.join(cert_path, 'ca_cert.pem'),
+        )
+        if not await ble_sstream.do_handshake(timeout=handshake_timeout, show_progress=False):
+            add_step('handshake', step_start, False)
+            raise BatchError('TLS handshake failure')
+        stats = ble_sstream.handshake_stats
+        add_step('handshake',
+                 step_start,
+                 True,
+                 resumed=stats['resumed'],
+                 bytes_sent=stats['bytes_sent'],
+                 bytes_received=stats['bytes_received'])
+
+        dataset = ThreadDataset()
+        if dataset_bytes is not None:
+            dataset.clear()
+            dataset.set_from_bytes(dataset_bytes)
+        context = {'ble_sstream': ble_sstream, 'dataset': dataset, 'commands': CLI.create_commands(), 'cmd_args': None}
+
+        for command_line in command_lines:
+            step_start = time()
+            command, args = resolve_command(context['commands'], command_line)
+            response = await ble_sstream.send_with_resp(command.prepare_data(args, context))
+            if not response:
+                add_step(command_line, step_start, False)
+                raise BatchError(f'no response to "{command_line}"')
+            tlv = TLV.from_bytes(response)
+            # Keep the state later commands depend on, e.g. the challenge `random_challenge` stores for `present_hash`
+            command.process_response(tlv, context)
+            success = is_successful_response(tlv)
+            add_step(command_line, step_start, success, response_type=tlv.type, response=tlv.value.hex())
+            if not success:
+                raise BatchError(f'"{command_line}" failed')
+
+        result['success'] = True
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+        logger.warning(f'{device}: {result["error"]}')
+    finally:
+        try:
+            if ble_sstream is not None and ble_sstream.ssl_object is not None:
+                await ble_sstream.close()
+            if stream is not None:
+                await stream.disconnect()
+        except Exception as e:
+            logger.debug(f'{device}: disconnect failed: {e}')
+        result['duration'] = time() - start
+
+    return result
+
+
+async def run_batch(devices: List[str],
+                    command_lines: List[str],
+                    dataset_bytes: Optional[bytes],
+                    cert_path: str,
+                    parallel: int = 4,
+                    adapters: Optional[List[str]] = None):
+    """Commissions all devices concurrently, at most `parallel` at a time. BLE adapters (if given) are assigned
+    to the devices round-robin."""
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def run_one(index, device):
+        adapter = adapters[index % len(adapters)] if adapters else None
+        async with semaphore:
+            print(f'[{device}] started')
+            result = await commission_device(device, command_lines, dataset_bytes, cert_path, adapter)
+            status = 'OK' if result['success'] else f'FAILED ({result["error"]})'
+            print(f'[{device}] {status} in {result["duration"]:.2f} s')
+            return result
+
+    start = time()
+    results = await asyncio.gather(*(run_one(i, device) for i, device in enumerate(devices)))
+    wall_time = time() - start
+    succeeded = sum(1 for result in results if result['success'])
+
+    return {
+        'summary': {
+            'devices': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'parallel': parallel,
+            'wall_time': wall_time,
+            'devices_per_minute': 60 * len(results) / wall_time if wall_time > 0 else 0,
+        },
+        'results': results,
+    }
+
+
+async def run_batch_from_args(args):
+    devices = load_device_list(args.batch)
+    command_lines = [line.strip() for line in args.batch_commands.split(';') if line.strip()]
+    dataset_bytes = bytes.fromhex(args.batch_dataset) if args.batch_dataset else None
+    adapters = args.adapter.split(',') if args.adapter else None
+
+    try:
+        report = await run_batch(devices, command_lines, dataset_bytes, args.cert_path, args.batch_parallel, adapters)
+    finally:
+        await ble_scanner.stop_scanners()
+
+    with open(args.batch_report, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    summary = report['summary']
+    print(f'{summary["succeeded"]}/{summary["devices"]} devices succeeded in {summary["wall_time"]:.2f} s '
+          f'({summary["devices_per_minute"]:.1f} devices/min), report written to {args.batch_report}')
+    return summary['failed'] == 0
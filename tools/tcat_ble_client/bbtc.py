@@ -40,6 +40,7 @@ from ble import ble_scanner
 from cli.cli import CLI
 from dataset.dataset import ThreadDataset
 from cli.command import CommandResult
+from batch import DEFAULT_BATCH_COMMANDS, run_batch_from_args
 from utils import select_device_by_user_input, quit_with_reason
 
 logger = logging.getLogger(__name__)
@@ -49,7 +50,7 @@ async def main():
     logging.basicConfig(level=logging.WARNING)
 
     parser = argparse.ArgumentParser(description='Device parameters')
-    parser.add_argument('-a', '--adapter', help='Select HCI adapter')
+    parser.add_argument('-a', '--adapter', help='Select HCI adapter (comma separated list in batch mode)')
     parser.add_argument('--debug', help='Enable debug logs', action='store_true')
     parser.add_argument('--info', help='Enable info logs', action='store_true')
     parser.add_argument('--cert_path', help='Path to certificate chain and key', action='store', default='auth')
@@ -58,6 +59,22 @@ async def main():
     group.add_argument('--name', type=str, help='Device name', action='store')
     group.add_argument('--scan', help='Scan all available devices', action='store_true')
     group.add_argument('--simulation', help='Connect to simulation node id', action='store')
+    group.add_argument('--batch',
+                       help='Commission all devices listed in a file (one "mac:<ADDRESS>", "name:<NAME>" or '
+                       '"sim:<NODE ID>" per line) without the interactive CLI',
+                       action='store')
+    parser.add_argument('--batch_commands',
+                        help=f'Commands run on each device in batch mode, separated by ";" '
+                        f'(default: "{DEFAULT_BATCH_COMMANDS}")',
+                        default=DEFAULT_BATCH_COMMANDS)
+    parser.add_argument('--batch_dataset', help='Active dataset (hex TLVs) commissioned in batch mode')
+    parser.add_argument('--batch_parallel',
+                        help='Maximum number of devices commissioned concurrently in batch mode',
+                        type=int,
+                        default=4)
+    parser.add_argument('--batch_report',
+                        help='File the JSON batch mode report is written to',
+                        default='batch_report.json')
     args = parser.parse_args()
 
     if args.debug:
@@ -71,6 +88,11 @@ async def main():
         logging.getLogger('ble.ble_stream_secure').setLevel(logging.INFO)
         logging.getLogger('ble.udp_stream').setLevel(logging.INFO)
 
+    if args.batch:
+        if not await run_batch_from_args(args):
+            quit_with_reason('Batch commissioning failed for some devices')
+        return
+
     device = await get_device_by_args(args)
 
     ble_sstream = None
@@ -112,6 +134,7 @@ async def main():
     print('Disconnecting...')
     if ble_sstream is not None:
         await ble_sstream.close()
+    await ble_scanner.stop_scanners()
 
 
 async def get_device_by_args(args):
@@ -128,7 +151,7 @@ async def get_device_by_args(args):
         if device:
             device = await BleStream.create(device, BBTC_SERVICE_UUID, BBTC_TX_CHAR_UUID, BBTC_RX_CHAR_UUID)
     elif args.simulation:
-        device = UdpStream("127.0.0.1", int(args.simulation))
+        device = await UdpStream.create("127.0.0.1", int(args.simulation))
 
     return device
 
@@ -26,36 +26,220 @@
   POSSIBILITY OF SUCH DAMAGE.
 """
 
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
 from bleak import BleakScanner
 from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
 from bleak.uuids import normalize_uuid_str
-from bbtc import BBTC_SERVICE_UUID
-from typing import Optional
+from ble.ble_connection_constants import BBTC_SERVICE_UUID
 from ble.ble_advertisement_data import AdvertisedData
 
+logger = logging.getLogger(__name__)
 
-async def find_first_by_name(name):
-    match_name = lambda dev, adv_data: name == dev.name
-    device = await BleakScanner.find_device_by_filter(match_name)
-    return device
+# How long a device stays in the cache after its last advertisement
+DEFAULT_TTL_SEC = 30.0
+# How long a lookup waits for a device that has not been seen yet
+DEFAULT_FIND_TIMEOUT_SEC = 10.0
+# How long a scanner runs before its cache is considered to list all TCAT devices in range
+DEFAULT_SCAN_DURATION_SEC = 5.0
 
 
-async def find_first_by_mac(mac):
-    match_mac = lambda dev, adv_data: mac.upper() == dev.address
-    device = await BleakScanner.find_device_by_filter(match_mac)
-    return device
+def _adapter_kwargs(adapter: Optional[str]):
+    return {'adapter': adapter} if adapter else {}
 
 
-async def scan_tcat_devices(adapter: Optional[str] = None):
-    scanner = BleakScanner()
-    tcat_devices: list[BLEDevice] = []
-    service_uuids = [normalize_uuid_str(BBTC_SERVICE_UUID)]
-    discovered_devices = await scanner.discover(return_adv=True, service_uuids=service_uuids, adapter=adapter)
-    for _, (device, adv) in discovered_devices.items():
-        ad = None
+@dataclass
+class ScanEntry:
+    device: BLEDevice
+    advertisement: AdvertisementData
+    tcat_data: Optional[AdvertisedData]
+    is_tcat: bool
+    last_seen: float
+
+
+class BackgroundScanner:
+    """
+    Keeps discovering BLE devices in the background and caches their latest advertisement, indexed by address and
+    by name. Devices that were not heard from for `ttl` seconds are dropped from the cache.
+
+    Scanning shares the radio with the connections of the adapter, so it is paused between `pause` and `resume`,
+    e.g. while connecting to a device and during its session. Lookups of devices that are not cached yet and
+    `scan_tcat_devices` still scan while paused, as they can't complete otherwise.
+    """
+
+    def __init__(self, adapter: Optional[str] = None, ttl: float = DEFAULT_TTL_SEC):
+        self.adapter = adapter
+        self.ttl = ttl
+        self._by_address: Dict[str, ScanEntry] = {}
+        self._address_by_name: Dict[str, str] = {}
+        self._scanner = BleakScanner(detection_callback=self.__on_advertisement, **_adapter_kwargs(adapter))
+        self._updated = asyncio.Event()
+        self._started_at = None
+        self._state_lock = asyncio.Lock()
+        self._wanted = False
+        self._pauses = 0
+        self._lookups = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._started_at is not None
+
+    async def start(self):
+        self._wanted = True
+        await self.__update()
+
+    async def stop(self):
+        self._wanted = False
+        await self.__update()
+
+    async def pause(self):
+        """Stops scanning until the matching `resume`, pauses nest."""
+        self._pauses += 1
+        await self.__update()
+
+    async def resume(self):
+        self._pauses -= 1
+        await self.__update()
+
+    async def __update(self):
+        async with self._state_lock:
+            should_run = self._lookups > 0 or (self._wanted and self._pauses == 0)
+            if should_run and not self.is_running:
+                await self._scanner.start()
+                self._started_at = asyncio.get_running_loop().time()
+                logger.debug(f'background scan started on adapter {self.adapter or "default"}')
+            elif not should_run and self.is_running:
+                self._started_at = None
+                await self._scanner.stop()
+                logger.debug(f'background scan stopped on adapter {self.adapter or "default"}')
+
+    async def __scanning(self, scan: Callable[[], Awaitable]):
+        """Runs `scan` with the scanner running, even if it is paused."""
+        self._lookups += 1
+        try:
+            await self.__update()
+            return await scan()
+        finally:
+            self._lookups -= 1
+            await self.__update()
+
+    def __on_advertisement(self, device: BLEDevice, adv: AdvertisementData):
+        tcat_data = None
         for uuid, data in adv.service_data.items():
             if BBTC_SERVICE_UUID.lower() in uuid:
-                ad = AdvertisedData.from_bytes(data)
-        tcat_devices.append((device, ad))
+                try:
+                    tcat_data = AdvertisedData.from_bytes(data)
+                except IndexError:
+                    logger.debug(f'malformed TCAT advertisement from {device.address}: {data.hex()}')
+        is_tcat = tcat_data is not None or normalize_uuid_str(BBTC_SERVICE_UUID) in adv.service_uuids
+
+        address = device.address.upper()
+        self._by_address[address] = ScanEntry(device, adv, tcat_data, is_tcat, asyncio.get_running_loop().time())
+        for name in {device.name, adv.local_name}:
+            if name:
+                self._address_by_name[name] = address
+
+        # wake up all lookups waiting for this update, later lookups wait on the next one
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def __expire(self):
+        deadline = asyncio.get_running_loop().time() - self.ttl
+        for address in [address for address, entry in self._by_address.items() if entry.last_seen < deadline]:
+            del self._by_address[address]
+        for name in [name for name, address in self._address_by_name.items() if address not in self._by_address]:
+            del self._address_by_name[name]
+
+    def get_by_mac(self, mac: str) -> Optional[ScanEntry]:
+        self.__expire()
+        return self._by_address.get(mac.upper())
+
+    def get_by_name(self, name: str) -> Optional[ScanEntry]:
+        self.__expire()
+        address = self._address_by_name.get(name)
+        return self._by_address.get(address) if address is not None else None
 
-    return tcat_devices
+    def tcat_devices(self) -> List[Tuple[BLEDevice, Optional[AdvertisedData]]]:
+        self.__expire()
+        return [(entry.device, entry.tcat_data) for entry in self._by_address.values() if entry.is_tcat]
+
+    async def __wait_for(self, lookup: Callable[[], Optional[ScanEntry]], timeout: float) -> Optional[ScanEntry]:
+        await self.start()
+        entry = lookup()
+        if entry is not None:
+            return entry
+
+        async def wait():
+            loop = asyncio.get_running_loop()
+            end_time = loop.time() + timeout
+            entry = lookup()
+            while entry is None:
+                remaining = end_time - loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(self._updated.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+                entry = lookup()
+            return entry
+
+        return await self.__scanning(wait)
+
+    async def find_by_mac(self, mac: str, timeout: float = DEFAULT_FIND_TIMEOUT_SEC) -> Optional[BLEDevice]:
+        entry = await self.__wait_for(lambda: self.get_by_mac(mac), timeout)
+        return entry.device if entry is not None else None
+
+    async def find_by_name(self, name: str, timeout: float = DEFAULT_FIND_TIMEOUT_SEC) -> Optional[BLEDevice]:
+        entry = await self.__wait_for(lambda: self.get_by_name(name), timeout)
+        return entry.device if entry is not None else None
+
+    async def scan_tcat_devices(self, duration: float = DEFAULT_SCAN_DURATION_SEC):
+        """Returns the cached TCAT devices, first letting a newly started scanner run for `duration` seconds."""
+        await self.start()
+
+        async def scan():
+            remaining = self._started_at + duration - asyncio.get_running_loop().time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            return self.tcat_devices()
+
+        return await self.__scanning(scan)
+
+
+_scanners: Dict[Optional[str], BackgroundScanner] = {}
+
+
+def get_scanner(adapter: Optional[str] = None) -> BackgroundScanner:
+    """Returns the shared background scanner of the given adapter."""
+    if adapter not in _scanners:
+        _scanners[adapter] = BackgroundScanner(adapter)
+    return _scanners[adapter]
+
+
+async def stop_scanners():
+    for scanner in _scanners.values():
+        await scanner.stop()
+
+
+async def find_first_by_name(name, adapter: Optional[str] = None):
+    return await get_scanner(adapter).find_by_name(name)
+
+
+async def find_first_by_mac(mac, adapter: Optional[str] = None):
+    return await get_scanner(adapter).find_by_mac(mac)
+
+
+async def scan_tcat_devices(adapter: Optional[str] = None):
+    return await get_scanner(adapter).scan_tcat_devices()
@@ -27,14 +27,14 @@
 """
 
 from itertools import count, takewhile
-from typing import Iterator, Union
+from typing import Iterator, Optional, Union
+import asyncio
 import logging
-import time
-from asyncio import sleep
 
 from bleak import BleakClient
 from bleak.backends.device import BLEDevice
 from bleak.backends.characteristic import BleakGATTCharacteristic
+from ble import ble_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -42,35 +42,53 @@ logger = logging.getLogger(__name__)
 class BleStream:
 
     def __init__(self, client, service_uuid, tx_char_uuid, rx_char_uuid):
-        self.__receive_buffer = b''
-        self.__last_recv_time = None
+        self.__receive_buffer = bytearray()
+        self.__receive_event = asyncio.Event()
         self.client = client
         self.service_uuid = service_uuid
         self.tx_char_uuid = tx_char_uuid
         self.rx_char_uuid = rx_char_uuid
+        self.__paused_scanner = None
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        if self.client.is_connected:
-            await self.client.disconnect()
+        await self.disconnect()
+
+    @property
+    def identity(self) -> str:
+        """Identifies the connected device, e.g. for caching its TLS session."""
+        return self.client.address
 
     def __handle_rx(self, _: BleakGATTCharacteristic, data: bytearray):
         logger.debug(f'received {len(data)} bytes')
         self.__receive_buffer += data
-        self.__last_recv_time = time.time()
+        self.__receive_event.set()
 
     @staticmethod
     def __sliced(data: bytes, n: int) -> Iterator[bytes]:
         return takewhile(len, (data[i:i + n] for i in count(0, n)))
 
     @classmethod
-    async def create(cls, address_or_ble_device: Union[BLEDevice, str], service_uuid, tx_char_uuid, rx_char_uuid):
-        client = BleakClient(address_or_ble_device)
-        await client.connect()
-        self = cls(client, service_uuid, tx_char_uuid, rx_char_uuid)
-        await client.start_notify(self.tx_char_uuid, self.__handle_rx)
+    async def create(cls,
+                     address_or_ble_device: Union[BLEDevice, str],
+                     service_uuid,
+                     tx_char_uuid,
+                     rx_char_uuid,
+                     adapter: Optional[str] = None):
+        # Scanning on the same adapter slows down connecting and the session, so pause it until disconnecting
+        scanner = ble_scanner.get_scanner(adapter)
+        await scanner.pause()
+        try:
+            client = BleakClient(address_or_ble_device, **({'adapter': adapter} if adapter else {}))
+            await client.connect()
+            self = cls(client, service_uuid, tx_char_uuid, rx_char_uuid)
+            await client.start_notify(self.tx_char_uuid, self.__handle_rx)
+        except BaseException:
+            await scanner.resume()
+            raise
+        self.__paused_scanner = scanner
         return self
 
     async def send(self, data):
@@ -81,18 +99,29 @@ class BleStream:
             await self.client.write_gatt_char(rx_char, s)
         return len(data)
 
-    async def recv(self, bufsize, recv_timeout=0.2):
+    async def recv(self, bufsize, timeout=0):
+        """Returns up to bufsize received bytes, waiting up to timeout seconds for a notification if none are
+        buffered. Returns b'' if nothing was received."""
+        if not self.__receive_buffer and timeout > 0:
+            try:
+                await asyncio.wait_for(self.__receive_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        # Deleting from the front of a bytearray only moves its start, so draining the buffer in chunks stays linear.
+        message = bytes(self.__receive_buffer[:bufsize])
+        del self.__receive_buffer[:bufsize]
         if not self.__receive_buffer:
-            return b''
-
-        while time.time() - self.__last_recv_time <= recv_timeout:
-            await sleep(0.1)
-
-        message = self.__receive_buffer[:bufsize]
-        self.__receive_buffer = self.__receive_buffer[bufsize:]
-        logger.debug(f'retrieved {message}')
+            self.__receive_event.clear()
+        if message:
+            logger.debug(f'retrieved {message}')
         return message
 
     async def disconnect(self):
-        if self.client.is_connected:
-            await self.client.disconnect()
+        try:
+            if self.client.is_connected:
+                await self.client.disconnect()
+        finally:
+            if self.__paused_scanner is not None:
+                scanner, self.__paused_scanner = self.__paused_scanner, None
+                await scanner.resume()
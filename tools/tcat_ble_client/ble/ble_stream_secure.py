@@ -31,21 +31,27 @@ import asyncio
 import ssl
 import sys
 import logging
+from typing import Dict, Tuple
 
 from cryptography.x509 import load_der_x509_certificate
 from cryptography.hazmat.primitives.serialization import (Encoding, PublicFormat)
 from tlv.tlv import TLV
 from tlv.tcat_tlv import TcatTLVType
-from time import time
 import utils
 
 logger = logging.getLogger(__name__)
 
+# A TLS session can only be resumed through the SSLContext it was negotiated with, so contexts are shared between
+# connections using the same commissioner credentials, and sessions are cached per device together with their context.
+_ssl_contexts: Dict[Tuple[str, str, str], ssl.SSLContext] = {}
+_tls_sessions: Dict[str, Tuple[ssl.SSLContext, ssl.SSLSession]] = {}
+
 
 class BleStreamSecure:
 
-    def __init__(self, stream):
+    def __init__(self, stream, resume_session=True):
         self.stream = stream
+        self.resume_session = resume_session
         self.ssl_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
         self.incoming = ssl.MemoryBIO()
         self.outgoing = ssl.MemoryBIO()
@@ -53,8 +59,15 @@ class BleStreamSecure:
         self.cert = ''
         self.peer_challenge = None
         self._peer_public_key = None
+        self.handshake_stats = None
 
     def load_cert(self, certfile='', keyfile='', cafile=''):
+        key = (certfile, keyfile, cafile)
+        if key in _ssl_contexts:
+            self.ssl_context = _ssl_contexts[key]
+            self.cert = utils.load_cert_pem(certfile) if certfile else ''
+            return
+
         if certfile and keyfile:
             self.ssl_context.load_cert_chain(certfile=certfile, keyfile=keyfile)
             self.cert = utils.load_cert_pem(certfile)
@@ -65,65 +78,105 @@ class BleStreamSecure:
         if cafile:
             self.ssl_context.load_verify_locations(cafile=cafile)
 
-    async def do_handshake(self, timeout=30.0):
-        is_debug = logger.getEffectiveLevel() <= logging.DEBUG
+        _ssl_contexts[key] = self.ssl_context
+
+    @property
+    def identity(self):
+        return getattr(self.stream, 'identity', None)
+
+    def __cached_session(self):
+        if not self.resume_session or self.identity is None:
+            return None
+        context, session = _tls_sessions.get(self.identity, (None, None))
+        return session if context is self.ssl_context else None
+
+    def __store_session(self):
+        # with TLS 1.3 the session ticket arrives after the handshake, so the session is stored again on close
+        if not self.resume_session or self.identity is None or self.ssl_object is None:
+            return
+        session = self.ssl_object.session
+        if session is not None and (session.has_ticket or session.id):
+            _tls_sessions[self.identity] = (self.ssl_context, session)
+
+    def forget_session(self):
+        _tls_sessions.pop(self.identity, None)
+
+    async def do_handshake(self, timeout=30.0, show_progress=True):
+        show_progress = show_progress and logger.getEffectiveLevel() > logging.DEBUG
+        session = self.__cached_session()
         self.ssl_object = self.ssl_context.wrap_bio(
             incoming=self.incoming,
             outgoing=self.outgoing,
             server_side=False,
             server_hostname=None,
+            session=session,
         )
-        start = time()
-        while (time() - start) < timeout:
-            try:
-                if not is_debug:
-                    print('.', end='')
-                    sys.stdout.flush()
-                self.ssl_object.do_handshake()
-                break
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        end_time = start_time + timeout
+        bytes_sent = 0
+        bytes_received = 0
+        try:
+            while True:
+                try:
+                    if show_progress:
+                        print('.', end='')
+                        sys.stdout.flush()
+                    self.ssl_object.do_handshake()
+                    break
+
+                # SSLWantRead/SSLWantWrite means ssl needs to exchange data over the link: send
+                # whatever it produced, then wait for the peer's next flight to arrive
+                except (ssl.SSLWantReadError, ssl.SSLWantWriteError):
+                    bytes_sent += await self.__flush_outgoing()
+                    remaining = end_time - loop.time()
+                    if remaining <= 0:
+                        print('TLS Connection timed out.')
+                        self.forget_session()
+                        return False
+                    output = await self.stream.recv(4096, timeout=remaining)
+                    if output:
+                        bytes_received += len(output)
+                        self.incoming.write(output)
+        except ssl.SSLError:
+            # do not offer a session the device did not accept again
+            self.forget_session()
+            raise
+        # send the final handshake flight (if any) right away
+        bytes_sent += await self.__flush_outgoing()
+        if show_progress:
+            print('')
+
+        self.handshake_stats = {
+            'duration': loop.time() - start_time,
+            'bytes_sent': bytes_sent,
+            'bytes_received': bytes_received,
+            'resumed': self.ssl_object.session_reused,
+        }
+        logger.info(
+            f'TLS handshake {"resumed a session" if self.ssl_object.session_reused else "completed"} in '
+            f'{self.handshake_stats["duration"]:.2f}s, {bytes_sent} bytes sent, {bytes_received} bytes received')
+        self.__store_session()
 
-            # SSLWantWrite means ssl wants to send data over the link,
-            # but might need a receive first
-            except ssl.SSLWantWriteError:
-                output = await self.stream.recv(4096)
-                if output:
-                    self.incoming.write(output)
-                data = self.outgoing.read()
-                if data:
-                    await self.stream.send(data)
-                await asyncio.sleep(0.02)
-
-            # SSLWantRead means ssl wants to receive data from the link,
-            # but might need to send first
-            except ssl.SSLWantReadError:
-                data = self.outgoing.read()
-                if data:
-                    await self.stream.send(data)
-                output = await self.stream.recv(4096)
-                if output:
-                    self.incoming.write(output)
-                await asyncio.sleep(0.02)
-        else:
-            print('TLS Connection timed out.')
-            return False
-        print('')
         cert = self.ssl_object.getpeercert(True)
-        cert_obj = load_der_x509_certificate(cert)
-        self._peer_public_key = cert_obj.public_key().public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+        if cert is not None:
+            cert_obj = load_der_x509_certificate(cert)
+            self._peer_public_key = cert_obj.public_key().public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
         self.log_cert_identities()
         return True
 
+    async def __flush_outgoing(self):
+        data = self.outgoing.read()
+        if data:
+            await self.stream.send(data)
+        return len(data)
+
     async def send(self, bytes):
         self.ssl_object.write(bytes)
-        encode = self.outgoing.read(4096)
-        await self.stream.send(encode)
+        await self.__flush_outgoing()
 
     async def recv(self, buffersize, timeout=1):
-        end_time = asyncio.get_event_loop().time() + timeout
-        data = await self.stream.recv(buffersize)
-        while not data and asyncio.get_event_loop().time() < end_time:
-            await asyncio.sleep(0.1)
-            data = await self.stream.recv(buffersize)
+        data = await self.stream.recv(buffersize, timeout=timeout)
         if not data:
             logger.warning('No response when response expected.')
             return b''
@@ -135,10 +188,10 @@ class BleStreamSecure:
                 break
             # if recv called before entire message was received from the link
             except ssl.SSLWantReadError:
-                more = await self.stream.recv(buffersize)
-                while not more:
-                    await asyncio.sleep(0.1)
-                    more = await self.stream.recv(buffersize)
+                more = await self.stream.recv(buffersize, timeout=timeout)
+                if not more:
+                    logger.warning('Incomplete response received.')
+                    return b''
                 self.incoming.write(more)
         return decode
 
@@ -148,6 +201,7 @@ class BleStreamSecure:
         return res
 
     async def close(self):
+        self.__store_session()
         if self.ssl_object.session is not None:
             logger.debug('sending Disconnect command TLV')
             data = TLV(TcatTLVType.DISCONNECT.value, bytes()).to_bytes()
@@ -26,33 +26,80 @@
   POSSIBILITY OF SUCH DAMAGE.
 """
 
+import asyncio
 import logging
-import socket
-import select
 
 logger = logging.getLogger(__name__)
 
 
+class _UdpStreamProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, receive_queue: asyncio.Queue):
+        self.receive_queue = receive_queue
+
+    def datagram_received(self, data, addr):
+        logger.debug(f'received {len(data)} bytes from {addr}: {data}')
+        self.receive_queue.put_nowait(data)
+
+    def error_received(self, exc):
+        logger.warning(f'simulation UdpStream error: {exc}')
+
+
 class UdpStream:
     BASE_PORT = 10000
     MAX_SERVER_TIMEOUT_SEC = 10
 
     def __init__(self, address, node_id):
-        self.__receive_buffer = b''
-        self.__last_recv_time = None
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.socket.setblocking(False)
+        self.__receive_queue = asyncio.Queue()
+        self.__pending = b''
+        self.__transport = None
         self.address = (address, self.BASE_PORT + node_id)
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.disconnect()
+
+    @property
+    def identity(self) -> str:
+        """Identifies the simulated device, e.g. for caching its TLS session."""
+        return f'{self.address[0]}:{self.address[1]}'
+
+    @classmethod
+    async def create(cls, address, node_id):
+        self = cls(address, node_id)
+        await self.open()
+        return self
+
+    async def open(self):
+        if self.__transport is None:
+            loop = asyncio.get_running_loop()
+            self.__transport, _ = await loop.create_datagram_endpoint(lambda: _UdpStreamProtocol(self.__receive_queue),
+                                                                      local_addr=('0.0.0.0', 0))
+
     async def send(self, data):
+        await self.open()
         logger.debug(f'sending {len(data)} bytes: {data}')
-        return self.socket.sendto(data, self.address)
-
-    async def recv(self, bufsize):
-        ready = select.select([self.socket], [], [], self.MAX_SERVER_TIMEOUT_SEC)
-        if ready[0]:
-            data = self.socket.recv(bufsize)
-            logger.debug(f'received {len(data)} bytes: {data}')
-            return data
-        else:
-            raise Exception('simulation UdpStream recv timeout - likely, TCAT is stopped on TCAT Device')
+        self.__transport.sendto(data, self.address)
+        return len(data)
+
+    async def recv(self, bufsize, timeout=MAX_SERVER_TIMEOUT_SEC):
+        """Returns up to bufsize received bytes, waiting up to timeout seconds for a datagram if none are
+        pending. Returns b'' if nothing was received, like BleStream.recv."""
+        await self.open()
+        if not self.__pending:
+            try:
+                self.__pending = await asyncio.wait_for(self.__receive_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                logger.debug('simulation UdpStream recv timeout - likely, TCAT is stopped on TCAT Device')
+                return b''
+
+        data = self.__pending[:bufsize]
+        self.__pending = self.__pending[bufsize:]
+        return data
+
+    async def disconnect(self):
+        if self.__transport is not None:
+            self.__transport.close()
+            self.__transport = None
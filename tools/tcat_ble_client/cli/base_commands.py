@@ -357,7 +357,8 @@ class ScanCommand(Command):
 
     async def execute_default(self, args, context):
         if 'ble_sstream' in context and context['ble_sstream'] is not None:
-            context['ble_sstream'].close()
+            await context['ble_sstream'].close()
+            await context['ble_sstream'].stream.disconnect()
             del context['ble_sstream']
 
         tcat_devices = await ble_scanner.scan_tcat_devices()
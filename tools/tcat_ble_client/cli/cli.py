@@ -46,7 +46,19 @@ class CLI:
                  dataset: ThreadDataset,
                  cmd_args: Optional[ArgumentParser] = None,
                  ble_sstream: Optional[BleStreamSecure] = None):
-        self._commands = {
+        self._commands = CLI.create_commands()
+        self._context = {
+            'ble_sstream': ble_sstream,
+            'dataset': dataset,
+            'commands': self._commands,
+            'cmd_args': cmd_args
+        }
+        readline.set_completer(self.completer)
+        readline.parse_and_bind('tab: complete')
+
+    @staticmethod
+    def create_commands():
+        return {
             'help': HelpCommand(),
             'hello': HelloCommand(),
             'commission': CommissionCommand(),
@@ -68,14 +80,6 @@ class CLI:
             'get_comm_cert': GetCommissionerCertificate(),
             'diagnostic_tlvs': DiagnosticTlvsCommand()
         }
-        self._context = {
-            'ble_sstream': ble_sstream,
-            'dataset': dataset,
-            'commands': self._commands,
-            'cmd_args': cmd_args
-        }
-        readline.set_completer(self.completer)
-        readline.parse_and_bind('tab: complete')
 
     def completer(self, text, state):
         command_pool = self._commands.keys()
@@ -27,7 +27,7 @@
 """
 
 from __future__ import annotations
-from typing import List
+from typing import Iterator, List, Tuple
 
 
 class TLV():
@@ -41,13 +41,18 @@ class TLV():
 
     @staticmethod
     def parse_tlvs(data: bytes) -> List[TLV]:
-        res: List[TLV] = []
-        while data:
-            next_tlv = TLV.from_bytes(data)
-            next_tlv_size = len(next_tlv.to_bytes())
-            data = data[next_tlv_size:]
-            res.append(next_tlv)
-        return res
+        return list(TLV.iter_tlvs(data))
+
+    @staticmethod
+    def iter_tlvs(data: bytes) -> Iterator[TLV]:
+        """Yields the TLVs in data in a single pass, without copying the part of data still to be parsed."""
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            value_offset, length = TLV._parse_header(view, offset)
+            end = value_offset + length
+            yield TLV(view[offset], bytes(view[value_offset:end]))
+            offset = end
 
     @staticmethod
     def from_bytes(data: bytes) -> TLV:
@@ -56,14 +61,17 @@ class TLV():
         return res
 
     def set_from_bytes(self, data: bytes):
-        self.type = data[0]
-        header_len = 2
-        size_offset = 1
-        if data[1] == 0xFF:
-            header_len = 4
-            size_offset = 2
-        length = int.from_bytes(data[size_offset:header_len], byteorder='big')
-        self.value = data[header_len:header_len + length]
+        view = memoryview(data)
+        value_offset, length = TLV._parse_header(view, 0)
+        self.type = view[0]
+        self.value = bytes(view[value_offset:value_offset + length])
+
+    @staticmethod
+    def _parse_header(view: memoryview, offset: int) -> Tuple[int, int]:
+        """Returns the offset of the value and the length of the TLV starting at offset."""
+        if view[offset + 1] == 0xFF:
+            return offset + 4, int.from_bytes(view[offset + 2:offset + 4], byteorder='big')
+        return offset + 2, view[offset + 1]
 
     def to_bytes(self) -> bytes:
         has_long_header = len(self.value) >= 254